@@ -0,0 +1,53 @@
+"""
+Alan M Jackson
+
+A version of the Towers of Hanoi puzzle
+
+The game model, Game, is all that is loaded by import hanoi. The curses view in
+hanoi.view and the controller in hanoi.controller are only loaded when they are
+used, so the model starts quickly in headless processes and on hosts without a
+terminal.
+"""
+
+
+import sys
+import types
+
+from hanoi.game import Game
+
+__all__ = ["Game"]
+
+
+#Names that used to live in this module and now load with the view
+_VIEW_NAMES = ("GameView", "DOWN_KEY", "UP_KEY", "LEFT_KEY", "RIGHT_KEY", "T", "B", "Y", "X",
+               "WHITE_ON_BLACK", "GREEN_ON_BLACK", "YELLOW_ON_BLACK", "BLUE_ON_BLACK",
+               "CYAN_ON_BLACK", "MAGENTA_ON_BLACK", "RED_ON_BLACK", "BLACK_ON_BLACK")
+
+
+def __getattr__(name):
+    #Python 3.7 and later call this for names the module doesn't have
+    if name in _VIEW_NAMES:
+        from hanoi import view
+        return getattr(view, name)
+
+    if name == "main":
+        from hanoi import controller
+        return controller.main
+
+    raise AttributeError("module 'hanoi' has no attribute '%s'" % name)
+
+
+if sys.version_info < (3, 7):
+    #Older Pythons don't call a module's __getattr__, but do call a module
+    #subclass's, so the package is swapped for one. The old module is kept alive
+    #because Python 2 clears a module's globals when it's freed.
+    class _LazyModule(types.ModuleType):
+
+        def __getattr__(self, name):
+            return _original.__getattr__(name)
+
+    _original = sys.modules[__name__]
+    _module = _LazyModule(__name__, __doc__)
+    _module.__dict__.update(_original.__dict__)
+    _module._original = _original
+    sys.modules[__name__] = _module
@@ -0,0 +1,61 @@
+"""
+Alan M Jackson
+
+Runs the Towers of Hanoi game: python -m hanoi
+Or a solver sweep: python -m hanoi sweep --help
+Or the benchmarks: python -m hanoi bench --help
+Or a game server: python -m hanoi serve --help, and its load generator: python -m hanoi load --help
+"""
+
+import sys
+import argparse
+
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['sweep']:
+        from hanoi import sweep
+        sweep.main(sys.argv[2:])
+        sys.exit()
+
+    if sys.argv[1:2] == ['serve']:
+        from hanoi import server
+        server.main(sys.argv[2:])
+        sys.exit()
+
+    if sys.argv[1:2] == ['load']:
+        from hanoi import server
+        server.load_main(sys.argv[2:])
+        sys.exit()
+
+    if sys.argv[1:2] == ['bench']:
+        from hanoi import benchmark
+        sys.exit(benchmark.main(sys.argv[2:]))
+
+    argparser = argparse.ArgumentParser(prog='hanoi', description='A game of moving rings on towers.')
+    argparser.add_argument('-t', '--towers', type=int)
+    argparser.add_argument('-r', '--rings', type=int)
+    argparser.add_argument('-s', '--sets', type=int)
+    argparser.add_argument('-q', '--quiet', action='store_true')
+    argparser.add_argument('-z', '--randomize', action='store_true')
+    argparser.add_argument('--record', metavar='FILE', help='save a replay of the game to FILE')
+    argparser.add_argument('--autoplay', action='store_true',
+                           help='watch the game solve itself')
+    argparser.add_argument('--rate', type=float, default=4.0,
+                           help='moves a second in autoplay')
+    argparser.add_argument('--profile-out', metavar='FILE',
+                           help='time the game and write the timings to FILE as JSON')
+
+    args = argparser.parse_args()
+
+    import curses
+    from hanoi import controller
+
+    if args.profile_out != None:
+        from hanoi import instrument
+        instrument.enable()
+
+    try:
+        curses.wrapper(controller.main, args)
+    finally:
+        if args.profile_out != None:
+            instrument.dump(args.profile_out)
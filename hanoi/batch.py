@@ -0,0 +1,169 @@
+"""
+Alan M Jackson
+
+Many games played at once with NumPy.
+
+A GameBatch holds N boards with the same number of towers as arrays: a
+(games, towers, capacity) array of ring codes with -1 for no ring, and the
+height of each tower, which points at where the next ring goes. A move is a
+vector of source and destination towers, one per game, and is checked and made
+for every game in a few array operations. Instead of raising ValueError an
+illegal move leaves that game alone and is reported in an error array.
+
+Moves follow Game.move exactly: moving a ring to the tower it's on does nothing,
+and won stays set once a game has reached its winning position.
+"""
+
+import numpy
+
+from hanoi import Game
+
+
+#Error codes returned for each game by GameBatch.move and GameBatch.valid_move
+OK = 0
+EMPTY_TOWER = 1     #Cannot move a ring from an empty tower
+SMALLER_RING = 2    #Cannot put a ring on top of a smaller ring
+NO_SUCH_TOWER = 3   #The tower index is out of range
+
+
+class GameBatch(object):
+
+    def __init__(self, games):
+        """Copies the boards of a list of games, which must all have the same
+        number of towers, into the batch."""
+
+        if len(games) == 0:
+            raise ValueError("A batch needs at least one game.")
+
+        self.towers = len(games[0]._stacks)
+        for game in games:
+            if len(game._stacks) != self.towers:
+                raise ValueError("All the games in a batch need the same number of towers.")
+
+        self.count = len(games)
+        self.shift = max([game._set_shift for game in games])
+        self.capacity = max([max(game.count_rings(game.board), game.count_rings(game.winning_position))
+                             for game in games] + [1])
+
+        shape = (self.count, self.towers, self.capacity)
+        self.stacks = numpy.full(shape, -1, dtype=numpy.int64)
+        self.target = numpy.full(shape, -1, dtype=numpy.int64)
+        self.heights = numpy.zeros((self.count, self.towers), dtype=numpy.int64)
+
+        for i in range(self.count):
+            self._fill(self.stacks[i], games[i].board)
+            self._fill(self.target[i], games[i].winning_position)
+            self.heights[i] = [len(stack) for stack in games[i]._stacks]
+
+        self.misplaced = numpy.array([game._misplaced for game in games], dtype=numpy.int64)
+        self.moves = numpy.array([game.moves for game in games], dtype=numpy.int64)
+        self.won = numpy.array([game.won for game in games], dtype=bool)
+
+        self._games = numpy.arange(self.count)
+
+
+    @classmethod
+    def new(cls, count, **game_kwargs):
+        """A batch of count new games, each made with Game(**game_kwargs)."""
+        return cls([Game(**game_kwargs) for i in range(count)])
+
+
+    def _fill(self, stacks, board):
+        """Copies a list-of-lists board into one game's (towers, capacity) array."""
+
+        for tower in range(min(len(board), self.towers)):
+            for height, ring in enumerate(reversed(board[tower])):
+                stacks[tower, height] = (ring[0] << self.shift) | ring[1]
+
+
+    def _check(self, source_towers, destination_towers):
+        """The error code of each game's move, along with the move as arrays with
+        negative tower indices counted from the end, as list indexing does."""
+
+        sources = numpy.asarray(source_towers, dtype=numpy.int64)
+        destinations = numpy.asarray(destination_towers, dtype=numpy.int64)
+        same = sources == destinations
+
+        sources = numpy.where(sources < 0, sources + self.towers, sources)
+        destinations = numpy.where(destinations < 0, destinations + self.towers, destinations)
+
+        in_range = (sources >= 0) & (sources < self.towers) & \
+                   (destinations >= 0) & (destinations < self.towers)
+        sources = numpy.where(in_range, sources, 0)
+        destinations = numpy.where(in_range, destinations, 0)
+
+        games = self._games
+        source_heights = self.heights[games, sources]
+        destination_heights = self.heights[games, destinations]
+        source_tops = self.stacks[games, sources, numpy.maximum(source_heights - 1, 0)]
+        destination_tops = self.stacks[games, destinations, numpy.maximum(destination_heights - 1, 0)]
+
+        errors = numpy.zeros(self.count, dtype=numpy.int8)
+        errors[(destination_heights > 0) & (source_tops >> self.shift > destination_tops >> self.shift)] = SMALLER_RING
+        errors[source_heights == 0] = EMPTY_TOWER
+        errors[~in_range] = NO_SUCH_TOWER
+
+        #Moving a ring to where it already is isn't an error, it just does nothing
+        errors[same] = OK
+
+        return errors, sources, destinations, source_heights, destination_heights, source_tops
+
+
+    def valid_move(self, source_towers, destination_towers):
+        """The error code each game would get for the move, without making it."""
+
+        return self._check(source_towers, destination_towers)[0]
+
+
+    def move(self, source_towers, destination_towers):
+        """Makes one move in every game. Games whose move is illegal are left as
+        they are. Returns the array of error codes."""
+
+        errors, sources, destinations, source_heights, destination_heights, rings = \
+            self._check(source_towers, destination_towers)
+
+        #Towers like 2 and -1 are different indexes for the same tower, and as in
+        #Game.move that counts as a move that leaves the board as it was.
+        moving = (errors == OK) & (sources != destinations)
+        stay = (errors == OK) & (sources == destinations) & \
+               (numpy.asarray(source_towers) != numpy.asarray(destination_towers))
+        self.moves[stay] += 1
+        self.won[stay] |= self.misplaced[stay] == 0
+
+        games = self._games[moving]
+        sources = sources[moving]
+        destinations = destinations[moving]
+        rings = rings[moving]
+        source_heights = source_heights[moving] - 1
+        destination_heights = destination_heights[moving]
+
+        #A ring leaving its winning place is now out of place, and vice versa
+        self.misplaced[games] += (self.target[games, sources, source_heights] == rings).astype(numpy.int64)
+        self.misplaced[games] -= (self.target[games, destinations, destination_heights] == rings).astype(numpy.int64)
+
+        self.stacks[games, sources, source_heights] = -1
+        self.stacks[games, destinations, destination_heights] = rings
+        self.heights[games, sources] -= 1
+        self.heights[games, destinations] += 1
+        self.moves[games] += 1
+
+        self.won[games] |= self.misplaced[games] == 0
+
+        return errors
+
+
+    def winning_condition(self):
+        """A mask of the games that are in their winning position now."""
+        return self.misplaced == 0
+
+
+    def board(self, index):
+        """One game's board as a list of towers of [size, set] rings, top first."""
+
+        mask = (1 << self.shift) - 1
+        board = []
+        for tower in range(self.towers):
+            stack = self.stacks[index, tower, :self.heights[index, tower]]
+            board.append([[int(code) >> self.shift, int(code) & mask] for code in stack[::-1]])
+
+        return board
@@ -0,0 +1,287 @@
+"""
+Alan M Jackson
+
+Benchmarks of the game model, the solvers and the view.
+
+Each benchmark is timed for every (towers, rings) configuration in a grid, and
+reports the best time per operation over a few repeats:
+
+    init            Game() with the standard start
+    init_randomize  Game(randomize=True)
+    move            one Game.move, playing the optimal solution
+    winning         one Game.winning_condition
+    solve           the first moves of solver.solve, per move
+    search          solver.search from a randomized start, on boards small
+                    enough to search
+    show_board      a full GameView.show_board frame on a fake curses screen
+    update_board    a GameView.update_board frame after a move
+
+The results are written as JSON and can be compared with a baseline file, where
+anything slower than the baseline by more than the threshold is a regression:
+
+    python -m hanoi bench --out results.json --baseline baseline.json --threshold 0.25
+    python -m hanoi bench --baseline baseline.json --update-baseline
+"""
+
+import json
+import platform
+import itertools
+import timeit
+
+from hanoi import Game
+from hanoi import solver
+
+
+DEFAULT_TOWERS = [3, 4, 6, 12]
+DEFAULT_RINGS = [5, 10, 20, 30]
+
+#The most moves of a solution that are played or generated per configuration
+MAX_MOVES = 20000
+
+#The largest board, in towers ** rings states, that search is run on
+MAX_SEARCH_STATES = 200000
+
+
+def measure(function, repeat=3, number=None):
+    """The best time in seconds for one call of function, over repeat runs of
+    number calls each. With no number it's picked so a run takes about 0.05s."""
+
+    if number == None:
+        number = 1
+        while True:
+            started = timeit.default_timer()
+            for i in range(number):
+                function()
+            elapsed = timeit.default_timer() - started
+            if elapsed >= 0.05 or number >= 1 << 20:
+                break
+            number *= 2
+
+    best = None
+    for run in range(repeat):
+        started = timeit.default_timer()
+        for i in range(number):
+            function()
+        elapsed = (timeit.default_timer() - started) / number
+        if best == None or elapsed < best:
+            best = elapsed
+
+    return best
+
+
+def _optimal_moves(towers, rings):
+    return list(itertools.islice(Game(towers=towers, rings=rings).iter_optimal_moves(), MAX_MOVES))
+
+
+def bench_init(towers, rings, repeat):
+    return measure(lambda: Game(towers=towers, rings=rings), repeat)
+
+
+def bench_init_randomize(towers, rings, repeat):
+    return measure(lambda: Game(towers=towers, rings=rings, randomize=True), repeat)
+
+
+def bench_move(towers, rings, repeat):
+    moves = _optimal_moves(towers, rings)
+
+    def play():
+        game = Game(towers=towers, rings=rings, journal=False)
+        for move in moves:
+            game.move(*move)
+
+    return measure(play, repeat, 1) / len(moves)
+
+
+def bench_winning(towers, rings, repeat):
+    game = Game(towers=towers, rings=rings)
+    game.apply_moves(_optimal_moves(towers, rings)[:1])
+    return measure(game.winning_condition, repeat)
+
+
+def bench_solve(towers, rings, repeat):
+    game = Game(towers=towers, rings=rings)
+    count = len(_optimal_moves(towers, rings))
+
+    def solve():
+        for move in itertools.islice(solver.solve(game), MAX_MOVES):
+            pass
+
+    return measure(solve, repeat, 1) / count
+
+
+def bench_search(towers, rings, repeat):
+    if towers ** rings > MAX_SEARCH_STATES:
+        return None
+
+    game = Game(towers=towers, rings=rings, randomize=True, seed=rings * 1000 + towers)
+    return measure(lambda: solver.search(game), repeat, 1)
+
+
+def _view(towers, rings, game):
+    """A GameView drawing on a fake screen big enough for the board, or None
+    without NumPy for the fake."""
+
+    try:
+        from hanoi.fake_curses import FakeCurses
+    except ImportError:
+        return None
+
+    from hanoi.view import GameView
+
+    fake = FakeCurses(GameView.top_margin + rings * game.sets + 20,
+                      GameView.left_margin + towers * (rings * GameView.ring_scaling + 10) + 20)
+    return GameView(fake.stdscr, game, backend=fake)
+
+
+def bench_show_board(towers, rings, repeat):
+    game = Game(towers=towers, rings=rings)
+    ui = _view(towers, rings, game)
+    if ui == None:
+        return None
+
+    return measure(lambda: ui.show_board(game), repeat)
+
+
+def bench_update_board(towers, rings, repeat):
+    game = Game(towers=towers, rings=rings)
+    ui = _view(towers, rings, game)
+    if ui == None:
+        return None
+
+    ui.show_board(game)
+
+    #Move the top ring back and forth so every frame draws two towers
+    source, destination = _optimal_moves(towers, rings)[0]
+    moves = itertools.cycle([(source, destination), (destination, source)])
+
+    def frame():
+        move = next(moves)
+        game.move(*move)
+        ui.mark_dirty(*move)
+        ui.update_board(game)
+
+    return measure(frame, repeat)
+
+
+BENCHMARKS = [
+    ("init", bench_init),
+    ("init_randomize", bench_init_randomize),
+    ("move", bench_move),
+    ("winning", bench_winning),
+    ("solve", bench_solve),
+    ("search", bench_search),
+    ("show_board", bench_show_board),
+    ("update_board", bench_update_board),
+]
+
+
+def run(towers=DEFAULT_TOWERS, rings=DEFAULT_RINGS, names=None, repeat=3):
+    """Runs the benchmarks named, or all of them, over the grid. Returns the
+    results as a dict of name/towers/rings to seconds per operation."""
+
+    results = {}
+    for name, benchmark in BENCHMARKS:
+        if names != None and name not in names:
+            continue
+
+        for tower_count in towers:
+            for ring_count in rings:
+                seconds = benchmark(tower_count, ring_count, repeat)
+                if seconds != None:
+                    results[key(name, tower_count, ring_count)] = seconds
+
+    return results
+
+
+def key(name, towers, rings):
+    return "%s/%d/%d" % (name, towers, rings)
+
+
+def _order(name):
+    """Sorts keys by benchmark, then towers and rings as numbers."""
+
+    benchmark, towers, rings = name.split("/")
+    return (benchmark, int(towers), int(rings))
+
+
+def compare(results, baseline, threshold=0.25):
+    """The results more than threshold slower than the baseline, as a sorted
+    list of (key, baseline seconds, seconds, ratio)."""
+
+    regressions = []
+    for name in sorted(results, key=_order):
+        if name in baseline and baseline[name] > 0:
+            ratio = results[name] / baseline[name]
+            if ratio > 1 + threshold:
+                regressions.append((name, baseline[name], results[name], ratio))
+
+    return regressions
+
+
+def read(path):
+    """The results stored in a results file."""
+
+    with open(path) as f:
+        return json.load(f)["results"]
+
+
+def write(path, results):
+    document = {"python": platform.python_version(),
+                "platform": platform.platform(),
+                "results": results}
+
+    with open(path, "w") as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def _numbers(text):
+    """Parses "3,4,8" into a list of numbers."""
+    return [int(number) for number in text.split(",")]
+
+
+def main(argv=None):
+    import argparse
+
+    argparser = argparse.ArgumentParser(prog='hanoi bench',
+                                        description='Benchmark the game, solvers and view.')
+    argparser.add_argument('-t', '--towers', type=_numbers, default=DEFAULT_TOWERS)
+    argparser.add_argument('-r', '--rings', type=_numbers, default=DEFAULT_RINGS)
+    argparser.add_argument('-b', '--bench', action='append',
+                           choices=[name for name, benchmark in BENCHMARKS],
+                           help='run only this benchmark, can be given more than once')
+    argparser.add_argument('-n', '--repeat', type=int, default=3)
+    argparser.add_argument('-o', '--out', help='write the results to this JSON file')
+    argparser.add_argument('--baseline', help='compare the results with this results file')
+    argparser.add_argument('--threshold', type=float, default=0.25,
+                           help='slowdown over the baseline counted as a regression, 0.25 is 25%%')
+    argparser.add_argument('--update-baseline', action='store_true',
+                           help='write the results to the baseline file instead of comparing')
+
+    args = argparser.parse_args(argv)
+
+    results = run(args.towers, args.rings, args.bench, args.repeat)
+
+    for name in sorted(results, key=_order):
+        print("%-28s %12.3f us" % (name, results[name] * 1e6))
+
+    if args.out != None:
+        write(args.out, results)
+
+    if args.baseline == None:
+        return 0
+
+    if args.update_baseline:
+        write(args.baseline, results)
+        print("Baseline written to %s" % args.baseline)
+        return 0
+
+    regressions = compare(results, read(args.baseline), args.threshold)
+    for name, before, after, ratio in regressions:
+        print("REGRESSION %s: %.3f us -> %.3f us (%.2fx)" % (name, before * 1e6, after * 1e6, ratio))
+
+    if regressions:
+        return 1
+
+    print("No regressions against %s" % args.baseline)
+    return 0
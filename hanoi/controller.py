@@ -0,0 +1,153 @@
+"""
+Alan M Jackson
+
+The controller that plays a game in the terminal.
+"""
+
+
+from hanoi.game import Game
+from hanoi.view import GameView, HINT
+from hanoi.hints import Hinter, NO_MOVE
+
+
+#The Controller in an MVC pattern. 
+def main(stdscr, args, backend=None):
+    """Plays a game set up from the command line args. backend stands in for
+    the curses module, as for GameView."""
+
+    game_kwargs = {}
+    distribution = 0.75
+
+    if args.towers != None:
+        game_kwargs['towers'] = args.towers
+
+    if args.rings != None:
+        game_kwargs['rings'] = args.rings
+
+    if args.sets != None:
+        game_kwargs['sets'] = args.sets
+
+    if args.randomize:
+        game_kwargs['randomize'] = True
+
+    #The journal is what the undo key takes moves back from
+    game = Game(journal=True, **game_kwargs)
+    ui = GameView(stdscr, game, backend=backend)
+
+    recorder = None
+    if args.record != None:
+        from hanoi.replay import ReplayWriter
+        recorder = ReplayWriter(args.record, game)
+
+    #Solves positions for hints and autoplay on a worker thread
+    hinter = Hinter()
+
+    try:
+        if args.autoplay:
+            autoplay(game, ui, hinter, args.rate)
+        else:
+            play(game, ui, hinter, args)
+    finally:
+        if recorder != None:
+            recorder.close()
+        hinter.close()
+
+
+def play(game, ui, hinter, args):
+    """Plays the game in the view until it's won."""
+
+    if not args.quiet:
+        ui.show_splash_screen()
+        ui.show_winning_position(game)
+
+    ui.show_board(game)
+
+    while not game.won:
+        move = ui.input_move(game)
+
+        if move == HINT:
+            #Ask without waiting, and keep asking while waiting for keys until
+            #the worker has the answer
+            def check_hint():
+                hint = hinter.poll(game)
+                if hint != None:
+                    show_hint(ui, hinter, game, hint)
+                    ui.set_idle(None)
+
+            ui.banner_text = "Thinking..."
+            ui.show_banner()
+            ui.set_idle(check_hint)
+            check_hint()
+            continue
+
+        ui.set_idle(None)
+        ui.clear_hint()
+
+        if move == None:
+            move = game.undo()
+            if move != None:
+                ui.mark_dirty(*move)
+
+            ui.update_board(game)
+            continue
+
+        source_tower, destination_tower = move
+
+        #The source tower was drawn without its top ring while it was picked up
+        ui.mark_dirty(source_tower, destination_tower)
+
+        try:
+            game.move(source_tower, destination_tower)
+        except ValueError as e:
+            ui.show_message_box(str(e))
+            ui.pause()
+            ui.mark_dirty()
+
+        ui.update_board(game)
+
+    ui.show_message_box("You Won")
+    ui.pause()
+
+
+def autoplay(game, ui, hinter, rate):
+    """Plays the optimal moves by itself at rate moves a second, with the solving
+    done by the hinter's worker thread. Any key stops it."""
+
+    ui.show_board(game)
+    ui.screen.timeout(max(1, int(1000 / rate)))
+
+    while not game.won:
+        move = hinter.poll(game)
+
+        if move == None:
+            ui.banner_text = "Thinking..."
+            ui.show_banner()
+        elif move == NO_MOVE:
+            show_hint(ui, hinter, game, move)
+            ui.screen.timeout(-1)
+            ui.get_key()
+            return
+        else:
+            ui.clear_hint()
+            game.move(*move)
+            ui.mark_dirty(*move)
+            ui.update_board(game)
+
+        #Waiting for a key with a timeout paces the moves
+        if ui.get_key() != -1:
+            return
+
+    ui.screen.timeout(-1)
+    ui.show_message_box("Solved in %d moves" % game.moves)
+    ui.pause()
+
+
+def show_hint(ui, hinter, game, hint):
+    """Shows a move from the hinter, or why there isn't one."""
+
+    error = hinter.error(game) if hint == NO_MOVE else None
+    if error != None:
+        ui.banner_text = "Couldn't solve this: %s" % error
+        ui.show_banner()
+    else:
+        ui.show_hint(hint if hint != NO_MOVE else None)
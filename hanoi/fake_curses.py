@@ -0,0 +1,448 @@
+"""
+Alan M Jackson
+
+An in-memory stand in for the curses module, for driving GameView without a
+terminal in tests and benchmarks.
+
+A FakeCurses has the parts of the curses module the view uses, and its stdscr
+is a FakeWindow backed by two NumPy arrays, one of character codes and one of
+attributes. Subwindows are views of their parent's arrays, so drawing in one
+shows in the other as it does in curses. Keys for getch come from a queue, and
+getch raises error once it's empty instead of waiting.
+
+Every window call and every cell written is counted. doupdate, which the view
+calls once a frame, closes the counts for the frame and adds them to frames, so
+the cost of a redraw can be measured and tested:
+
+    fake = FakeCurses(40, 120, keys=[UP_KEY, RIGHT_KEY, DOWN_KEY])
+    ui = GameView(fake.stdscr, game, backend=fake)
+    ui.show_board(game)
+    print(fake.stdscr.text())
+    print(fake.frames[-1].cells, fake.frames[-1].calls)
+"""
+
+from collections import deque
+
+import numpy
+
+
+A_CHARTEXT = 0xff
+A_COLOR = 0xff00
+
+COLOR_BLACK = 0
+COLOR_RED = 1
+COLOR_GREEN = 2
+COLOR_YELLOW = 3
+COLOR_BLUE = 4
+COLOR_MAGENTA = 5
+COLOR_CYAN = 6
+COLOR_WHITE = 7
+
+_BLANK = ord(" ")
+
+
+class error(Exception):
+    """Raised where curses would raise curses.error."""
+
+
+def color_pair(number):
+    return number << 8
+
+
+def pair_number(attributes):
+    return (attributes & A_COLOR) >> 8
+
+
+class Frame(object):
+    """The window calls made and cells written between two doupdates."""
+
+    def __init__(self):
+        self.calls = {}
+        self.cells = 0
+
+
+    def call_count(self):
+        return sum(self.calls.values())
+
+
+class FakeCurses(object):
+    """The curses functions and constants used by the view, and a screen of
+    lines by columns. keys are key codes or one character strings."""
+
+    error = error
+
+    A_CHARTEXT = A_CHARTEXT
+    A_COLOR = A_COLOR
+
+    COLOR_BLACK = COLOR_BLACK
+    COLOR_RED = COLOR_RED
+    COLOR_GREEN = COLOR_GREEN
+    COLOR_YELLOW = COLOR_YELLOW
+    COLOR_BLUE = COLOR_BLUE
+    COLOR_MAGENTA = COLOR_MAGENTA
+    COLOR_CYAN = COLOR_CYAN
+    COLOR_WHITE = COLOR_WHITE
+
+    #Line drawing characters as plain ASCII
+    ACS_HLINE = ord("-")
+    ACS_VLINE = ord("|")
+    ACS_BTEE = ord("+")
+    ACS_TTEE = ord("+")
+    ACS_PLUS = ord("+")
+    ACS_ULCORNER = ord("+")
+    ACS_URCORNER = ord("+")
+    ACS_LLCORNER = ord("+")
+    ACS_LRCORNER = ord("+")
+
+    color_pair = staticmethod(color_pair)
+    pair_number = staticmethod(pair_number)
+
+    def __init__(self, lines=40, columns=120, keys=()):
+        self.keys = deque()
+        self.push_keys(keys)
+
+        self.pairs = {}
+        self.cursor = 1
+        self.textpad = _TextPad(self)
+
+        #The frame being drawn, and the ones finished by doupdate
+        self.frame = Frame()
+        self.frames = []
+
+        self.stdscr = FakeWindow(self, lines, columns)
+
+
+    def push_keys(self, keys):
+        """Adds keys to the end of the queue getch reads from."""
+
+        for key in keys:
+            self.keys.append(ord(key) if not isinstance(key, int) else key)
+
+
+    def count(self, name, cells=0):
+        calls = self.frame.calls
+        calls[name] = calls.get(name, 0) + 1
+        self.frame.cells += cells
+
+
+    def curs_set(self, visibility):
+        previous = self.cursor
+        self.cursor = visibility
+        return previous
+
+
+    def init_pair(self, number, foreground, background):
+        self.pairs[number] = (foreground, background)
+
+
+    def newpad(self, lines, columns):
+        self.count("newpad")
+        return FakeWindow(self, lines, columns)
+
+
+    def newwin(self, lines, columns, y=0, x=0):
+        self.count("newwin")
+        return FakeWindow(self, lines, columns)
+
+
+    def doupdate(self):
+        self.count("doupdate")
+        self.frames.append(self.frame)
+        self.frame = Frame()
+
+
+class _TextPad(object):
+    """curses.textpad.rectangle, drawn with the fake's line characters."""
+
+    def __init__(self, fake):
+        self.fake = fake
+
+
+    def rectangle(self, win, uly, ulx, lry, lrx):
+        fake = self.fake
+        win.vline(uly + 1, ulx, fake.ACS_VLINE, lry - uly - 1)
+        win.hline(uly, ulx + 1, fake.ACS_HLINE, lrx - ulx - 1)
+        win.hline(lry, ulx + 1, fake.ACS_HLINE, lrx - ulx - 1)
+        win.vline(uly + 1, lrx, fake.ACS_VLINE, lry - uly - 1)
+        win.addch(uly, ulx, fake.ACS_ULCORNER)
+        win.addch(uly, lrx, fake.ACS_URCORNER)
+        win.addch(lry, lrx, fake.ACS_LRCORNER)
+        win.addch(lry, ulx, fake.ACS_LLCORNER)
+
+
+class FakeWindow(object):
+    """A window of cells held in a (lines, columns) array of characters and
+    another of attributes."""
+
+    def __init__(self, fake, lines, columns, chars=None, attrs=None, top=0, left=0):
+        self.fake = fake
+        self.lines = lines
+        self.columns = columns
+
+        if chars is None:
+            chars = numpy.full((lines, columns), _BLANK, dtype=numpy.int32)
+            attrs = numpy.zeros((lines, columns), dtype=numpy.int32)
+
+        self.chars = chars
+        self.attrs = attrs
+
+        #Where this window is on the screen, for subwin
+        self.top = top
+        self.left = left
+
+        self.y = 0
+        self.x = 0
+        self.attributes = 0
+
+        #As set by timeout, which getch ignores as the keys are all queued up
+        self.delay = -1
+
+
+    def getmaxyx(self):
+        return (self.lines, self.columns)
+
+
+    def getyx(self):
+        return (self.y, self.x)
+
+
+    def getbegyx(self):
+        return (self.top, self.left)
+
+
+    def subwin(self, *args):
+        """subwin([lines, columns,] y, x) with y and x relative to the screen."""
+
+        if len(args) == 2:
+            lines, columns, y, x = (0, 0) + args
+        else:
+            lines, columns, y, x = args
+
+        self.fake.count("subwin")
+        return self._window(lines, columns, y - self.top, x - self.left)
+
+
+    def derwin(self, *args):
+        """derwin([lines, columns,] y, x) with y and x relative to this window."""
+
+        if len(args) == 2:
+            lines, columns, y, x = (0, 0) + args
+        else:
+            lines, columns, y, x = args
+
+        self.fake.count("derwin")
+        return self._window(lines, columns, y, x)
+
+
+    def _window(self, lines, columns, y, x):
+        if lines == 0:
+            lines = self.lines - y
+        if columns == 0:
+            columns = self.columns - x
+
+        if y < 0 or x < 0 or lines <= 0 or columns <= 0 or \
+                y + lines > self.lines or x + columns > self.columns:
+            raise error("derwin() returned ERR")
+
+        window = FakeWindow(self.fake, lines, columns,
+                            self.chars[y:y + lines, x:x + columns],
+                            self.attrs[y:y + lines, x:x + columns],
+                            self.top + y, self.left + x)
+        window.attributes = self.attributes
+        return window
+
+
+    def move(self, y, x):
+        self.fake.count("move")
+        self._move(y, x)
+
+
+    def _move(self, y, x):
+        if not (0 <= y < self.lines and 0 <= x < self.columns):
+            raise error("wmove() returned ERR")
+
+        self.y = y
+        self.x = x
+
+
+    def attrset(self, attributes):
+        self.fake.count("attrset")
+        self.attributes = attributes
+
+
+    def _split(self, character):
+        """The character code and attributes to write for ch, which can carry
+        its own colour like a chtype."""
+
+        if not isinstance(character, int):
+            character = ord(character)
+
+        attributes = character & ~A_CHARTEXT
+        if not attributes & A_COLOR:
+            attributes |= self.attributes
+
+        return character & A_CHARTEXT, attributes
+
+
+    def addch(self, *args):
+        """addch([y, x,] ch)"""
+
+        if len(args) >= 3:
+            self._move(args[0], args[1])
+            args = args[2:]
+
+        self.fake.count("addch", 1)
+
+        self.chars[self.y, self.x], self.attrs[self.y, self.x] = self._split(args[0])
+        self._advance(1)
+
+
+    def addstr(self, *args):
+        """addstr([y, x,] str), wrapping at the right hand edge."""
+
+        if len(args) >= 3:
+            self._move(args[0], args[1])
+            args = args[2:]
+
+        text = args[0]
+        self.fake.count("addstr", len(text))
+
+        for line_number, line in enumerate(text.split("\n")):
+            if line_number > 0:
+                self._clear_to_end()
+                if self.y == self.lines - 1:
+                    raise error("addwstr() returned ERR")
+                self.y += 1
+                self.x = 0
+
+            codes = numpy.array([ord(character) for character in line], dtype=numpy.int32)
+            while len(codes):
+                length = min(len(codes), self.columns - self.x)
+                self.chars[self.y, self.x:self.x + length] = codes[:length]
+                self.attrs[self.y, self.x:self.x + length] = self.attributes
+                codes = codes[length:]
+                self._advance(length)
+
+
+    def _advance(self, length):
+        """Steps the cursor on, raising error from the bottom right cell as curses
+        does."""
+
+        self.x += length
+        if self.x == self.columns:
+            if self.y == self.lines - 1:
+                self.x -= 1
+                raise error("addch() returned ERR")
+
+            self.x = 0
+            self.y += 1
+
+
+    def hline(self, *args):
+        """hline([y, x,] ch, n), not moving the cursor."""
+
+        if len(args) >= 4:
+            self._move(args[0], args[1])
+            args = args[2:]
+
+        end = min(self.x + args[1], self.columns)
+        self.fake.count("hline", end - self.x)
+
+        self.chars[self.y, self.x:end], self.attrs[self.y, self.x:end] = self._split(args[0])
+
+
+    def vline(self, *args):
+        """vline([y, x,] ch, n), not moving the cursor."""
+
+        if len(args) >= 4:
+            self._move(args[0], args[1])
+            args = args[2:]
+
+        end = min(self.y + args[1], self.lines)
+        self.fake.count("vline", end - self.y)
+
+        self.chars[self.y:end, self.x], self.attrs[self.y:end, self.x] = self._split(args[0])
+
+
+    def clrtoeol(self):
+        self.fake.count("clrtoeol", self.columns - self.x)
+        self._clear_to_end()
+
+
+    def _clear_to_end(self):
+        self.chars[self.y, self.x:] = _BLANK
+        self.attrs[self.y, self.x:] = 0
+
+
+    def clear(self):
+        self.fake.count("clear", self.lines * self.columns)
+
+        self.chars[:] = _BLANK
+        self.attrs[:] = 0
+        self.y = 0
+        self.x = 0
+
+
+    def border(self, *args):
+        self.fake.count("border")
+        self.fake.textpad.rectangle(self, 0, 0, self.lines - 1, self.columns - 1)
+
+
+    def overwrite(self, destination, sminrow, smincol, dminrow, dmincol, dmaxrow, dmaxcol):
+        """Copies the cells of this window from (sminrow, smincol) to destination,
+        from (dminrow, dmincol) to (dmaxrow, dmaxcol) inclusive."""
+
+        lines = dmaxrow - dminrow + 1
+        columns = dmaxcol - dmincol + 1
+        if dmaxrow >= destination.lines or dmaxcol >= destination.columns or \
+                sminrow + lines > self.lines or smincol + columns > self.columns:
+            raise error("copywin() returned ERR")
+
+        self.fake.count("overwrite", lines * columns)
+
+        destination.chars[dminrow:dmaxrow + 1, dmincol:dmaxcol + 1] = \
+            self.chars[sminrow:sminrow + lines, smincol:smincol + columns]
+        destination.attrs[dminrow:dmaxrow + 1, dmincol:dmaxcol + 1] = \
+            self.attrs[sminrow:sminrow + lines, smincol:smincol + columns]
+
+
+    def refresh(self):
+        self.fake.count("refresh")
+        self.fake.doupdate()
+
+
+    def noutrefresh(self):
+        self.fake.count("noutrefresh")
+
+
+    def keypad(self, flag):
+        pass
+
+
+    def timeout(self, delay):
+        self.delay = delay
+
+
+    def nodelay(self, flag):
+        self.delay = 0 if flag else -1
+
+
+    def getch(self):
+        self.fake.count("getch")
+
+        if len(self.fake.keys) == 0:
+            raise error("no more keys")
+
+        return self.fake.keys.popleft()
+
+
+    def text(self):
+        """The characters in the window as lines of text."""
+
+        return "\n".join("".join(chr(code) for code in row) for row in self.chars)
+
+
+    def colours(self):
+        """The colour pair number of every cell, as an array."""
+
+        return (self.attrs & A_COLOR) >> 8
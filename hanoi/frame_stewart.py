@@ -0,0 +1,177 @@
+"""
+Alan M Jackson
+
+Frame-Stewart solutions for a stack of rings on four or more towers.
+
+To move n rings with k towers, move the top t rings to a spare tower using all k
+towers, move the other n - t rings to the destination with the k - 1 towers left,
+then move the t rings on top of them. The best split t for each (rings, towers)
+is kept in a memo table, which can be backed by a cache file so that it survives
+between runs. With three towers the best split is always n - 1, which is the
+classic plan. The Frame-Stewart count is proven optimal for four towers and is
+the best known for more.
+"""
+
+import os
+import json
+from collections import OrderedDict
+
+
+class SplitTable(object):
+    """A bounded least recently used memo of (moves, split) keyed by (rings, towers),
+    optionally loaded from and saved to a JSON cache file."""
+
+    def __init__(self, maxsize=4096, path=None):
+        self.maxsize = maxsize
+        self.path = path
+        self.dirty = False
+        self._entries = OrderedDict()
+
+        if path != None and os.path.exists(path):
+            with open(path) as f:
+                for key, value in json.load(f).items():
+                    rings, towers = key.split(",")
+                    self.put(int(rings), int(towers), value[0], value[1])
+
+            self.dirty = False
+
+
+    def __len__(self):
+        return len(self._entries)
+
+
+    def get(self, rings, towers):
+        """(moves, split) for the key, or None if it isn't in the table."""
+
+        key = (rings, towers)
+        value = self._entries.pop(key, None)
+        if value != None:
+            self._entries[key] = value
+
+        return value
+
+
+    def put(self, rings, towers, moves, split):
+        key = (rings, towers)
+        self._entries.pop(key, None)
+        self._entries[key] = (moves, split)
+        self.dirty = True
+
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+    def save(self):
+        """Writes the table to its cache file, if it has one and has changed."""
+
+        if self.path == None or not self.dirty:
+            return
+
+        entries = {}
+        for (rings, towers), value in self._entries.items():
+            entries["%d,%d" % (rings, towers)] = list(value)
+
+        with open(self.path, "w") as f:
+            json.dump(entries, f)
+
+        self.dirty = False
+
+
+_table = SplitTable()
+
+
+def set_table(table):
+    """Makes table the memo used when no table is passed in."""
+    global _table
+    _table = table
+
+
+def move_count(rings, towers, table=None):
+    """The number of moves it takes to move a stack of rings to another tower."""
+
+    if table == None:
+        table = _table
+
+    moves = _solve(rings, towers, table)[0]
+    table.save()
+    return moves
+
+
+def split(rings, towers, table=None):
+    """How many rings to park on a spare tower before moving the rest."""
+
+    if table == None:
+        table = _table
+
+    best = _solve(rings, towers, table)[1]
+    table.save()
+    return best
+
+
+def moves(rings, source, destination, spares, table=None):
+    """Generates the moves that take a stack of rings from source to destination,
+    using the list of spare towers."""
+
+    if table == None:
+        table = _table
+
+    _solve(rings, len(spares) + 2, table)
+    table.save()
+
+    return _moves(rings, source, destination, list(spares), table)
+
+
+def _moves(rings, source, destination, spares, table):
+
+    if rings == 0:
+        return
+
+    if rings == 1:
+        yield (source, destination)
+        return
+
+    parked = _solve(rings, len(spares) + 2, table)[1]
+    middle = spares[0]
+    others = spares[1:]
+
+    for move in _moves(parked, source, middle, [destination] + others, table):
+        yield move
+
+    for move in _moves(rings - parked, source, destination, others, table):
+        yield move
+
+    for move in _moves(parked, middle, destination, [source] + others, table):
+        yield move
+
+
+def _solve(rings, towers, table, computed=None):
+    """(moves, split) for a stack of rings, from the table or worked out and added.
+    Values worked out along the way are also kept in computed, so that a small
+    table evicting them can't make the recursion repeat itself."""
+
+    if rings <= 1:
+        return (rings, 0)
+
+    if towers < 3:
+        raise ValueError("Can't move more than one ring with fewer than three towers.")
+
+    if computed == None:
+        computed = {}
+
+    key = (rings, towers)
+    value = computed.get(key) or table.get(rings, towers)
+    if value != None:
+        return value
+
+    if towers == 3:
+        value = (2 ** rings - 1, rings - 1)
+    else:
+        for parked in range(1, rings):
+            count = 2 * _solve(parked, towers, table, computed)[0] + \
+                _solve(rings - parked, towers - 1, table, computed)[0]
+            if value == None or count < value[0]:
+                value = (count, parked)
+
+    computed[key] = value
+    table.put(rings, towers, value[0], value[1])
+    return value
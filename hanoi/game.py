@@ -0,0 +1,666 @@
+"""
+Alan M Jackson
+
+The Towers of Hanoi game model.
+
+This module only needs the standard library core, so the model and the solvers
+built on it load quickly and without a terminal.
+"""
+
+
+from array import array
+
+from hanoi import validate
+
+_DEFAULT_TOWERS = 3
+_DEFAULT_RINGS = 5
+_DEFAULT_SETS = 1
+
+
+#The Model in an MVC pattern - can be used without a view, implements the game logic.
+class Game(object):
+
+    def __init__(self, towers=_DEFAULT_TOWERS, rings=_DEFAULT_RINGS, sets=_DEFAULT_SETS,
+                 start_position=None, winning_position=None, randomize=False, journal=False,
+                 seed=None):
+
+        if sets > towers:
+            raise ValueError("Can't have more sets than towers.")
+
+        if towers < 1 or rings < 1 or sets < 1:
+            raise ValueError("Towers, rings and sets must be greater than zero.")
+
+        self.towers = towers
+        self.rings = rings
+        self.sets = sets
+        board = [[] for x in range(self.towers)]
+        self._stacks = None
+        self._winning_position = [[] for x in range(self.towers)]
+        self.moves = 0
+        self.won = False
+
+        #With a journal every move is kept, a machine word each, so moves can be
+        #undone and redone. It's off by default so long games and streams of
+        #moves through apply_moves run in constant memory.
+        self._journaling = journal
+
+        #The pattern database distance_to_win last used, see there
+        self._distance_db = None
+
+        #Told about every move made, see hanoi.replay.ReplayWriter
+        self.recorder = None
+
+        #create the starting position of the board
+        if start_position == None:
+            #The first tower has a set
+            towers_with_sets = [0]
+
+            #The next set goes on the last tower
+            if sets > 1:
+                towers_with_sets.append(towers - 1)
+
+            #Put the next sets on the towers in order
+            if sets > 2:
+                for i in range(1, sets - 1):
+                    towers_with_sets.append(i)
+
+            set = 0
+            for tower in towers_with_sets:
+                for i in range(1, self.rings + 1):
+                    board[tower].append([i, set])
+
+                set += 1
+        else:
+            #Sets can be uneven and the winning position can have other rings,
+            #but a board stacked wrong would break the solvers
+            validate.validate(start_position, sets=False)
+            board = start_position
+
+            #count the towers rings and sets of the board
+            self.towers = self.count_towers(board)
+            self.rings = self.count_rings(board)
+            self.sets = self.count_sets(board)
+
+
+        #Create the winning position. 
+        #The winning position is based on the starting position before it's randomized.
+        #Only a winning position from the caller needs checking, one made from a
+        #good board is good too. Nothing is packed until the board is set below.
+        if winning_position == None:
+            winning_position = [[list(ring) for ring in tower] for tower in board]
+
+            if self.sets % 2 == 0:
+                winning_position.reverse()
+            else:
+                winning_position = self.rotate_board(winning_position)
+
+            self._winning_position = winning_position
+        else:
+            self.winning_position = winning_position
+
+
+        if randomize:
+            import random
+
+            #A seeded game draws from its own generator, leaving the random module alone
+            draw = random.Random(seed).randint if seed != None else random.randint
+
+            #Randomly place rings on the board starting with the largest, so each
+            #ring goes on top of bigger ones. Towers are built bottom up and then
+            #turned over.
+            rings = sorted([ring for tower in board for ring in tower],
+                           key=lambda ring: ring[0], reverse=True)
+            stacks = [[] for x in range(len(board))]
+            last_tower = len(board) - 1
+            for ring in rings:
+                stacks[draw(0, last_tower)].append(ring)
+
+            board = [stack[::-1] for stack in stacks]
+
+
+        self.board = board
+        self.won = self.winning_condition()
+        if self.won:
+            self._won_at = 0
+
+
+    @property
+    def board(self):
+        """The board as a list of towers, each a list of [size, set] rings with
+        the top ring first. Built lazily from the packed stacks and cached until
+        the next move, so treat it as read only; assign a new board to change it."""
+
+        if self._board == None:
+            shift = self._set_shift
+            mask = (1 << shift) - 1
+            self._board = [[[code >> shift, code & mask] for code in reversed(stack)]
+                           for stack in self._stacks]
+
+        return self._board
+
+
+    @board.setter
+    def board(self, board):
+        self._load(board)
+
+
+    @property
+    def winning_position(self):
+        """The board to reach, as a list of towers of [size, set] rings with the top
+        ring first. It's packed into the target for every cell when it's set, so
+        treat it as read only; assign a new one to change it mid game."""
+
+        return self._winning_position
+
+
+    @winning_position.setter
+    def winning_position(self, winning_position):
+        validate.validate(winning_position, sets=False)
+        self._winning_position = winning_position
+
+        if self._stacks != None:
+            #Count the misplaced rings again against the new target. The moves
+            #played so far stay in the journal, and the game is won from here if
+            #the board already matches.
+            self._pack_board(self.board)
+            self.won = self._misplaced == 0
+            self._won_at = self._journal_position if self.won else None
+
+
+    def _load(self, board):
+        """Sets up a new board with an empty journal."""
+
+        self._pack_board(board)
+
+        #The journal of moves made on this board, each stored as
+        #source * towers + destination, and how many of them have been played
+        #(fewer after an undo). _won_at is how many had been played when the game
+        #was first won.
+        self._journal = array('l') if self._journaling else None
+        self._journal_position = 0
+        self._won_at = 0 if self.won else None
+
+
+    def _pack_board(self, board):
+        """Packs a list-of-lists board into the per-tower stacks used internally.
+
+        Each tower is a list of ring codes with the top ring at the end, and a
+        ring code is its size shifted left past its set number. The winning
+        position is packed the same way into _target, the ring code wanted at
+        each height of each tower, so whether a ring is in place is one lookup.
+        The count of rings out of place is worked out here once and then kept
+        up to date by move, only for the ring moved, so winning_condition is a
+        comparison with zero."""
+
+        sets = [ring[1] for tower in board for ring in tower] + \
+               [ring[1] for tower in self.winning_position for ring in tower]
+        self._set_shift = max(max(sets or [0]).bit_length(), 1)
+
+        self._stacks = [[self._pack(ring) for ring in reversed(tower)] for tower in board]
+        self._target = [[self._pack(ring) for ring in reversed(tower)]
+                        for tower in self.winning_position]
+        self._board = None
+        self._hash = None
+
+        #The size of the top ring on each tower, None for an empty tower
+        self._tops = [stack[-1] >> self._set_shift if stack else None for stack in self._stacks]
+        self._legal_moves = None
+
+        misplaced = 0
+        ring_count = 0
+        for tower_index in range(len(self._stacks)):
+            stack = self._stacks[tower_index]
+            ring_count += len(stack)
+            for height in range(len(stack)):
+                if not self._in_place(stack[height], tower_index, height):
+                    misplaced += 1
+
+        #A winning position with more rings or towers than the board can never be
+        #reached, so count the shortfall as permanently out of place.
+        target_count = self.count_rings(self.winning_position)
+        misplaced += max(0, target_count - ring_count)
+        if len(self._stacks) != len(self._target):
+            misplaced += 1
+
+        self._misplaced = misplaced
+
+
+    def _pack(self, ring):
+        return (ring[0] << self._set_shift) | ring[1]
+
+
+    def _in_place(self, code, tower_index, height):
+        """True if the winning position has this ring at this height on this tower."""
+        target = self._target
+        return tower_index < len(target) and height < len(target[tower_index]) \
+            and target[tower_index][height] == code
+
+
+    def count_towers(self, board):
+        return len(board)
+
+
+    def count_rings(self, board):
+        rings = 0
+        for tower in board:
+            rings += len(tower)
+
+        return rings
+
+
+    def count_sets(self, board):
+        sets = {}
+        for tower in board:
+            for ring in tower:
+                sets[ring[1]] = True
+
+        return len(sets)
+
+
+    def rotate_board(self, board):
+        """Rotates the board by shuffling all the towers one position to the left
+        and appends the first column on the end."""
+
+        head = board[0]
+        board = board[1:]   #this is doing a shallow copy so we need to return board.
+        board.append(head)
+
+        return board
+
+
+    def valid_move(self, source_tower, destination_tower):
+
+        source_top = self._tops[source_tower]
+        destination_top = self._tops[destination_tower]
+
+        #You can't move a ring from an empty tower
+        if source_top == None:
+            raise ValueError("Cannot move a ring from an empty tower.")
+
+        #It's valid to move a ring to an empty tower
+        if destination_top == None:
+            return True
+
+        #You can't put a ring on top of a smaller one
+        if source_top > destination_top:
+            raise ValueError("Cannot put a ring on top of a smaller ring.")
+
+
+        return True
+
+
+    def winning_condition(self):
+
+        return self._misplaced == 0
+            
+
+
+    def move(self, source_tower, destination_tower):
+
+        #If the source is the same as the desitination don't bother doing anything
+        if source_tower != destination_tower:
+
+            if self.valid_move(source_tower, destination_tower):
+                self._move(source_tower, destination_tower)
+                self._record(source_tower, destination_tower)
+                if self.recorder != None:
+                    self.recorder.write_move(source_tower, destination_tower)
+                self.moves += 1
+
+            if self._misplaced == 0:
+                self._set_won()
+
+
+    def try_move(self, source_tower, destination_tower):
+        """Makes the move if it's legal. Returns True if a ring was moved, and False
+        for an illegal move, a tower that doesn't exist or a move to the same
+        tower, without raising anything."""
+
+        if source_tower == destination_tower:
+            return False
+
+        tops = self._tops
+        try:
+            source_top = tops[source_tower]
+            destination_top = tops[destination_tower]
+        except (IndexError, TypeError):
+            return False
+
+        if source_top == None or (destination_top != None and source_top > destination_top):
+            return False
+
+        self._move(source_tower, destination_tower)
+        self._record(source_tower, destination_tower)
+        if self.recorder != None:
+            self.recorder.write_move(source_tower, destination_tower)
+        self.moves += 1
+
+        if self._misplaced == 0:
+            self._set_won()
+
+        return True
+
+
+    def legal_moves(self):
+        """A list of every legal (source_tower, destination_tower) move. It's worked
+        out from the top ring sizes kept for each tower, and cached until the next
+        move, so asking again costs nothing."""
+
+        if self._legal_moves == None:
+            tops = self._tops
+            towers = range(len(tops))
+            legal = []
+
+            for source_tower in towers:
+                source_top = tops[source_tower]
+                if source_top == None:
+                    continue
+
+                for destination_tower in towers:
+                    destination_top = tops[destination_tower]
+                    if destination_tower != source_tower and \
+                            (destination_top == None or source_top <= destination_top):
+                        legal.append((source_tower, destination_tower))
+
+            self._legal_moves = legal
+
+        return self._legal_moves
+
+
+    def _move(self, source_tower, destination_tower):
+        """Moves the top ring from one tower to another without checking the move
+        is legal, keeping everything worked out from the board up to date."""
+
+        source = self._stacks[source_tower]
+        destination = self._stacks[destination_tower]
+
+        #Only the moved ring can come into or go out of place
+        target = self._target
+        ring = source.pop()
+        height = len(source)
+        if not (source_tower < len(target) and height < len(target[source_tower])
+                and target[source_tower][height] == ring):
+            self._misplaced -= 1
+
+        height = len(destination)
+        if not (destination_tower < len(target) and height < len(target[destination_tower])
+                and target[destination_tower][height] == ring):
+            self._misplaced += 1
+        destination.append(ring)
+
+        if self._hash != None:
+            self._hash ^= self._zobrist_key(ring, source_tower, len(source)) ^ \
+                self._zobrist_key(ring, destination_tower, len(destination) - 1)
+
+        self._tops[source_tower] = source[-1] >> self._set_shift if source else None
+        self._tops[destination_tower] = ring >> self._set_shift
+
+        self._board = None
+        self._legal_moves = None
+
+
+    def _record(self, source_tower, destination_tower):
+        """Adds a move to the journal, dropping any moves that were undone."""
+
+        journal = self._journal
+        if journal == None:
+            return
+
+        self._truncate_journal()
+
+        towers = len(self._stacks)
+        journal.append((source_tower % towers) * towers + destination_tower % towers)
+        self._journal_position += 1
+
+
+    def _truncate_journal(self):
+        position = self._journal_position
+        if position < len(self._journal):
+            del self._journal[position:]
+
+            if self._won_at != None and self._won_at > position:
+                self._won_at = None
+
+
+    def _set_won(self):
+        self.won = True
+        if self._won_at == None:
+            self._won_at = self._journal_position
+
+
+    def undo(self):
+        """Takes back the last move played. Returns that move as
+        (source_tower, destination_tower), or None if there's nothing to undo.
+        Undoing a move is just moving the ring back, so it costs the same as a
+        move and nothing is copied. Only a game made with journal=True has
+        moves to undo."""
+
+        if self._journal == None or self._journal_position == 0:
+            return None
+
+        self._journal_position -= 1
+        source_tower, destination_tower = divmod(self._journal[self._journal_position],
+                                                 len(self._stacks))
+
+        self._move(destination_tower, source_tower)
+        self.moves -= 1
+        if self.recorder != None:
+            self.recorder.write_undo()
+        self.won = self._won_at != None and self._won_at <= self._journal_position
+
+        return (source_tower, destination_tower)
+
+
+    def redo(self):
+        """Plays the last move undone again. Returns the move, or None if there's
+        nothing to redo."""
+
+        if self._journal == None or self._journal_position == len(self._journal):
+            return None
+
+        source_tower, destination_tower = divmod(self._journal[self._journal_position],
+                                                 len(self._stacks))
+        self._journal_position += 1
+
+        self._move(source_tower, destination_tower)
+        self.moves += 1
+        if self.recorder != None:
+            self.recorder.write_redo()
+        self.won = self._won_at != None and self._won_at <= self._journal_position
+
+        return (source_tower, destination_tower)
+
+
+    def seek(self, position):
+        """Undoes or redoes moves until position moves of the journal have been
+        played, so seek(0) goes back to the start."""
+
+        if self._journal == None or position < 0 or position > len(self._journal):
+            raise ValueError("Can only seek between 0 and %d moves." %
+                             (len(self._journal) if self._journal != None else 0))
+
+        while self._journal_position > position:
+            self.undo()
+
+        while self._journal_position < position:
+            self.redo()
+
+
+    def history(self):
+        """The (source_tower, destination_tower) moves played so far, not counting
+        undone ones."""
+
+        if self._journal == None:
+            return []
+
+        towers = len(self._stacks)
+        return [divmod(move, towers) for move in self._journal[:self._journal_position]]
+
+
+    def apply_moves(self, moves):
+        """Plays a stream of (source_tower, destination_tower) moves.
+
+        This does the same as calling move for each one, in a single loop without
+        the per-move method calls, so it's the fast way to replay long games.
+        Returns the number of moves played. An illegal move raises ValueError with
+        the moves before it already applied."""
+
+        stacks = self._stacks
+        tops = self._tops
+        target = self._target
+        target_towers = len(target)
+        shift = self._set_shift
+        misplaced = self._misplaced
+        won = self.won
+        played = 0
+
+        journal = self._journal
+        recorder = self.recorder
+        towers = len(stacks)
+        if journal != None:
+            self._truncate_journal()
+
+        try:
+            for source_tower, destination_tower in moves:
+                if source_tower == destination_tower:
+                    continue
+
+                source_top = tops[source_tower]
+                destination_top = tops[destination_tower]
+
+                if source_top == None or (destination_top != None and source_top > destination_top):
+                    #let valid_move say what was wrong
+                    self.valid_move(source_tower, destination_tower)
+
+                source = stacks[source_tower]
+                destination = stacks[destination_tower]
+
+                ring = source.pop()
+                height = len(source)
+                if not (source_tower < target_towers and height < len(target[source_tower])
+                        and target[source_tower][height] == ring):
+                    misplaced -= 1
+
+                height = len(destination)
+                if not (destination_tower < target_towers and height < len(target[destination_tower])
+                        and target[destination_tower][height] == ring):
+                    misplaced += 1
+
+                destination.append(ring)
+                played += 1
+
+                if journal != None:
+                    journal.append((source_tower % towers) * towers + destination_tower % towers)
+                if recorder != None:
+                    recorder.write_move(source_tower, destination_tower)
+
+                tops[source_tower] = source[-1] >> shift if source else None
+                tops[destination_tower] = source_top
+
+                if self._hash != None:
+                    self._hash ^= self._zobrist_key(ring, source_tower, len(source)) ^ \
+                        self._zobrist_key(ring, destination_tower, len(destination) - 1)
+
+                if misplaced == 0 and not won:
+                    won = True
+                    self._won_at = self._journal_position + played
+        finally:
+            self._misplaced = misplaced
+            self.won = won
+            self.moves += played
+            if journal != None:
+                self._journal_position += played
+            if played:
+                self._board = None
+                self._legal_moves = None
+
+        return played
+
+
+    @property
+    def zobrist_hash(self):
+        """A 64-bit Zobrist hash of the board, see hanoi.zobrist. It's worked out
+        the first time it's asked for, and after that each move updates it by
+        XORing the moved ring's keys, so games that never ask don't pay for it.
+        The keys cover each ring's height as well as its tower, so equal sized
+        rings from different sets stacked in a different order hash differently."""
+
+        if self._hash == None:
+            from hanoi import zobrist
+
+            codes = max([code for stack in self._stacks for code in stack] + [0]) + 1
+            capacity = max(self.count_rings(self._stacks), 1)
+            self._zobrist_keys = zobrist.key_table(codes, len(self._stacks), capacity)
+            self._zobrist_capacity = capacity
+
+            self._hash = 0
+            for tower_index in range(len(self._stacks)):
+                stack = self._stacks[tower_index]
+                for height in range(len(stack)):
+                    self._hash ^= self._zobrist_key(stack[height], tower_index, height)
+
+        return self._hash
+
+
+    def _zobrist_key(self, code, tower_index, height):
+        towers = len(self._stacks)
+        return self._zobrist_keys[(code * towers + tower_index % towers) * self._zobrist_capacity + height]
+
+
+    def iter_optimal_moves(self):
+        """Returns an iterator over the moves of a shortest route from the current
+        position to the winning position. Classic boards are generated a move at
+        a time in constant memory, so this works for any number of rings."""
+
+        from hanoi import solver
+        return solver.solve(self)
+
+
+    def distance_to_win(self, directory=None):
+        """The number of moves left in a shortest route to the winning position,
+        looked up in the pattern database for this configuration. The database is
+        built the first time and then shared, see hanoi.pattern_db."""
+
+        from hanoi import pattern_db
+
+        #The database is kept with the target it was checked against. The target
+        #is packed again whenever the board or winning position is replaced, so
+        #until then only the board needs encoding.
+        cached = self._distance_db
+        if cached == None or cached[0] is not self._target or cached[1] != directory:
+            database = pattern_db.database_for(self, directory)
+            distance = database.distance(self)
+            self._distance_db = (self._target, directory, database)
+            return distance
+
+        return cached[2].lookup(pattern_db.encode(self))
+
+
+    def rank(self):
+        """The board's number among all the legal boards with the same towers,
+        rings and sets, from 0 up to hanoi.ranking.count(). Needs every ring size
+        in every set, as in a standard game."""
+
+        from hanoi import ranking
+        return ranking.rank(self._stacks, self._set_shift)
+
+
+    @classmethod
+    def from_rank(cls, towers, rings, sets, rank, **game_kwargs):
+        """A game starting from the board numbered rank, heading for the winning
+        position of a standard game with the same towers, rings and sets."""
+
+        from hanoi import ranking
+        winning_position = cls(towers=towers, rings=rings, sets=sets).winning_position
+
+        return cls(start_position=ranking.unrank(towers, rings, sets, rank),
+                   winning_position=winning_position, **game_kwargs)
+
+
+    def get_top_ring(self, tower_index):
+
+        stack = self._stacks[tower_index]
+        if len(stack) > 0:
+            return [stack[-1] >> self._set_shift, stack[-1] & ((1 << self._set_shift) - 1)]
+        else:
+            return None
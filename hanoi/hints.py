@@ -0,0 +1,170 @@
+"""
+Alan M Jackson
+
+Optimal next moves worked out on a background thread.
+
+A Hinter takes positions to solve from the UI thread and solves them on a
+worker thread, so a big board doesn't freeze the game while the solver runs.
+poll never waits: it returns the next move if it's known, and otherwise asks
+the worker for it and returns None, to be asked again on the next tick.
+
+Every position along a solution is cached with its next move, up to lookahead
+moves ahead, so asking again for the same position, or for the next position
+along the solution as auto-play does, costs a dict lookup. A position the solver
+failed on is cached as NO_MOVE too, and error says what went wrong.
+"""
+
+import time
+import threading
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+from hanoi.game import Game
+
+
+#poll's answer for a position with no move to make, because it's already won
+#or the winning position can't be reached from it
+NO_MOVE = ()
+
+
+class Hinter(object):
+
+    def __init__(self, lookahead=256, max_positions=1 << 16):
+        self.lookahead = lookahead
+        self.max_positions = max_positions
+
+        self.cache = {}
+        self.pending = set()
+        self.solved = 0
+
+        #The exception raised solving each position that failed, keyed like the cache
+        self.errors = {}
+
+        self._lock = threading.Lock()
+        self._ready = threading.Condition(self._lock)
+        self._requests = queue.Queue()
+
+        self._thread = threading.Thread(target=self._run, name="hanoi-hints")
+        self._thread.daemon = True
+        self._thread.start()
+
+
+    @staticmethod
+    def key(game):
+        """The cache key for a game's position and winning position."""
+
+        return (tuple(tuple(stack) for stack in game._stacks),
+                tuple(tuple(stack) for stack in game._target))
+
+
+    def poll(self, game):
+        """The next move of a shortest solution from the game's position, NO_MOVE
+        if there isn't one, or None if it's still being worked out."""
+
+        key = self.key(game)
+        with self._lock:
+            move = self.cache.get(key)
+            if move != None or key in self.pending:
+                return move
+
+            self.pending.add(key)
+
+        #The worker gets a copy so the game can carry on being played
+        board = [[list(ring) for ring in tower] for tower in game.board]
+        winning_position = [[list(ring) for ring in tower] for tower in game.winning_position]
+        self._requests.put((key, board, winning_position))
+
+        return None
+
+
+    def hint(self, game, timeout=None):
+        """The next move like poll, waiting for it to be worked out."""
+
+        move = self.poll(game)
+        if move != None:
+            return move
+
+        key = self.key(game)
+        deadline = None if timeout == None else time.time() + timeout
+        with self._lock:
+            while key not in self.cache:
+                if deadline == None:
+                    self._ready.wait()
+                elif time.time() < deadline:
+                    self._ready.wait(deadline - time.time())
+                else:
+                    return None
+
+            return self.cache[key]
+
+
+    def error(self, game):
+        """The exception solving the game's position raised, or None. poll gives
+        NO_MOVE for a position that failed."""
+
+        with self._lock:
+            return self.errors.get(self.key(game))
+
+
+    def close(self, timeout=1.0):
+        """Stops the worker once it's finished what it's doing, waiting up to
+        timeout seconds for it. A worker still in a long solve is left to it, as
+        it's a daemon thread and won't keep the program running."""
+
+        self._requests.put(None)
+        self._thread.join(timeout)
+
+
+    def _run(self):
+        while True:
+            request = self._requests.get()
+            if request == None:
+                return
+
+            key, board, winning_position = request
+            error = None
+            try:
+                found = self._solve(board, winning_position)
+            except Exception as e:
+                found = {}
+                error = e
+
+            with self._lock:
+                if len(self.cache) + len(found) > self.max_positions:
+                    self.cache.clear()
+                    self.errors.clear()
+
+                self.cache.update(found)
+                self.cache.setdefault(key, NO_MOVE)
+                if error != None:
+                    self.errors[key] = error
+                self.pending.discard(key)
+                self.solved += 1
+                self._ready.notify_all()
+
+
+    def _solve(self, board, winning_position):
+        """The next move from each position along a shortest solution, as a dict
+        keyed like the cache. It's empty if there's no solution, and anything
+        else that goes wrong is raised for _run to keep."""
+
+        found = {}
+        try:
+            game = Game(start_position=board, winning_position=winning_position, journal=False)
+            if game.winning_condition():
+                return found
+
+            for move in game.iter_optimal_moves():
+                found[self.key(game)] = move
+                if len(found) >= self.lookahead:
+                    break
+
+                game.move(*move)
+
+        except ValueError:
+            pass
+
+        return found
@@ -0,0 +1,228 @@
+"""
+Alan M Jackson
+
+Opt-in timing of the game's hot paths.
+
+enable() swaps each target function for a wrapper that counts its calls and
+records how long each took in a Histogram of nanoseconds, and disable() puts the
+originals back, so nothing is slowed down unless instrumentation is on. The
+targets cover the game model, the curses view (if it can be imported) and the
+solvers. dump() writes what was recorded as JSON:
+
+    python -m hanoi --profile-out profile.json
+
+The histograms use HDR style buckets: values below 2 * 2^SUB_BUCKET_BITS get a
+bucket each, and above that every power of two is split into 2^SUB_BUCKET_BITS
+equal buckets, so a value is only ever rounded down by less than one part in
+2^SUB_BUCKET_BITS however big it is, and recording one is a few integer
+operations. Each histogram has a lock, as the solvers are also timed on the
+hint worker's thread while the main thread reads them.
+"""
+
+import sys
+import json
+import time
+import threading
+import functools
+import importlib
+
+
+SUB_BUCKET_BITS = 4
+
+#(module, class or None for a module function, function, label)
+TARGETS = [
+    ("hanoi.game", "Game", "move", "Game.move"),
+    ("hanoi.game", "Game", "try_move", "Game.try_move"),
+    ("hanoi.game", "Game", "apply_moves", "Game.apply_moves"),
+    ("hanoi.game", "Game", "valid_move", "Game.valid_move"),
+    ("hanoi.game", "Game", "winning_condition", "Game.winning_condition"),
+    ("hanoi.game", "Game", "undo", "Game.undo"),
+    ("hanoi.view", "GameView", "show_board", "GameView.show_board"),
+    ("hanoi.view", "GameView", "update_board", "GameView.update_board"),
+    ("hanoi.view", "GameView", "show_tower", "GameView.show_tower"),
+    ("hanoi.view", "GameView", "input_move", "GameView.input_move"),
+    ("hanoi.solver", None, "solve", "solver.solve"),
+    ("hanoi.solver", None, "solution_length", "solver.solution_length"),
+    ("hanoi.solver", None, "search", "solver.search"),
+    ("hanoi.search", None, "shortest_path", "search.shortest_path"),
+    ("hanoi.frame_stewart", None, "move_count", "frame_stewart.move_count"),
+]
+
+if hasattr(time, "perf_counter_ns"):
+    clock = time.perf_counter_ns
+else:
+    import timeit
+
+    def clock():
+        return int(timeit.default_timer() * 1e9)
+
+
+#Histograms by label, kept after disable() until reset()
+histograms = {}
+
+#(owner, name, original) for each function swapped out by enable()
+_patched = []
+
+
+class Histogram(object):
+    """Counts of nanosecond values in HDR style log-linear buckets."""
+
+    def __init__(self, sub_bucket_bits=SUB_BUCKET_BITS):
+        self.sub_bucket_bits = sub_bucket_bits
+        self.counts = []
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+        #Reentrant, as to_dict takes it and then calls mean and percentile
+        self.lock = threading.RLock()
+
+
+    def bucket(self, value):
+        """The index of the bucket value goes in."""
+
+        shift = value.bit_length() - self.sub_bucket_bits - 1
+        if shift <= 0:
+            return value
+
+        return (shift << self.sub_bucket_bits) + (value >> shift)
+
+
+    def bucket_value(self, index):
+        """The smallest value in a bucket."""
+
+        size = 1 << self.sub_bucket_bits
+        if index < 2 * size:
+            return index
+
+        shift = (index >> self.sub_bucket_bits) - 1
+        return (index - (shift << self.sub_bucket_bits)) << shift
+
+
+    def record(self, value):
+        index = self.bucket(value)
+        with self.lock:
+            counts = self.counts
+            if index >= len(counts):
+                counts.extend([0] * (index + 1 - len(counts)))
+
+            counts[index] += 1
+            self.count += 1
+            self.total += value
+            if self.min == None or value < self.min:
+                self.min = value
+            if self.max == None or value > self.max:
+                self.max = value
+
+
+    def mean(self):
+        with self.lock:
+            if self.count == 0:
+                return None
+
+            return self.total / float(self.count)
+
+
+    def percentile(self, percent):
+        """The bucket value that percent of the recorded values are at or below."""
+
+        with self.lock:
+            if self.count == 0:
+                return None
+
+            wanted = max(1, int(round(self.count * percent / 100.0)))
+            seen = 0
+            for index in range(len(self.counts)):
+                seen += self.counts[index]
+                if seen >= wanted:
+                    return min(self.bucket_value(index), self.max)
+
+            return self.max
+
+
+    def to_dict(self):
+        with self.lock:
+            return {"count": self.count,
+                    "total_ns": self.total,
+                    "min_ns": self.min,
+                    "max_ns": self.max,
+                    "mean_ns": self.mean(),
+                    "p50_ns": self.percentile(50),
+                    "p90_ns": self.percentile(90),
+                    "p99_ns": self.percentile(99),
+                    "buckets": dict((str(self.bucket_value(i)), self.counts[i])
+                                    for i in range(len(self.counts)) if self.counts[i])}
+
+
+def timed(function, histogram):
+    """A wrapper for function that records how long each call takes."""
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        started = clock()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            histogram.record(clock() - started)
+
+    return wrapper
+
+
+def enable(targets=None):
+    """Starts timing the targets, TARGETS by default. Targets in modules that
+    can't be imported, like the view without curses, are left out."""
+
+    if targets == None:
+        targets = TARGETS
+
+    for module_name, class_name, name, label in targets:
+        try:
+            module = importlib.import_module(module_name)
+        except ImportError:
+            continue
+
+        owner = module if class_name == None else getattr(module, class_name)
+        original = owner.__dict__[name]
+        if any(entry[0] is owner and entry[1] == name for entry in _patched):
+            continue
+
+        if label not in histograms:
+            histograms[label] = Histogram()
+
+        setattr(owner, name, timed(original, histograms[label]))
+        _patched.append((owner, name, original))
+
+
+def disable():
+    """Puts back every function enable() swapped out."""
+
+    while _patched:
+        owner, name, original = _patched.pop()
+        setattr(owner, name, original)
+
+
+def enabled():
+    return len(_patched) > 0
+
+
+def reset():
+    histograms.clear()
+
+
+def report():
+    """The recorded histograms as a dict of label to to_dict()."""
+
+    return dict((label, histograms[label].to_dict())
+                for label in histograms if histograms[label].count)
+
+
+def dump(path):
+    """Writes the report as JSON to path, or to stdout for "-"."""
+
+    text = json.dumps(report(), indent=2, sort_keys=True)
+    if path == "-":
+        sys.stdout.write(text + "\n")
+    else:
+        with open(path, "w") as f:
+            f.write(text + "\n")
@@ -0,0 +1,191 @@
+"""
+Alan M Jackson
+
+Pattern databases: the distance to the winning position from every board.
+
+A database is built once for a (towers, rings) configuration and winning
+position by a breadth first search backwards from the winning position, and is
+stored on disk as a header followed by one distance per board, indexed by the
+board's hanoi.search encoding. It is memory mapped when it's used, so asking how
+far a board is from winning is a single lookup, and every Game with the same
+configuration shares the same database.
+
+Only boards with one set of rings are supported, as the encoding needs every
+ring to be a different size.
+"""
+
+import os
+import sys
+import mmap
+import time
+import array
+import struct
+import tempfile
+
+from hanoi import search
+
+
+#magic, version, distance width in bytes, towers, rings, goal, build time
+_HEADER = struct.Struct("<4sBBHHQd")
+_MAGIC = b"HPDB"
+_VERSION = 1
+
+_TYPECODES = {1: "B", 2: "H", 4: "I"}
+
+#Shared databases keyed by (directory, towers, rings, goal)
+_databases = {}
+
+
+class PatternDatabase(object):
+    """The distances to one goal for every board with a given number of towers and
+    rings, memory mapped from a file in directory."""
+
+    def __init__(self, towers, rings, goal, directory=None):
+        if towers ** rings > search.MAX_ARRAY_STATES:
+            raise ValueError("Too many boards for a pattern database.")
+
+        self.towers = towers
+        self.rings = rings
+        self.goal = goal
+        self.directory = directory or default_directory()
+        self.path = os.path.join(self.directory, "hanoi-%d-%d-%d.pdb" % (towers, rings, goal))
+        self.states = towers ** rings
+
+        #Every board is at most 2^rings - 1 moves from any other
+        self.width = 1
+        while 2 ** rings > 256 ** self.width - 1:
+            self.width *= 2
+
+        self.unreachable = 256 ** self.width - 1
+        self._unpack = struct.Struct("<" + _TYPECODES[self.width]).unpack_from
+
+        if not os.path.exists(self.path):
+            self.build()
+
+        self._open()
+
+
+    def build(self):
+        """Runs the search and writes the database file."""
+
+        started = time.time()
+
+        towers = self.towers
+        rings = self.rings
+        powers = [towers ** i for i in range(rings)]
+
+        distances = array.array(_TYPECODES[self.width], [self.unreachable]) * self.states
+        distances[self.goal] = 0
+
+        #Every move can be undone, so searching forwards from the goal gives the
+        #distance from each board back to it.
+        frontier = [self.goal]
+        distance = 0
+        while frontier:
+            distance += 1
+            next_frontier = []
+            for state in frontier:
+                for source, destination, next_state in search.next_states(state, towers, rings, powers):
+                    if distances[next_state] == self.unreachable:
+                        distances[next_state] = distance
+                        next_frontier.append(next_state)
+
+            frontier = next_frontier
+
+        if sys.byteorder != "little":
+            distances.byteswap()
+
+        self.build_time = time.time() - started
+
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+
+        #Write to a temporary name so a half written file is never opened
+        partial = self.path + ".%d" % os.getpid()
+        with open(partial, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, _VERSION, self.width, towers, rings,
+                                 self.goal, self.build_time))
+            distances.tofile(f)
+
+        os.rename(partial, self.path)
+
+
+    def _open(self):
+        with open(self.path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, width, towers, rings, goal, build_time = _HEADER.unpack_from(self._map, 0)
+        if magic != _MAGIC or version != _VERSION or width != self.width or \
+                (towers, rings, goal) != (self.towers, self.rings, self.goal):
+            self.close()
+            raise ValueError("%s is not the pattern database it's named as." % self.path)
+
+        self.build_time = build_time
+        self.size = len(self._map)
+
+
+    def close(self):
+        self._map.close()
+
+
+    def lookup(self, state):
+        """The number of moves from an encoded board to the goal, or None if the
+        goal can't be reached from it."""
+
+        if state < 0 or state >= self.states:
+            raise ValueError("There's no board %d in this pattern database." % state)
+
+        distance = self._unpack(self._map, _HEADER.size + state * self.width)[0]
+        if distance == self.unreachable:
+            return None
+
+        return distance
+
+
+    def distance(self, game):
+        """The number of moves from the game's board to the goal. Raises
+        ValueError if the board isn't one the database was built for."""
+
+        sizes = sorted([code >> game._set_shift for stack in game._stacks for code in stack])
+        if len(game._stacks) != self.towers or sizes != list(range(1, self.rings + 1)):
+            raise ValueError("This pattern database is for %d towers and one set of %d rings." %
+                             (self.towers, self.rings))
+
+        return self.lookup(encode(game))
+
+
+def default_directory():
+    return os.path.join(tempfile.gettempdir(), "hanoi-pattern-db")
+
+
+def encode(game):
+    """The hanoi.search encoding of a one set game, where ring size n is digit n - 1."""
+
+    return _encode(game._stacks, game._set_shift)
+
+
+def _encode(stacks, shift):
+    towers = len(stacks)
+
+    state = 0
+    for tower in range(towers):
+        for code in stacks[tower]:
+            state += tower * towers ** ((code >> shift) - 1)
+
+    return state
+
+
+def database_for(game, directory=None):
+    """The pattern database for the game's configuration and winning position,
+    building it the first time it is asked for."""
+
+    sizes = sorted([code >> game._set_shift for stack in game._target for code in stack])
+    if game.count_sets(game.winning_position) > 1 or sizes != list(range(1, len(sizes) + 1)):
+        raise ValueError("Pattern databases need one set of rings sized 1 up to the number of rings.")
+
+    key = (directory or default_directory(), len(game._target), len(sizes),
+           _encode(game._target, game._set_shift))
+    if key not in _databases:
+        _databases[key] = PatternDatabase(key[1], key[2], key[3], key[0])
+
+    return _databases[key]
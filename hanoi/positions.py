@@ -0,0 +1,102 @@
+"""
+Alan M Jackson
+
+Random starting positions in bulk, with NumPy.
+
+A random position is drawn the way Game(randomize=True) draws one: each ring is
+put on a random tower, largest first, so every ring lands on bigger ones and
+any assignment of rings to towers is a legal board. That means a batch of
+positions is just a (count, rings) array of tower indexes, drawn in one call
+from a generator seeded by seed, so the same seed always gives the same
+positions. Columns follow ring_order: the largest rings first, and rings of the
+same size in set order.
+
+With one set of rings a position can be encoded as a single integer the way
+hanoi.search does, with ring size n as digit n - 1 in base towers.
+
+    for states in positions.iter_states(towers=4, rings=10, count=10 ** 6, seed=1):
+        ...
+"""
+
+import numpy
+
+from hanoi.game import Game
+
+
+#Rows drawn at a time by the iterators
+CHUNK = 1 << 16
+
+
+def ring_order(rings, sets=1):
+    """The (size, set) rings for each column of an assignment array."""
+
+    return [(size, ring_set) for size in range(rings, 0, -1) for ring_set in range(sets)]
+
+
+def assignments(towers, rings, count, seed=None, sets=1):
+    """A (count, rings * sets) array of random tower indexes, one row per
+    position and one column per ring in ring_order."""
+
+    return _assignments(numpy.random.RandomState(seed), towers, rings * sets, count)
+
+
+def _assignments(generator, towers, columns, count):
+    dtype = numpy.uint8 if towers <= 256 else numpy.uint16
+    return generator.randint(0, towers, size=(count, columns)).astype(dtype)
+
+
+def iter_assignments(towers, rings, count, seed=None, sets=1, chunk=CHUNK):
+    """The rows of assignments(towers, rings, count, seed, sets), in arrays of
+    up to chunk rows so they don't all have to fit in memory at once."""
+
+    generator = numpy.random.RandomState(seed)
+    while count > 0:
+        size = min(count, chunk)
+        yield _assignments(generator, towers, rings * sets, size)
+        count -= size
+
+
+def encode(assignment, towers):
+    """The hanoi.search encoding of each row of a one set assignment array, as
+    an int64 array."""
+
+    rings = assignment.shape[-1]
+    if towers ** rings > numpy.iinfo(numpy.int64).max:
+        raise ValueError("Too many boards to encode in 64 bits.")
+
+    #Column i is ring size rings - i, digit rings - i - 1
+    powers = numpy.array([towers ** (rings - i - 1) for i in range(rings)], dtype=numpy.int64)
+    return assignment.astype(numpy.int64).dot(powers)
+
+
+def iter_states(towers, rings, count, seed=None, chunk=CHUNK):
+    """Encoded random one set positions, in int64 arrays of up to chunk."""
+
+    for assignment in iter_assignments(towers, rings, count, seed, 1, chunk):
+        yield encode(assignment, towers)
+
+
+def board(row, towers, rings, sets=1):
+    """The list-of-lists board, top ring first, for one row of an assignment array."""
+
+    board = [[] for tower in range(towers)]
+    for tower, (size, ring_set) in zip(row, ring_order(rings, sets)):
+        board[tower].append([size, ring_set])
+
+    for tower in board:
+        tower.reverse()
+
+    return board
+
+
+def games(towers, rings, count, seed=None, sets=1, **game_kwargs):
+    """Generates Games at random positions, all heading for the winning position
+    of a standard game with the same towers, rings and sets."""
+
+    winning_position = Game(towers=towers, rings=rings, sets=sets).winning_position
+
+    for assignment in iter_assignments(towers, rings, count, seed, sets):
+        for row in assignment.tolist():
+            yield Game(start_position=board(row, towers, rings, sets),
+                       winning_position=[[list(ring) for ring in tower] for tower in winning_position],
+                       **game_kwargs)
@@ -0,0 +1,146 @@
+"""
+Alan M Jackson
+
+Numbering every legal board, so a board can be stored as one integer.
+
+With one set of rings each ring only has to say which tower it's on, as the
+order on a tower is fixed by size, so a board is a number in base towers with
+ring size n as digit n - 1. That's the hanoi.search encoding.
+
+With m sets there are m rings of each size, which can be in any order among
+themselves. Placing them one set at a time, the ring from set j goes into one
+of towers + j gaps: the top of each tower's run of rings that size, and below
+each of the j rings already placed. So each size is one digit in base
+towers * (towers + 1) * ... * (towers + m - 1), made of a digit in base
+towers + j for each set j, set 0 lowest, and the sizes go smallest in the lowest
+digit as before. Every number below count(towers, rings, sets) is a legal board
+and every legal board has one number.
+
+Ranks are Python integers, so huge boards work. Single set boards with up to 36
+towers are ranked by int(digits, towers), which does the arithmetic in C.
+"""
+
+
+_DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+
+def radix(towers, sets):
+    """The number of ways of arranging the sets rings of one size."""
+
+    ways = 1
+    for j in range(sets):
+        ways *= towers + j
+
+    return ways
+
+
+def count(towers, rings, sets=1):
+    """The number of legal boards."""
+
+    return radix(towers, sets) ** rings
+
+
+def rank(stacks, shift):
+    """The number of a board given as stacks of ring codes, top ring last, where
+    a ring code is its size shifted left by shift past its set. The board must
+    have one ring of each size from 1 up in each set from 0 up."""
+
+    towers = len(stacks)
+    mask = (1 << shift) - 1
+
+    #For each size, the (set, tower) of its rings by tower and then top down
+    sizes = {}
+    for tower in range(towers):
+        for code in reversed(stacks[tower]):
+            sizes.setdefault(code >> shift, []).append((code & mask, tower))
+
+    rings = len(sizes)
+    sets = len(sizes.get(1, ()))
+    for size in range(1, rings + 1):
+        if size not in sizes or sorted(ring_set for ring_set, tower in sizes[size]) != list(range(sets)):
+            raise ValueError("Only boards with every ring size in every set can be ranked.")
+
+    if sets == 1:
+        if 2 <= towers <= len(_DIGITS):
+            return int("".join([_DIGITS[sizes[size][0][1]] for size in range(rings, 0, -1)]) or "0",
+                       towers)
+
+        number = 0
+        for size in range(rings, 0, -1):
+            number = number * towers + sizes[size][0][1]
+
+        return number
+
+    ways = radix(towers, sets)
+    number = 0
+    for size in range(rings, 0, -1):
+        number = number * ways + _rank_size(sizes[size], towers, sets)
+
+    return number
+
+
+def _rank_size(rings, towers, sets):
+    """The digit for the arrangement of one size's rings, given as (set, tower)
+    by tower and then top down."""
+
+    blocks = [[] for tower in range(towers)]
+    for ring_set, tower in rings:
+        blocks[tower].append(ring_set)
+
+    #Take the rings out last set first, noting the gap each one was in
+    slots = [0] * sets
+    for ring_set in range(sets - 1, -1, -1):
+        gap = 0
+        for tower in range(towers):
+            if ring_set in blocks[tower]:
+                gap += blocks[tower].index(ring_set)
+                blocks[tower].remove(ring_set)
+                break
+
+            gap += len(blocks[tower]) + 1
+
+        slots[ring_set] = gap
+
+    number = 0
+    for ring_set in range(sets - 1, -1, -1):
+        number = number * (towers + ring_set) + slots[ring_set]
+
+    return number
+
+
+def unrank(towers, rings, sets, number):
+    """The board, as a list of towers of [size, set] rings top first, with a
+    number."""
+
+    if number < 0 or number >= count(towers, rings, sets):
+        raise ValueError("There's no board numbered %d." % number)
+
+    board = [[] for tower in range(towers)]
+
+    if sets == 1:
+        for size in range(1, rings + 1):
+            number, tower = divmod(number, towers)
+            board[tower].append([size, 0])
+
+        return board
+
+    ways = radix(towers, sets)
+    for size in range(1, rings + 1):
+        number, digit = divmod(number, ways)
+
+        #Put the rings back first set first, each into its gap
+        blocks = [[] for tower in range(towers)]
+        for ring_set in range(sets):
+            digit, gap = divmod(digit, towers + ring_set)
+            for tower in range(towers):
+                if gap <= len(blocks[tower]):
+                    blocks[tower].insert(gap, ring_set)
+                    break
+
+                gap -= len(blocks[tower]) + 1
+
+        #Smaller rings are already on the towers, so these go underneath
+        for tower in range(towers):
+            board[tower].extend([[size, ring_set] for ring_set in blocks[tower]])
+
+    return board
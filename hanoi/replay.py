@@ -0,0 +1,334 @@
+"""
+Alan M Jackson
+
+Replay files: a compact binary record of a game.
+
+A replay file starts with a header giving the number of towers, rings and sets,
+followed by the start and winning positions, and then the moves one after
+another to the end of the file. With up to 16 towers a move is one byte, the
+source tower in the high four bits and the destination in the low four. With
+more towers each tower index is a varint, seven bits a byte with the top bit
+set on every byte but the last. A game never records a move from a tower to
+itself, so those stand for an undo, UNDO, from tower 0 to 0, and a redo, REDO,
+from tower 1 to 1. Undos and redos can only be replayed on a game with a
+journal, see Game.
+
+A position is written as a varint count of towers, then for each tower a
+varint count of rings and each ring, top first, as a varint size and set.
+
+A ReplayWriter attached to a Game writes every move made on it as it is made,
+and a ReplayReader memory maps a file and reads the moves back a chunk at a
+time, so neither ever holds the whole game in memory.
+"""
+
+import os
+import mmap
+import struct
+
+from hanoi.game import Game
+
+
+#magic, version, move format, towers, rings, sets
+_HEADER = struct.Struct("<4sBBHHH")
+_MAGIC = b"HRPL"
+_VERSION = 1
+
+#Move formats
+PACKED = 0      #one byte per move
+VARINT = 1      #a varint for each tower index
+
+#Records for a move undone and a move redone
+UNDO = (0, 0)
+REDO = (1, 1)
+
+#The most towers that fit in a packed move
+MAX_PACKED_TOWERS = 16
+
+_CHUNK = 1 << 16
+
+
+class ReplayWriter(object):
+    """Records the moves made on a game to a replay file at path, starting from
+    the game's board as it is now."""
+
+    def __init__(self, path, game, buffer_size=_CHUNK):
+        self.game = game
+        self.towers = len(game._stacks)
+        self.format = PACKED if self.towers <= MAX_PACKED_TOWERS else VARINT
+        self.buffer_size = buffer_size
+        self.count = 0
+
+        self.file = open(path, "wb")
+
+        header = bytearray(_HEADER.pack(_MAGIC, _VERSION, self.format, self.towers,
+                                        game.rings, game.sets))
+        header += _encode_position(game.board)
+        header += _encode_position(game.winning_position)
+        self.file.write(header)
+        self.file.flush()
+
+        self._buffer = bytearray()
+        game.recorder = self
+
+
+    def write_move(self, source_tower, destination_tower):
+        """Adds a move to the file. Called by the game for every move made.
+        Raises ValueError for a tower that doesn't exist, or a move from a tower
+        to itself, which would read back as an undo or redo."""
+
+        towers = self.towers
+        if not (-towers <= source_tower < towers and -towers <= destination_tower < towers):
+            raise ValueError("There's no tower %d or %d to record a move between." %
+                             (source_tower, destination_tower))
+
+        source_tower %= towers
+        destination_tower %= towers
+        if source_tower == destination_tower:
+            raise ValueError("A move from a tower to itself can't be recorded.")
+
+        self._write(source_tower, destination_tower)
+
+
+    def write_undo(self):
+        """Adds an undo to the file. Called by the game for every undo."""
+
+        self._write(*UNDO)
+
+
+    def write_redo(self):
+        """Adds a redo to the file. Called by the game for every redo."""
+
+        self._write(*REDO)
+
+
+    def _write(self, source_tower, destination_tower):
+        if self.format == PACKED:
+            self._buffer.append(source_tower << 4 | destination_tower)
+        else:
+            self._buffer += _varint(source_tower) + _varint(destination_tower)
+
+        self.count += 1
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+
+    def flush(self):
+        self.file.write(self._buffer)
+        self.file.flush()
+        del self._buffer[:]
+
+
+    def close(self):
+        """Writes out the moves still buffered and stops recording the game."""
+
+        if self.file.closed:
+            return
+
+        self.flush()
+        self.file.close()
+
+        if self.game.recorder is self:
+            self.game.recorder = None
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class ReplayReader(object):
+    """A replay file memory mapped for reading."""
+
+    def __init__(self, path):
+        self.path = path
+
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < _HEADER.size:
+                raise ValueError("%s is not a replay file." % path)
+
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.format, self.towers, self.rings, self.sets = \
+            _HEADER.unpack_from(self._map, 0)
+        if magic != _MAGIC or version != _VERSION or self.format not in (PACKED, VARINT):
+            self.close()
+            raise ValueError("%s is not a replay file." % path)
+
+        self.start_position, offset = _decode_position(self._map, _HEADER.size)
+        self.winning_position, offset = _decode_position(self._map, offset)
+        self._moves_offset = offset
+
+
+    def close(self):
+        self._map.close()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+    def __len__(self):
+        """The number of records in the file, moves, undos and redos."""
+
+        if self.format == PACKED:
+            return len(self._map) - self._moves_offset
+
+        return sum(1 for move in self.moves())
+
+
+    def moves(self):
+        """Generates the (source_tower, destination_tower) moves in the file, with
+        UNDO and REDO for the undos and redos."""
+
+        data = self._map
+        offset = self._moves_offset
+        end = len(data)
+
+        if self.format == PACKED:
+            while offset < end:
+                chunk = bytearray(data[offset:offset + _CHUNK])
+                offset += len(chunk)
+                for byte in chunk:
+                    yield (byte >> 4, byte & 0x0f)
+
+            return
+
+        #Varints can run over the end of a chunk, so the partial value carries on
+        source = None
+        value = 0
+        shift = 0
+        while offset < end:
+            chunk = bytearray(data[offset:offset + _CHUNK])
+            offset += len(chunk)
+            for byte in chunk:
+                value |= (byte & 0x7f) << shift
+                if byte & 0x80:
+                    shift += 7
+                    continue
+
+                if source == None:
+                    source = value
+                else:
+                    yield (source, value)
+                    source = None
+
+                value = 0
+                shift = 0
+
+        if source != None or shift != 0:
+            raise ValueError("%s ends part way through a move." % self.path)
+
+
+    def game(self, **game_kwargs):
+        """A new Game at the start of the replay."""
+
+        start_position = [[list(ring) for ring in tower] for tower in self.start_position]
+        winning_position = [[list(ring) for ring in tower] for tower in self.winning_position]
+
+        return Game(start_position=start_position, winning_position=winning_position, **game_kwargs)
+
+
+    def replay(self, game=None):
+        """Plays the moves in the file on game, or on a new game at the start of the
+        replay, and returns the game. Raises ValueError at an undo or redo if the
+        game has no journal to take it from."""
+
+        if game == None:
+            game = self.game()
+
+        #Runs of moves are played in one go, up to each undo or redo
+        moves = []
+        for move in self.moves():
+            if move[0] != move[1]:
+                moves.append(move)
+                if len(moves) < _CHUNK:
+                    continue
+
+            #An empty apply_moves would still drop the moves there are to redo
+            if moves:
+                game.apply_moves(moves)
+                moves = []
+
+            if move in (UNDO, REDO) and game._journal == None:
+                raise ValueError("%s has undos and redos, which need a game with a journal." %
+                                 self.path)
+
+            if move == UNDO:
+                game.undo()
+            elif move == REDO:
+                game.redo()
+
+        if moves:
+            game.apply_moves(moves)
+
+        return game
+
+
+def replay(path, **game_kwargs):
+    """The game at the end of the replay file at path."""
+
+    with ReplayReader(path) as reader:
+        return reader.replay(reader.game(**game_kwargs))
+
+
+def _varint(value):
+    data = bytearray()
+    while value > 0x7f:
+        data.append(value & 0x7f | 0x80)
+        value >>= 7
+
+    data.append(value)
+    return data
+
+
+def _read_varint(data, offset):
+    """The varint at offset in data, and the offset after it."""
+
+    value = 0
+    shift = 0
+    while True:
+        if offset >= len(data):
+            raise ValueError("A replay file ends part way through its header.")
+
+        byte = bytearray(data[offset:offset + 1])[0]
+        offset += 1
+        value |= (byte & 0x7f) << shift
+        if not byte & 0x80:
+            return value, offset
+
+        shift += 7
+
+
+def _encode_position(board):
+    data = _varint(len(board))
+    for tower in board:
+        data += _varint(len(tower))
+        for size, set in tower:
+            data += _varint(size) + _varint(set)
+
+    return data
+
+
+def _decode_position(data, offset):
+    """The position at offset in data, and the offset after it."""
+
+    board = []
+    towers, offset = _read_varint(data, offset)
+    for i in range(towers):
+        tower = []
+        rings, offset = _read_varint(data, offset)
+        for j in range(rings):
+            size, offset = _read_varint(data, offset)
+            set, offset = _read_varint(data, offset)
+            tower.append([size, set])
+
+        board.append(tower)
+
+    return board, offset
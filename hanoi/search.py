@@ -0,0 +1,403 @@
+"""
+Alan M Jackson
+
+State space search over boards where every ring is a different size.
+
+When no two rings are the same size the order of the rings on a tower is fixed,
+so a board is just the tower each ring is on. A board is encoded as an integer
+with one base-towers digit per ring, smallest ring in the lowest digit, and the
+search keeps one byte per board in a bytearray, recording the move that first
+reached it, instead of a dict of boards.
+
+A three tower board heading for a single stack has an exact distance formula,
+so that is searched with A* and goes straight to the goal. Anything else is
+searched with a breadth first search from both ends at once, which can visit
+only one board of each group that differ by swapping towers that are empty in
+the goal, see hanoi.symmetry.
+"""
+
+import heapq
+
+
+#Boards with more states than this keep their visited moves in a dict
+MAX_ARRAY_STATES = 1 << 30
+
+#A move code has to fit in seven bits, leaving the top bit for the direction.
+#Boards with more towers keep their visited moves in a dict with wider codes.
+MAX_ARRAY_TOWERS = 11
+
+_ROOT = 0x7f
+_BACKWARD = 0x80
+
+
+class _SparseVisited(dict):
+    """Stands in for the bytearray on boards that are too big for one."""
+
+    def __missing__(self, key):
+        return 0
+
+
+def distinct_sizes(stacks, shift):
+    """True if no two rings on the board are the same size."""
+
+    sizes = [code >> shift for stack in stacks for code in stack]
+    return len(sizes) == len(set(sizes))
+
+
+def encode(stacks, order, towers):
+    """The integer for a board, where order maps each ring code to its digit."""
+
+    state = 0
+    for tower in range(len(stacks)):
+        for code in stacks[tower]:
+            state += tower * towers ** order[code]
+
+    return state
+
+
+def shortest_path(stacks, target, shift, stats=None, symmetry=False):
+    """Returns a shortest list of (source_tower, destination_tower) moves from the
+    stacks to the target. Both are lists of towers of ring codes with the top ring
+    last, and no two rings can be the same size. Raises ValueError if the target
+    can't be reached. If stats is a dict, the number of boards expanded is added
+    to it as 'nodes'. With symmetry, boards that differ only by swapping free
+    towers are searched once, and the boards each one stood for on average is
+    put in stats as 'reduction'."""
+
+    towers = len(stacks)
+    codes = sorted([code for stack in stacks for code in stack])
+
+    if len(target) != towers or codes != sorted([code for stack in target for code in stack]):
+        raise ValueError("The winning position can't be reached from this board.")
+
+    #Number the rings from the smallest up
+    codes.sort(key=lambda code: code >> shift)
+    order = dict((codes[i], i) for i in range(len(codes)))
+    rings = len(codes)
+
+    start = encode(stacks, order, towers)
+    goal = encode(target, order, towers)
+
+    if stats == None:
+        stats = {}
+
+    stack_tower = only_tower(target)
+    if towers == 3 and stack_tower != None:
+        #A* goes straight to the goal, so there's nothing for symmetry to save
+        if symmetry:
+            stats['reduction'] = 1.0
+
+        return astar(start, goal, towers, rings, _three_tower_distance(stack_tower), stats)
+
+    if symmetry:
+        free = [i for i in range(towers) if len(target[i]) == 0]
+        if len(free) > 1:
+            return symmetric_bfs(start, goal, towers, rings, free, stats)
+
+        stats['reduction'] = 1.0
+
+    return bidirectional_bfs(start, goal, towers, rings, stats)
+
+
+def bidirectional_bfs(start, goal, towers, rings, stats=None):
+    """Breadth first search from the start and the goal a layer at a time, always
+    growing the smaller frontier, until the two meet."""
+
+    if stats == None:
+        stats = {}
+
+    stats['nodes'] = stats.get('nodes', 0)
+    if start == goal:
+        return []
+
+    visited = _visited(towers, rings)
+    powers = [towers ** i for i in range(rings)]
+    root, backward_flag = _flags(towers)
+
+    visited[start] = root
+    visited[goal] = root | backward_flag
+    forward = [start]
+    backward = [goal]
+
+    while forward and backward:
+        if len(forward) <= len(backward):
+            frontier, direction = forward, 0
+        else:
+            frontier, direction = backward, backward_flag
+
+        stats['nodes'] += len(frontier)
+        next_frontier = []
+
+        for state in frontier:
+            for source, destination, next_state in next_states(state, towers, rings, powers):
+                seen = visited[next_state]
+                if seen == 0:
+                    visited[next_state] = (1 + source * towers + destination) | direction
+                    next_frontier.append(next_state)
+
+                elif seen & backward_flag != direction:
+                    #The searches have met
+                    if direction == 0:
+                        middle = (source, destination)
+                        before, after = state, next_state
+                    else:
+                        middle = (destination, source)
+                        before, after = next_state, state
+
+                    return _path_to(before, visited, towers, rings, powers) + [middle] + \
+                        _path_from(after, visited, towers, rings, powers)
+
+        if direction == 0:
+            forward = next_frontier
+        else:
+            backward = next_frontier
+
+    raise ValueError("The winning position can't be reached from this board.")
+
+
+def symmetric_bfs(start, goal, towers, rings, free, stats=None):
+    """bidirectional_bfs over canonical states, where the free towers are empty in
+    the goal. The path is found as a chain of canonical states and then played
+    out from the start, choosing at each step a move that reaches the next one."""
+
+    from hanoi.symmetry import canonical_state
+
+    if stats == None:
+        stats = {}
+
+    stats['nodes'] = stats.get('nodes', 0)
+    powers = [towers ** i for i in range(rings)]
+
+    #Each canonical state maps to the one it was reached from and its direction
+    start_key, orbit = canonical_state(start, towers, rings, free, powers)
+    visited = {start_key: (None, 0), goal: (None, _BACKWARD)}
+    covered = orbit + (1 if start_key != goal else 0)
+    forward = [start_key]
+    backward = [goal]
+    chain = None
+
+    if start_key == goal:
+        chain = [goal]
+
+    while chain == None and forward and backward:
+        if len(forward) <= len(backward):
+            frontier, direction = forward, 0
+        else:
+            frontier, direction = backward, _BACKWARD
+
+        stats['nodes'] += len(frontier)
+        next_frontier = []
+
+        for state in frontier:
+            for source, destination, next_state in next_states(state, towers, rings, powers):
+                key, orbit = canonical_state(next_state, towers, rings, free, powers)
+                seen = visited.get(key)
+                if seen == None:
+                    visited[key] = (state, direction)
+                    covered += orbit
+                    next_frontier.append(key)
+
+                elif seen[1] != direction:
+                    before, after = (state, key) if direction == 0 else (key, state)
+                    chain = _chain(before, visited)[::-1] + _chain(after, visited)
+                    break
+
+            if chain != None:
+                break
+
+        if direction == 0:
+            forward = next_frontier
+        else:
+            backward = next_frontier
+
+    stats['reduction'] = covered / float(len(visited))
+    if chain == None:
+        raise ValueError("The winning position can't be reached from this board.")
+
+    #Play the chain out from the real start
+    moves = []
+    state = start
+    for key in chain[1:]:
+        for source, destination, next_state in next_states(state, towers, rings, powers):
+            if canonical_state(next_state, towers, rings, free, powers)[0] == key:
+                moves.append((source, destination))
+                state = next_state
+                break
+
+    return moves
+
+
+def _chain(key, visited):
+    """The canonical states from key back to the root of its search."""
+
+    chain = []
+    while key != None:
+        chain.append(key)
+        key = visited[key][0]
+
+    return chain
+
+
+def astar(start, goal, towers, rings, heuristic, stats=None):
+    """A* search with a consistent heuristic, a function of (state, towers, rings)
+    that never overestimates the number of moves left."""
+
+    if stats == None:
+        stats = {}
+
+    stats['nodes'] = stats.get('nodes', 0)
+
+    visited = _visited(towers, rings)
+    powers = [towers ** i for i in range(rings)]
+
+    #Entries are (estimated length, moves so far, state, move code)
+    queue = [(heuristic(start, towers, rings), 0, start, _flags(towers)[0])]
+
+    while queue:
+        estimate, length, state, code = heapq.heappop(queue)
+        if visited[state] != 0:
+            continue
+
+        visited[state] = code
+        if state == goal:
+            return _path_to(goal, visited, towers, rings, powers)
+
+        stats['nodes'] += 1
+        for source, destination, next_state in next_states(state, towers, rings, powers):
+            if visited[next_state] == 0:
+                heapq.heappush(queue, (length + 1 + heuristic(next_state, towers, rings),
+                                       length + 1, next_state, 1 + source * towers + destination))
+
+    raise ValueError("The winning position can't be reached from this board.")
+
+
+def _three_tower_distance(destination):
+    """The exact number of moves from any three tower board to a single stack on
+    destination. Going from the largest ring down, a ring that isn't where it
+    needs to be costs 2^i moves (its own move plus moving the i smaller rings out
+    of the way and back) and the smaller rings then need to end up on the third
+    tower."""
+
+    def distance(state, towers, rings):
+        digits = []
+        for i in range(rings):
+            digits.append(state % 3)
+            state //= 3
+
+        moves = 0
+        target = destination
+        for i in range(rings - 1, -1, -1):
+            if digits[i] != target:
+                moves += 1 << i
+                target = 3 - target - digits[i]
+
+        return moves
+
+    return distance
+
+
+def only_tower(stacks):
+    """The index of the only tower with rings on it, or None."""
+
+    occupied = [i for i in range(len(stacks)) if len(stacks[i]) > 0]
+    if len(occupied) == 1:
+        return occupied[0]
+
+    return None
+
+
+def _flags(towers):
+    """The code marking the root of a search and the bit marking the backward
+    one. Up to MAX_ARRAY_TOWERS towers they fit in a byte with the move codes,
+    past that the move codes go up to towers * towers so both go above them."""
+
+    if towers <= MAX_ARRAY_TOWERS:
+        return _ROOT, _BACKWARD
+
+    backward = 1 << (towers * towers + 1).bit_length()
+    return backward - 1, backward
+
+
+def _visited(towers, rings):
+    if towers <= MAX_ARRAY_TOWERS and towers ** rings <= MAX_ARRAY_STATES:
+        return bytearray(towers ** rings)
+
+    return _SparseVisited()
+
+
+def next_states(state, towers, rings, powers):
+    """(source, destination, next_state) for every legal move from a state."""
+
+    #Find the smallest ring on each tower
+    tops = [-1] * towers
+    found = 0
+    remaining = state
+    for i in range(rings):
+        tower = remaining % towers
+        remaining //= towers
+        if tops[tower] < 0:
+            tops[tower] = i
+            found += 1
+            if found == towers:
+                break
+
+    moves = []
+    for source in range(towers):
+        ring = tops[source]
+        if ring < 0:
+            continue
+
+        power = powers[ring]
+        for destination in range(towers):
+            top = tops[destination]
+            if destination != source and (top < 0 or top > ring):
+                moves.append((source, destination, state + (destination - source) * power))
+
+    return moves
+
+
+def _top_ring(state, tower, towers, rings, powers):
+    for i in range(rings):
+        if (state // powers[i]) % towers == tower:
+            return i
+
+    return None
+
+
+def _undo(state, code, towers, rings, powers):
+    """The state before the move recorded in code, and the move itself."""
+
+    code = (code & _flags(towers)[0]) - 1
+    source, destination = code // towers, code % towers
+    ring = _top_ring(state, destination, towers, rings, powers)
+
+    return state + (source - destination) * powers[ring], (source, destination)
+
+
+def _path_to(state, visited, towers, rings, powers):
+    """The moves from the root of the search that visited state to state."""
+
+    root = _flags(towers)[0]
+    moves = []
+    code = visited[state]
+    while code & root != root:
+        state, move = _undo(state, code, towers, rings, powers)
+        moves.append(move)
+        code = visited[state]
+
+    moves.reverse()
+    return moves
+
+
+def _path_from(state, visited, towers, rings, powers):
+    """The moves from a state found by the backward search to the goal."""
+
+    root = _flags(towers)[0]
+    moves = []
+    code = visited[state]
+    while code & root != root:
+        state, move = _undo(state, code, towers, rings, powers)
+        moves.append((move[1], move[0]))
+        code = visited[state]
+
+    return moves
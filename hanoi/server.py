@@ -0,0 +1,377 @@
+"""
+Alan M Jackson
+
+A game server for many players at once, on asyncio. Needs Python 3.5 or later.
+
+Each connection sends commands a line at a time and gets one line back for each,
+starting OK or ERR:
+
+    NEW towers rings sets   OK <session>     starts a game and plays it
+    RESUME session          OK <session>     goes back to a game
+    MOVE source destination OK <moves>       makes a move, towers counted from 0
+    STATE                   OK <json>        the board, moves and whether it's won
+    WIN?                    OK YES or OK NO
+    QUIT                    OK BYE           and the connection is closed
+
+Games are kept as sessions that outlive their connection, and sessions that
+haven't been used for idle_timeout seconds are thrown away. A session is named
+by a random token, so only the player it was given to can resume it. Every connection
+waits for its replies to be sent before reading another command, so a client
+that doesn't read its replies only holds up itself.
+
+    python -m hanoi serve --port 7777
+    python -m hanoi load --port 7777 --clients 1000 --moves 100
+"""
+
+import os
+import json
+import time
+import asyncio
+import binascii
+import itertools
+
+from hanoi.game import Game
+from hanoi.instrument import Histogram, clock
+
+
+DEFAULT_PORT = 7777
+
+#Longest command line a client can send
+MAX_LINE = 1024
+
+#Random bytes in a session token
+TOKEN_BYTES = 16
+
+
+class Session(object):
+
+    def __init__(self, session_id, game):
+        self.id = session_id
+        self.game = game
+        self.last_used = time.time()
+
+
+class GameServer(object):
+
+    def __init__(self, host="127.0.0.1", port=DEFAULT_PORT, idle_timeout=300.0,
+                 max_sessions=100000, max_towers=64, max_rings=64):
+        self.host = host
+        self.port = port
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self.max_towers = max_towers
+        self.max_rings = max_rings
+
+        self.sessions = {}
+        self.connections = 0
+        self.commands = 0
+        self.evicted = 0
+
+        self._server = None
+        self._sweeper = None
+
+
+    async def start(self):
+        """Starts listening. With port 0 a free port is picked and stored in port."""
+
+        self._server = await asyncio.start_server(self.handle, self.host, self.port,
+                                                  limit=MAX_LINE)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._sweeper = asyncio.ensure_future(self._sweep())
+
+
+    async def close(self):
+        self._sweeper.cancel()
+        self._server.close()
+        await self._server.wait_closed()
+
+
+    async def serve_forever(self):
+        await self.start()
+        try:
+            while True:
+                await asyncio.sleep(3600)
+        finally:
+            await self.close()
+
+
+    async def handle(self, reader, writer):
+        """Runs one connection's commands until it quits or goes away."""
+
+        self.connections += 1
+        session = None
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    #Longer than the reader's limit
+                    writer.write(b"ERR Line too long\n")
+                    break
+
+                if not line:
+                    break
+
+                self.commands += 1
+                session, reply = self.command(session, line.decode("ascii", "replace").split())
+                writer.write(reply.encode("ascii") + b"\n")
+
+                #Stop reading from this client until it has read its replies
+                await writer.drain()
+
+                if reply == "OK BYE":
+                    break
+
+        except ConnectionError:
+            pass
+        finally:
+            self.connections -= 1
+            writer.close()
+
+
+    def command(self, session, words):
+        """Runs one command for a connection playing session. Returns the session
+        the connection is now playing and the reply."""
+
+        if len(words) == 0:
+            return session, "ERR Empty command"
+
+        name = words[0].upper()
+        arguments = words[1:]
+
+        try:
+            if name == "NEW":
+                return self._new(arguments)
+
+            if name == "RESUME":
+                if len(arguments) == 0:
+                    raise ValueError("Missing argument.")
+
+                session = self.sessions.get(arguments[0])
+                if session == None:
+                    return None, "ERR No such session"
+                session.last_used = time.time()
+                return session, "OK %s" % session.id
+
+            if name == "QUIT":
+                return session, "OK BYE"
+
+            if name not in ("MOVE", "STATE", "WIN?"):
+                return session, "ERR Unknown command %s" % name
+
+            if session == None or session.id not in self.sessions:
+                return None, "ERR No game, start one with NEW"
+
+            session.last_used = time.time()
+            game = session.game
+
+            if name == "MOVE":
+                game.move(_number(arguments, 0), _number(arguments, 1))
+                return session, "OK %d" % game.moves
+
+            if name == "STATE":
+                return session, "OK " + json.dumps({"board": game.board, "moves": game.moves,
+                                                   "won": game.won}, separators=(",", ":"))
+
+            return session, "OK YES" if game.won else "OK NO"
+
+        except (ValueError, IndexError) as e:
+            return session, "ERR %s" % e
+
+
+    def _new(self, arguments):
+        if len(self.sessions) >= self.max_sessions:
+            self.evict()
+            if len(self.sessions) >= self.max_sessions:
+                return None, "ERR Too many games"
+
+        towers, rings, sets = [_number(arguments, i) for i in range(3)]
+        if towers > self.max_towers or rings > self.max_rings:
+            raise ValueError("At most %d towers and %d rings." % (self.max_towers, self.max_rings))
+
+        session = Session(new_token(), Game(towers=towers, rings=rings, sets=sets))
+        self.sessions[session.id] = session
+        return session, "OK %s" % session.id
+
+
+    def evict(self, idle_timeout=None):
+        """Throws away sessions idle for longer than idle_timeout seconds, the
+        server's idle_timeout by default. Returns how many went."""
+
+        if idle_timeout == None:
+            idle_timeout = self.idle_timeout
+
+        cutoff = time.time() - idle_timeout
+        idle = [session_id for session_id, session in self.sessions.items()
+                if session.last_used < cutoff]
+        for session_id in idle:
+            del self.sessions[session_id]
+
+        self.evicted += len(idle)
+        return len(idle)
+
+
+    async def _sweep(self):
+        while True:
+            await asyncio.sleep(max(self.idle_timeout / 4.0, 0.01))
+            self.evict()
+
+
+def new_token():
+    """A session token that can't be guessed, as hex."""
+
+    return binascii.hexlify(os.urandom(TOKEN_BYTES)).decode("ascii")
+
+
+def _number(arguments, index):
+    if index >= len(arguments):
+        raise ValueError("Missing argument.")
+
+    try:
+        return int(arguments[index])
+    except ValueError:
+        raise ValueError("%s is not a number." % arguments[index])
+
+
+class GameClient(object):
+    """A connection to a GameServer."""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+
+    @classmethod
+    async def connect(cls, host="127.0.0.1", port=DEFAULT_PORT):
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+
+    async def command(self, line):
+        """Sends a command and returns the reply, without the trailing newline."""
+
+        self.writer.write(line.encode("ascii") + b"\n")
+        await self.writer.drain()
+        reply = await self.reader.readline()
+        if not reply:
+            raise ConnectionError("The server closed the connection.")
+
+        return reply.decode("ascii").rstrip("\n")
+
+
+    async def _ok(self, line):
+        reply = await self.command(line)
+        if not reply.startswith("OK"):
+            raise ValueError(reply[4:])
+
+        return reply[3:]
+
+
+    async def new(self, towers=3, rings=5, sets=1):
+        """Starts a game and returns its session token."""
+
+        return await self._ok("NEW %d %d %d" % (towers, rings, sets))
+
+
+    async def resume(self, session_id):
+        return await self._ok("RESUME %s" % session_id)
+
+
+    async def move(self, source_tower, destination_tower):
+        return int(await self._ok("MOVE %d %d" % (source_tower, destination_tower)))
+
+
+    async def state(self):
+        return json.loads(await self._ok("STATE"))
+
+
+    async def won(self):
+        return await self._ok("WIN?") == "YES"
+
+
+    async def close(self):
+        try:
+            await self.command("QUIT")
+        except ConnectionError:
+            pass
+
+        self.writer.close()
+
+
+async def load(host="127.0.0.1", port=DEFAULT_PORT, clients=100, moves=100,
+               towers=3, rings=10, sets=1):
+    """Plays moves optimal moves from each of clients connections at once, and
+    returns the moves made, the seconds taken and a Histogram of the round trip
+    nanoseconds of each move."""
+
+    latencies = Histogram()
+    plan = list(itertools.islice(Game(towers=towers, rings=rings, sets=sets).iter_optimal_moves(),
+                                 moves))
+
+    async def player():
+        client = await GameClient.connect(host, port)
+        try:
+            await client.new(towers, rings, sets)
+            for move in plan:
+                started = clock()
+                await client.move(*move)
+                latencies.record(clock() - started)
+        finally:
+            await client.close()
+
+    started = time.time()
+    await asyncio.gather(*[player() for i in range(clients)])
+    seconds = time.time() - started
+
+    return clients * len(plan), seconds, latencies
+
+
+def _run(coroutine):
+    if hasattr(asyncio, "run"):
+        return asyncio.run(coroutine)
+
+    return asyncio.get_event_loop().run_until_complete(coroutine)
+
+
+def main(argv=None):
+    import argparse
+
+    argparser = argparse.ArgumentParser(prog='hanoi serve', description='Run a game server.')
+    argparser.add_argument('--host', default="127.0.0.1")
+    argparser.add_argument('-p', '--port', type=int, default=DEFAULT_PORT)
+    argparser.add_argument('--idle-timeout', type=float, default=300.0,
+                           help='seconds before an unused game is thrown away')
+    argparser.add_argument('--max-sessions', type=int, default=100000)
+
+    args = argparser.parse_args(argv)
+
+    server = GameServer(args.host, args.port, args.idle_timeout, args.max_sessions)
+    print("Serving on %s:%d" % (args.host, args.port))
+    try:
+        _run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+def load_main(argv=None):
+    import argparse
+
+    argparser = argparse.ArgumentParser(prog='hanoi load', description='Load test a game server.')
+    argparser.add_argument('--host', default="127.0.0.1")
+    argparser.add_argument('-p', '--port', type=int, default=DEFAULT_PORT)
+    argparser.add_argument('-c', '--clients', type=int, default=100)
+    argparser.add_argument('-m', '--moves', type=int, default=100, help='moves per client')
+    argparser.add_argument('-t', '--towers', type=int, default=3)
+    argparser.add_argument('-r', '--rings', type=int, default=10)
+    argparser.add_argument('-s', '--sets', type=int, default=1)
+
+    args = argparser.parse_args(argv)
+
+    count, seconds, latencies = _run(load(args.host, args.port, args.clients, args.moves,
+                                          args.towers, args.rings, args.sets))
+
+    print("%d moves from %d clients in %.2fs: %.0f moves/s" % (count, args.clients, seconds,
+                                                                count / seconds))
+    print("latency p50 %.3f ms, p99 %.3f ms, max %.3f ms" % (latencies.percentile(50) / 1e6,
+                                                             latencies.percentile(99) / 1e6,
+                                                             latencies.max / 1e6))
@@ -0,0 +1,291 @@
+"""
+Alan M Jackson
+
+Optimal solutions for Hanoi positions.
+
+A classic board, a single set stacked on one of three towers that has to end up
+stacked on another, is solved with the closed form plan and streamed a move at a
+time in constant memory, so it works for any number of rings. The same board
+with more towers is solved with the Frame-Stewart plan. Any other position is
+found by searching board states, using hanoi.search when every ring is a
+different size.
+"""
+
+from collections import deque
+
+from hanoi import frame_stewart
+from hanoi import search as state_search
+
+
+def solve(game):
+    """Returns an iterator over the (source_tower, destination_tower) moves of a
+    shortest route from the game's current position to its winning position."""
+
+    plan = stack_plan(game)
+    if plan != None:
+        rings, source, destination = plan
+        spares = [i for i in range(len(game._stacks)) if i != source and i != destination]
+
+        if len(spares) == 1:
+            return gray_code_moves(rings, source, spares[0], destination)
+
+        return frame_stewart.moves(rings, source, destination, spares)
+
+    return iter(search(game))
+
+
+def solution_length(game):
+    """The number of moves in a shortest route to the winning position."""
+
+    plan = stack_plan(game)
+    if plan != None:
+        return frame_stewart.move_count(plan[0], len(game._stacks))
+
+    return len(search(game))
+
+
+def classic_plan(game):
+    """Returns (rings, source, spare, destination) if the game is a classic three
+    tower board, otherwise None. A board that is already won is a plan with no
+    rings."""
+
+    plan = stack_plan(game)
+    if plan == None or len(game._stacks) != 3:
+        return None
+
+    rings, source, destination = plan
+    return (rings, source, 3 - source - destination, destination)
+
+
+def stack_plan(game):
+    """Returns (rings, source, destination) if the game is a single stack of rings
+    that has to move to another tower, with at least three towers, otherwise
+    None. A board that is already won is a plan with no rings."""
+
+    stacks = game._stacks
+    target = game._target
+
+    if len(stacks) < 3 or len(target) != len(stacks):
+        return None
+
+    if stacks == target:
+        return (0, 0, 2)
+
+    source = state_search.only_tower(stacks)
+    destination = state_search.only_tower(target)
+    if source == None or destination == None or source == destination:
+        return None
+
+    #The stack has to be the same rings, each strictly smaller than the one below
+    stack = stacks[source]
+    if stack != target[destination]:
+        return None
+
+    shift = game._set_shift
+    for i in range(1, len(stack)):
+        if stack[i] >> shift >= stack[i - 1] >> shift:
+            return None
+
+    return (len(stack), source, destination)
+
+
+def gray_code_moves(rings, source, spare, destination):
+    """Generates the moves that take a stack of rings from source to destination.
+
+    This is the iterative form of the recursive plan. Move m (counting from 1)
+    goes from tower (m & m - 1) % 3 to tower ((m | m - 1) + 1) % 3, which ends
+    on tower 2 for an odd number of rings and tower 1 for an even number, so the
+    towers are relabelled to suit. Only the move counter is kept between moves."""
+
+    if rings % 2 == 1:
+        towers = (source, spare, destination)
+    else:
+        towers = (source, destination, spare)
+
+    last = 2 ** rings
+    m = 1
+    while m < last:
+        yield (towers[(m & (m - 1)) % 3], towers[((m | (m - 1)) + 1) % 3])
+        m += 1
+
+
+def search(game, stats=None, symmetry=False):
+    """Searches from the current position to the winning position. Returns the list
+    of moves, and raises ValueError if the winning position can't be reached. If
+    stats is a dict, the number of boards expanded is added to it as 'nodes'.
+    With symmetry only canonical boards are searched, see hanoi.symmetry, and
+    the boards each one stood for on average is put in stats as 'reduction'."""
+
+    shift = game._set_shift
+    if stats == None:
+        stats = {}
+
+    if state_search.distinct_sizes(game._stacks, shift):
+        return state_search.shortest_path(game._stacks, game._target, shift, stats, symmetry)
+
+    start = tuple(tuple(stack) for stack in game._stacks)
+    goal = tuple(tuple(stack) for stack in game._target)
+
+    if len(start) != len(goal) or \
+            sorted(sum(start, ())) != sorted(sum(goal, ())):
+        raise ValueError("The winning position can't be reached from this board.")
+
+    if symmetry:
+        return _symmetric_search(start, goal, shift, stats)
+
+    #Each state we've seen maps to the state and move we reached it from
+    parents = {start: None}
+    queue = deque([start])
+
+    stats['nodes'] = stats.get('nodes', 0)
+    while queue:
+        state = queue.popleft()
+        if state == goal:
+            break
+
+        stats['nodes'] += 1
+        for move, next_state in successors(state, shift):
+            if next_state not in parents:
+                parents[next_state] = (state, move)
+                queue.append(next_state)
+    else:
+        raise ValueError("The winning position can't be reached from this board.")
+
+    moves = []
+    step = parents[goal]
+    while step != None:
+        state, move = step
+        moves.append(move)
+        step = parents[state]
+
+    moves.reverse()
+    return moves
+
+
+def _symmetric_search(start, goal, shift, stats):
+    """The breadth first search in search, expanding one board of each group of
+    equivalent boards.
+
+    The goal is the only board in its group, so the search runs back from the
+    goal, where each group reached holds boards all the same distance from it,
+    until it reaches the start's group. A board stands for its group with its
+    free towers sorted. When a board reached isn't in any group seen so far,
+    it's relabelled once for each colouring and every one of those boards is
+    marked as seen, so reaching any of them again later costs a sort and a
+    lookup, as in the plain search. Each board expanded maps to the one it was
+    reached from and the move, and the moves on the real boards are worked out
+    along the path at the end."""
+
+    from hanoi import symmetry
+
+    free = symmetry.free_towers(goal)
+    relabellings = [symmetry.Relabelling(permutation, towers, shift)
+                    for permutation, towers in symmetry.colourings(goal, shift)[1:]]
+
+    def key_for(board):
+        return symmetry.sort_free(list(board), free)[0] if free else tuple(board)
+
+    start_key = key_for(start)
+    seen = set()
+    parents = {}
+    queue = deque()
+    covered = 0
+    found = None
+
+    pending = [(goal, None)]
+    stats['nodes'] = stats.get('nodes', 0)
+    while found == None and (pending or queue):
+        #Add the group of each new board, then expand the next board
+        for board, step in pending:
+            key = key_for(board)
+            if key in seen:
+                continue
+
+            keys = set([key])
+            for relabelling in relabellings:
+                keys.add(symmetry.sort_free(relabelling.apply(key), free)[0])
+
+            seen.update(keys)
+            parents[key] = step
+            covered += len(keys) * symmetry.arrangements([key[i] for i in free])
+            queue.append(key)
+
+            if start_key in keys:
+                found = key
+                break
+
+        pending = []
+        if found != None or not queue:
+            break
+
+        state = queue.popleft()
+        stats['nodes'] += 1
+        for move, next_state in successors(state, shift):
+            if key_for(next_state) not in seen:
+                pending.append((next_state, (state, move)))
+
+    stats['reduction'] = covered / float(len(parents))
+    if found == None:
+        raise ValueError("The winning position can't be reached from this board.")
+
+    #towers has the tower of the real board for each tower of the one searched
+    for relabelling in [None] + relabellings:
+        image = list(start) if relabelling == None else relabelling.apply(start)
+        places = list(range(len(start))) if relabelling == None else relabelling.towers
+        key, order = symmetry.sort_free(image, free)
+        if key == found:
+            break
+
+    towers = [0] * len(start)
+    for i in range(len(start)):
+        towers[places[i]] = i
+    moved = list(towers)
+    for i in range(len(free)):
+        towers[free[i]] = moved[order[i]]
+
+    #Follow the search back towards the goal, undoing the move that reached
+    #each board
+    moves = []
+    key = found
+    while parents[key] != None:
+        state, (source, destination) = parents[key]
+
+        board = list(state)
+        board[destination] = board[destination] + board[source][-1:]
+        board[source] = board[source][:-1]
+        order = symmetry.sort_free(board, free)[1]
+
+        #board has the searched board's free towers in their order before sorting
+        before = list(towers)
+        for i in range(len(free)):
+            before[order[i]] = towers[free[i]]
+        towers = before
+
+        moves.append((towers[destination], towers[source]))
+        key = state
+
+    return moves
+
+
+def successors(state, shift):
+    """Generates (move, state) for every legal move from a state, where a state is
+    a tuple of towers and each tower a tuple of ring codes with the top at the end."""
+
+    for source in range(len(state)):
+        source_stack = state[source]
+        if len(source_stack) == 0:
+            continue
+
+        ring = source_stack[-1]
+        size = ring >> shift
+
+        for destination in range(len(state)):
+            destination_stack = state[destination]
+            if destination == source:
+                continue
+
+            if len(destination_stack) == 0 or size <= destination_stack[-1] >> shift:
+                next_state = list(state)
+                next_state[source] = source_stack[:-1]
+                next_state[destination] = destination_stack + (ring,)
+                yield (source, destination), tuple(next_state)
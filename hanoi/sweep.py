@@ -0,0 +1,213 @@
+"""
+Alan M Jackson
+
+Sweeps board configurations through the solver on a pool of processes.
+
+Each job is a (towers, rings, sets, seed) configuration, where a seed means a
+randomized start, and each result records the optimal solution length, the
+number of boards the search expanded and how long it took. Results are written
+a line at a time to a JSONL file, or a CSV file if the name ends in .csv, as
+they come back from the workers. Jobs already in the file are skipped, so an
+interrupted sweep picks up where it left off when it's run again.
+
+    python -m hanoi sweep --towers 3-4 --rings 1-10 --sets 1-2 --seeds 100 results.jsonl
+"""
+
+import sys
+import csv
+import json
+import time
+import multiprocessing
+
+from hanoi import Game
+from hanoi import solver
+
+
+FIELDS = ["towers", "rings", "sets", "seed", "length", "nodes", "seconds", "error"]
+_KEY_FIELDS = ["towers", "rings", "sets", "seed"]
+
+
+def jobs(towers, rings, sets, seeds=0):
+    """Generates every (towers, rings, sets, seed) job Game accepts for the given
+    ranges of towers, rings and sets: the standard start with seed None, and then
+    seeds randomized starts numbered 0 up."""
+
+    for tower_count in towers:
+        for ring_count in rings:
+            for set_count in sets:
+                if set_count > tower_count:
+                    continue
+
+                yield (tower_count, ring_count, set_count, None)
+                for seed in range(seeds):
+                    yield (tower_count, ring_count, set_count, seed)
+
+
+def run(job):
+    """Solves one job and returns its result as a dict of FIELDS."""
+
+    towers, rings, sets, seed = job
+    result = {"towers": towers, "rings": rings, "sets": sets, "seed": seed,
+              "length": None, "nodes": 0, "seconds": 0.0, "error": None}
+
+    started = time.time()
+    try:
+        if seed == None:
+            game = Game(towers=towers, rings=rings, sets=sets)
+        else:
+            game = Game(towers=towers, rings=rings, sets=sets, randomize=True, seed=seed)
+
+        if solver.stack_plan(game) != None:
+            result["length"] = solver.solution_length(game)
+        else:
+            stats = {}
+            result["length"] = len(solver.search(game, stats))
+            result["nodes"] = stats["nodes"]
+
+    except ValueError as e:
+        result["error"] = str(e)
+
+    result["seconds"] = time.time() - started
+    return result
+
+
+def sweep(all_jobs, path, processes=None, chunksize=16):
+    """Runs the jobs that aren't already in the results file at path on a pool of
+    processes, appending each result as it arrives. Returns the number of jobs run."""
+
+    done = set(_key(record) for record in read_results(path))
+    pending = [job for job in all_jobs if _key(dict(zip(_KEY_FIELDS, job))) not in done]
+    if len(pending) == 0:
+        return 0
+
+    writer = _ResultWriter(path)
+    pool = multiprocessing.Pool(processes)
+    try:
+        for result in pool.imap_unordered(run, pending, chunksize):
+            writer.write(result)
+
+        pool.close()
+    except:
+        pool.terminate()
+        raise
+    finally:
+        pool.join()
+        writer.close()
+
+    return len(pending)
+
+
+def read_results(path):
+    """The result records in a results file, or none if it doesn't exist yet. A
+    line cut short by an interruption is ignored."""
+
+    records = []
+    try:
+        if path.endswith(".csv"):
+            with _open(path, "r") as f:
+                for row in csv.DictReader(f):
+                    if None not in row.values():
+                        records.append(row)
+        else:
+            with open(path) as f:
+                for line in f:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        pass
+    except IOError:
+        pass
+
+    return records
+
+
+class _ResultWriter(object):
+
+    def __init__(self, path):
+        _trim(path)
+
+        self.csv = path.endswith(".csv")
+        if self.csv:
+            new = len(read_results(path)) == 0
+            self.file = _open(path, "a")
+            self.writer = csv.DictWriter(self.file, FIELDS)
+            if new:
+                self.writer.writeheader()
+        else:
+            self.file = open(path, "a")
+
+
+    def write(self, result):
+        if self.csv:
+            self.writer.writerow(result)
+        else:
+            self.file.write(json.dumps(result, sort_keys=True) + "\n")
+
+        self.file.flush()
+
+
+    def close(self):
+        self.file.close()
+
+
+def _trim(path):
+    """Cuts off a last line left unfinished by an interrupted sweep."""
+
+    try:
+        with open(path, "rb+") as f:
+            text = f.read()
+            if text and not text.endswith(b"\n"):
+                f.truncate(text.rfind(b"\n") + 1)
+    except IOError:
+        pass
+
+
+def _open(path, mode):
+    """Opens a CSV file the way the csv module wants on this version of Python."""
+
+    if sys.version_info[0] == 2:
+        return open(path, mode + "b")
+
+    return open(path, mode, newline="")
+
+
+def _key(record):
+    """The job a result is for, as strings so CSV and JSON records compare."""
+
+    key = []
+    for field in _KEY_FIELDS:
+        value = record.get(field)
+        key.append("" if value == None else str(value))
+
+    return tuple(key)
+
+
+def _range(text):
+    """Parses "5" or "3-8" into a range of numbers."""
+
+    first, dash, last = text.partition("-")
+    if dash:
+        return range(int(first), int(last) + 1)
+
+    return range(int(first), int(first) + 1)
+
+
+def main(argv=None):
+    import argparse
+
+    argparser = argparse.ArgumentParser(prog='hanoi sweep',
+                                        description='Solve a sweep of board configurations.')
+    argparser.add_argument('out', help='results file, JSONL or .csv')
+    argparser.add_argument('-t', '--towers', type=_range, default=_range("3"))
+    argparser.add_argument('-r', '--rings', type=_range, default=_range("1-5"))
+    argparser.add_argument('-s', '--sets', type=_range, default=_range("1"))
+    argparser.add_argument('-n', '--seeds', type=int, default=0,
+                           help='randomized starts per configuration')
+    argparser.add_argument('-p', '--processes', type=int, default=None)
+    argparser.add_argument('-c', '--chunksize', type=int, default=16)
+
+    args = argparser.parse_args(argv)
+
+    all_jobs = jobs(args.towers, args.rings, args.sets, args.seeds)
+    count = sweep(all_jobs, args.out, args.processes, args.chunksize)
+    print("%d jobs solved, results in %s" % (count, args.out))
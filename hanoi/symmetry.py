@@ -0,0 +1,262 @@
+"""
+Alan M Jackson
+
+Boards that are the same puzzle up to relabelling towers and sets.
+
+A tower that is empty in the winning position is only ever somewhere to put
+rings on the way, so swapping the contents of two such free towers gives a board
+exactly as far from winning. The same goes for swapping sets' colours, along
+with the towers they finish on, when that leaves the winning position as it is,
+as it does for the two sets of a standard game. A search only needs to visit
+one board from each group of these, its canonical board, which cuts the boards
+to visit by up to the number of ways of arranging the free towers times the
+number of colourings.
+
+The canonical board has the free towers' stacks sorted, empty ones first, after
+relabelling the sets whichever way gives the smallest board. For one set boards
+encoded as integers the way hanoi.search does, the canonical state numbers the
+free towers in the order the smallest rings reach them.
+
+    free = symmetry.free_towers(game._target)
+    colours = symmetry.colourings(game._target, game._set_shift)
+    key, orbit = symmetry.canonical(game._stacks, free, colours, game._set_shift)
+
+or symmetry.canonical_position(game) for short.
+"""
+
+
+import itertools
+
+
+def free_towers(target):
+    """The indexes of the towers with no rings in the winning position."""
+
+    return [i for i in range(len(target)) if len(target[i]) == 0]
+
+
+def colourings(target, shift):
+    """The relabellings of sets that leave the winning position, a list of towers
+    of ring codes, as it is once the towers it has rings on are moved to match.
+    Each is a (permutation, towers) pair, where permutation is a list with the
+    new set for each set number and towers a list with the new place of each
+    tower. The first is always the identity."""
+
+    mask = (1 << shift) - 1
+    sets = sorted(set(code & mask for stack in target for code in stack))
+    identity = list(range(max(sets) + 1 if sets else 0))
+    target = tuple(tuple(stack) for stack in target)
+
+    found = [(identity, list(range(len(target))))]
+    for order in itertools.permutations(sets):
+        permutation = list(identity)
+        for old, new in zip(sets, order):
+            permutation[old] = new
+
+        if permutation == identity:
+            continue
+
+        #Match each relabelled tower with a tower of the winning position
+        relabelled = relabel(target, permutation, shift)
+        places = {}
+        for i in range(len(target)):
+            places.setdefault(target[i], []).append(i)
+
+        towers = []
+        for stack in relabelled:
+            if len(places.get(stack, ())) == 0:
+                break
+            towers.append(places[stack].pop())
+        else:
+            found.append((permutation, towers))
+
+    return found
+
+
+def relabel(stacks, permutation, shift):
+    """The stacks with each ring's set replaced by permutation[set], as a tuple of
+    tuples. Sets past the end of permutation are left alone."""
+
+    mask = (1 << shift) - 1
+    count = len(permutation)
+    return tuple(tuple(code if code & mask >= count else code & ~mask | permutation[code & mask]
+                       for code in stack)
+                 for stack in stacks)
+
+
+def canonical(stacks, free, colours, shift):
+    """The canonical board for stacks, a list of towers of ring codes, as a tuple
+    of tuples, and how many different boards it stands for. free and colours are
+    from free_towers and colourings for the winning position."""
+
+    keys = [sort_free(image, free)[0] for image in images(stacks, colours, shift)]
+    return min(keys), len(set(keys)) * arrangements([stacks[i] for i in free])
+
+
+def images(stacks, colours, shift):
+    """The board relabelled by each colouring, each a list of the relabelled
+    stacks moved to their new places. Relabelling is skipped for the identity."""
+
+    found = [[tuple(stack) for stack in stacks]]
+    for permutation, towers in colours[1:]:
+        moved = [None] * len(stacks)
+        relabelled = relabel(stacks, permutation, shift)
+        for i in range(len(relabelled)):
+            moved[towers[i]] = relabelled[i]
+
+        found.append(moved)
+
+    return found
+
+
+class Relabelling(object):
+    """One colouring from colourings, applied to many boards. The relabelled
+    stacks are cached, as a search keeps meeting the same ones."""
+
+    def __init__(self, permutation, towers, shift):
+        self.permutation = permutation
+        self.towers = towers
+        self.shift = shift
+        self.cache = {}
+
+
+    def apply(self, stacks):
+        """The stacks, a sequence of tuples of ring codes, relabelled and moved to
+        their new places, as a list."""
+
+        moved = [None] * len(stacks)
+        cache = self.cache
+        for i in range(len(stacks)):
+            stack = stacks[i]
+            relabelled = cache.get(stack)
+            if relabelled == None:
+                relabelled = relabel((stack,), self.permutation, self.shift)[0]
+                cache[stack] = relabelled
+
+            moved[self.towers[i]] = relabelled
+
+        return moved
+
+
+def sort_free(towers, free):
+    """The board with the free towers' stacks sorted, as a tuple, and the tower
+    each sorted stack came from. towers is a list and is changed."""
+
+    order = sorted(free, key=towers.__getitem__)
+    stacks = [towers[i] for i in order]
+    for i, stack in zip(free, stacks):
+        towers[i] = stack
+
+    return tuple(towers), order
+
+
+def canonical_position(game):
+    """canonical for a game's position against its winning position."""
+
+    shift = game._set_shift
+    return canonical(game._stacks, free_towers(game._target), colourings(game._target, shift), shift)
+
+
+def arrangements(stacks):
+    """The number of different ways of putting stacks on as many towers."""
+
+    count = _factorial(len(stacks))
+    stacks = sorted(stacks)
+    run = 1
+    for i in range(1, len(stacks)):
+        if stacks[i] == stacks[i - 1]:
+            run += 1
+            count //= run
+        else:
+            run = 1
+
+    return count
+
+
+def canonical_state(state, towers, rings, free, powers):
+    """The canonical state for a one set board encoded as an integer, and how
+    many different states it stands for. free is the list of free towers and
+    powers the powers of towers for each ring."""
+
+    labels = {}
+    canonical_state = state
+    remaining = state
+    for i in range(rings):
+        tower = remaining % towers
+        remaining //= towers
+
+        if tower in free:
+            label = labels.get(tower)
+            if label == None:
+                label = free[len(labels)]
+                labels[tower] = label
+
+            canonical_state += (label - tower) * powers[i]
+
+    return canonical_state, _falling_factorial(len(free), len(labels))
+
+
+def iter_canonical_states(towers, rings, free):
+    """Generates every canonical one set state for a number of towers and rings
+    with the free towers given, one state from each group of equivalent ones."""
+
+    fixed = [tower for tower in range(towers) if tower not in free]
+    powers = [towers ** i for i in range(rings)]
+
+    #Place the rings smallest first. A ring can go on a fixed tower, a free tower
+    #a smaller ring is on, or the next free tower nothing is on yet.
+    pending = [(0, 0, 0)]
+    while pending:
+        ring, state, used = pending.pop()
+        if ring == rings:
+            yield state
+            continue
+
+        for tower in fixed + free[:min(used + 1, len(free))]:
+            pending.append((ring + 1, state + tower * powers[ring],
+                            used + 1 if tower in free[used:used + 1] else used))
+
+
+def state_count(towers, rings, free_count):
+    """The number of canonical one set states, worked out without listing them.
+    Each way of choosing the rings on the free towers counts once for every way
+    of splitting them among up to free_count towers that can't be told apart."""
+
+    fixed = towers - free_count
+    count = 0
+    for on_free in range(rings + 1):
+        splits = sum([_stirling(on_free, groups) for groups in range(min(free_count, on_free) + 1)])
+        count += _binomial(rings, on_free) * fixed ** (rings - on_free) * splits
+
+    return count
+
+
+def reduction(towers, rings, free_count):
+    """How many times fewer states there are to search with symmetry."""
+
+    return towers ** rings / float(state_count(towers, rings, free_count))
+
+
+def _factorial(n):
+    return _falling_factorial(n, n)
+
+
+def _falling_factorial(n, k):
+    count = 1
+    for i in range(k):
+        count *= n - i
+
+    return count
+
+
+def _binomial(n, k):
+    return _falling_factorial(n, k) // _factorial(k)
+
+
+def _stirling(n, k):
+    """The number of ways of splitting n things into k groups, none empty."""
+
+    row = [1] + [0] * k
+    for i in range(n):
+        row = [0] + [j * row[j] + row[j - 1] for j in range(1, k + 1)]
+
+    return row[k]
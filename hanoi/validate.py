@@ -0,0 +1,187 @@
+"""
+Alan M Jackson
+
+Checking boards from outside, such as puzzles sent in by players, before
+they're played.
+
+A board is a list of towers, each a list of [size, set] rings with the top ring
+first. check looks at a board in one pass over its rings and returns an error
+code rather than raising, so check_all can go through millions of boards and
+say which are bad and why. A good board can be normalised to a tuple of tuples
+of (size, set) tuples, which can be hashed, compared and stored, and is the same
+for any two boards that only differ in using lists or tuples.
+
+    codes = validate.check_all(starts, wins)
+    bad = [i for i in range(len(codes)) if codes[i] != validate.OK]
+"""
+
+from array import array
+from numbers import Integral
+
+try:
+    from itertools import zip_longest
+except ImportError:
+    from itertools import izip_longest as zip_longest
+
+
+#Error codes returned by check, the first problem found
+OK = 0
+NOT_A_BOARD = 1     #Not a list of towers of [size, set] rings
+BAD_RING = 2        #A size below 1, a set below 0 or not a whole number
+BAD_STACKING = 3    #A ring on top of a smaller ring
+BAD_SETS = 4        #The sets don't all have the same sizes, or aren't numbered 0 up
+TOWER_MISMATCH = 5  #The start and winning positions have different numbers of towers
+RING_MISMATCH = 6   #The start and winning positions have different rings
+
+MESSAGES = {
+    OK: "The board is valid.",
+    NOT_A_BOARD: "A board must be a list of towers, each a list of [size, set] rings.",
+    BAD_RING: "Ring sizes must be whole numbers from 1, and sets whole numbers from 0.",
+    BAD_STACKING: "A ring is on top of a smaller ring.",
+    BAD_SETS: "Every set must have the same ring sizes, with the sets numbered from 0.",
+    TOWER_MISMATCH: "The start and winning positions have different numbers of towers.",
+    RING_MISMATCH: "The start and winning positions have different rings.",
+}
+
+
+def _scan(board):
+    """One pass over a board. Returns the error code, the normalised board and
+    the count of each (size, set) ring, with None for both of those if the
+    board is bad."""
+
+    if not isinstance(board, (list, tuple)) or len(board) == 0:
+        return NOT_A_BOARD, None, None
+
+    towers = []
+    rings = {}
+    for tower in board:
+        if not isinstance(tower, (list, tuple)):
+            return NOT_A_BOARD, None, None
+
+        stack = []
+        above = 0
+        for ring in tower:
+            if not isinstance(ring, (list, tuple)) or len(ring) != 2:
+                return NOT_A_BOARD, None, None
+
+            size, ring_set = ring
+            if not isinstance(size, Integral) or not isinstance(ring_set, Integral) or \
+                    isinstance(size, bool) or isinstance(ring_set, bool) or size < 1 or ring_set < 0:
+                return BAD_RING, None, None
+
+            if size < above:
+                return BAD_STACKING, None, None
+            above = size
+
+            ring = (int(size), int(ring_set))
+            stack.append(ring)
+            rings[ring] = rings.get(ring, 0) + 1
+
+        towers.append(tuple(stack))
+
+    return OK, tuple(towers), rings
+
+
+def _check_sets(rings):
+    """True if the sets are numbered 0 up and every set has the same sizes,
+    once each."""
+
+    sizes = {}
+    for (size, ring_set), count in rings.items():
+        if count > 1:
+            return False
+        sizes.setdefault(ring_set, set()).add(size)
+
+    if sorted(sizes) != list(range(len(sizes))):
+        return False
+
+    first = sizes.get(0)
+    for ring_set in sizes:
+        if sizes[ring_set] != first:
+            return False
+
+    return True
+
+
+def check(board, winning_position=None, sets=True):
+    """The error code for a board, OK if it's good. With a winning position that
+    is checked too, and both must have the same towers and the same rings. With
+    sets the rings must make up whole sets as they do in a standard game."""
+
+    code, normal, rings = _scan(board)
+    if code != OK:
+        return code
+
+    if sets and not _check_sets(rings):
+        return BAD_SETS
+
+    if winning_position == None:
+        return OK
+
+    code, target, target_rings = _scan(winning_position)
+    if code != OK:
+        return code
+
+    if len(target) != len(normal):
+        return TOWER_MISMATCH
+
+    if target_rings != rings:
+        return RING_MISMATCH
+
+    return OK
+
+
+def validate(board, winning_position=None, sets=True):
+    """Raises ValueError saying what's wrong if check finds a problem."""
+
+    code = check(board, winning_position, sets)
+    if code != OK:
+        raise ValueError(MESSAGES[code])
+
+
+def normalise(board):
+    """The board as a tuple of tuples of (size, set) tuples. Raises ValueError
+    for a board that isn't a list of towers of rings, or is stacked wrong."""
+
+    code, normal, rings = _scan(board)
+    if code != OK:
+        raise ValueError(MESSAGES[code])
+
+    return normal
+
+
+def check_all(boards, winning_positions=None, sets=True):
+    """The error code of each board, as an array of bytes. winning_positions,
+    if given, has one winning position for each board, and ValueError is raised
+    if there are more or fewer of them."""
+
+    codes = array('B')
+    if winning_positions == None:
+        for board in boards:
+            codes.append(check(board, None, sets))
+    else:
+        missing = object()
+        for board, winning_position in zip_longest(boards, winning_positions, fillvalue=missing):
+            if board is missing or winning_position is missing:
+                raise ValueError("There must be a winning position for every board.")
+
+            codes.append(check(board, winning_position, sets))
+
+    return codes
+
+
+def normalise_all(boards, sets=True):
+    """Normalises many boards. Returns a list of normalised boards, with None for
+    the bad ones, and an array of the error codes."""
+
+    normals = []
+    codes = array('B')
+    for board in boards:
+        code, normal, rings = _scan(board)
+        if code == OK and sets and not _check_sets(rings):
+            code, normal = BAD_SETS, None
+
+        normals.append(normal)
+        codes.append(code)
+
+    return normals, codes
@@ -1,19 +1,13 @@
 """
 Alan M Jackson
 
-A version of the Towers of Hanoi puzzle
+The curses view of the Towers of Hanoi game.
 """
 
 
-import copy
-import random
 import curses
 import curses.textpad
-import argparse
 
-_DEFAULT_TOWERS = 3
-_DEFAULT_RINGS = 5
-_DEFAULT_SETS = 1
 
 DOWN_KEY = 258
 UP_KEY = 259
@@ -34,174 +28,8 @@ MAGENTA_ON_BLACK = 5
 RED_ON_BLACK = 6
 BLACK_ON_BLACK = 7
 
-
-#The Model in an MVC pattern - can be used without a view, implements the game logic.
-class Game:
-
-    def __init__(self, towers=_DEFAULT_TOWERS, rings=_DEFAULT_RINGS, sets=_DEFAULT_SETS,
-                 start_position=None, winning_position=None, randomize=False):
-
-        if sets > towers:
-            raise ValueError("Can't have more sets than towers.")
-
-        if towers < 1 or rings < 1 or sets < 1:
-            raise ValueError("Towers, rings and sets must be greater than zero.")
-
-        self.towers = towers
-        self.rings = rings
-        self.sets = sets
-        self.board = [[] for x in range(self.towers)]
-        self.winning_position = [[] for x in range(self.towers)]
-        self.moves = 0
-
-        #create the starting position of the board
-        if start_position == None:
-            #The first tower has a set
-            towers_with_sets = [0]
-
-            #The next set goes on the last tower
-            if sets > 1:
-                towers_with_sets.append(towers - 1)
-
-            #Put the next sets on the towers in order
-            if sets > 2:
-                for i in range(1, sets - 1):
-                    towers_with_sets.append(i)
-
-            set = 0
-            for tower in towers_with_sets:
-                for i in range(1, self.rings + 1):
-                    self.board[tower].append([i, set])
-
-                set += 1
-        else:
-            self.board = start_position
-
-            #count the towers rings and sets of the board
-            self.towers = self.count_towers(self.board)
-            self.rings = self.count_rings(self.board)
-            self.sets = self.count_sets(self.board)
-
-
-        #Create the winning position. 
-        #The winning position is based on the starting position before it's randomized.
-        if winning_position == None:
-            self.winning_position = copy.deepcopy(self.board)
-
-            if self.sets % 2 == 0:
-                self.winning_position.reverse()
-            else:
-                self.winning_position = self.rotate_board(self.winning_position)
-        else:
-            self.winning_position = winning_position
-
-
-        if randomize:
-            #group the rings by ring size
-            rings = {}
-            for tower in self.board:
-                for ring in tower:
-                    if ring[0] in rings:
-                        rings[ring[0]].append(ring)
-                    else:
-                        rings[ring[0]] = [ring]
-
-            #clear the board
-            self.board = [[] for x in range(len(self.board))]
-
-            #Randomly place rings on the board starting with the largest
-            keys = list(rings)
-            keys.sort(reverse=True)
-            for key in keys:
-                same_sized_rings = rings[key]
-                for ring in same_sized_rings:
-                    self.board[random.randint(0, len(self.board) - 1)].insert(0, ring)
-
-
-        #storing the start position to allow replay... don't need this yet. 
-        #self.start_position = copy.deepcopy(self.board)
-
-        self.won = self.winning_condition()
-
-
-
-    def count_towers(self, board):
-        return len(board)
-
-
-    def count_rings(self, board):
-        rings = 0
-        for tower in board:
-            rings += len(tower)
-
-        return rings
-
-
-    def count_sets(self, board):
-        sets = {}
-        for tower in board:
-            for ring in tower:
-                sets[ring[1]] = True
-
-        return len(sets)
-
-
-    def rotate_board(self, board):
-        """Rotates the board by shuffling all the towers one position to the left
-        and appends the first column on the end."""
-
-        head = board[0]
-        board = board[1:]   #this is doing a shallow copy so we need to return board.
-        board.append(head)
-
-        return board
-
-
-    def valid_move(self, source_tower, destination_tower):
-
-        #You can't move a ring from an empty tower
-        if len(self.board[source_tower]) == 0:
-            raise ValueError("Cannot move a ring from an empty tower.")
-
-        #It's valid to move a ring to an empty tower
-        if len(self.board[destination_tower]) == 0:
-            return True
-
-        #You can't put a ring on top of a smaller one
-        if self.board[source_tower][0][0] > self.board[destination_tower][0][0]:
-            raise ValueError("Cannot put a ring on top of a smaller ring.")
-
-
-        return True
-
-
-    def winning_condition(self):
-
-        return self.board == self.winning_position
-            
-
-
-    def move(self, source_tower, destination_tower):
-
-        #If the source is the same as the desitination don't bother doing anything
-        if source_tower != destination_tower:
-
-            if self.valid_move(source_tower, destination_tower):
-
-                ring = self.board[source_tower].pop(0)
-                self.board[destination_tower].insert(0, ring)
-                self.moves += 1
-
-            if self.winning_condition():
-                self.won = True
-
-
-    def get_top_ring(self, tower_index):
-
-        if len(self.board[tower_index]) > 0:
-            return self.board[tower_index][0]
-        else:
-            return None
+#What input_move returns for the hint key instead of a move
+HINT = "hint"
 
 
 #The View - Stateless, can show a game state and get user input.
@@ -220,18 +48,21 @@ class GameView:
     score_width = 12
 
 
-    def __init__(self, screen, game, debug=True):
+    def __init__(self, screen, game, debug=True, backend=None):
+        #The curses module, or a stand in for it like hanoi.fake_curses
+        self.curses = curses if backend == None else backend
+
         #Set up curses
-        curses.curs_set(0)
-        curses.init_pair(GREEN_ON_BLACK,   curses.COLOR_GREEN,   curses.COLOR_BLACK)
-        curses.init_pair(YELLOW_ON_BLACK,  curses.COLOR_YELLOW,  curses.COLOR_BLACK)
-        curses.init_pair(BLUE_ON_BLACK,    curses.COLOR_BLUE,    curses.COLOR_BLACK)
-        curses.init_pair(CYAN_ON_BLACK,    curses.COLOR_CYAN,    curses.COLOR_BLACK)
-        curses.init_pair(MAGENTA_ON_BLACK, curses.COLOR_MAGENTA, curses.COLOR_BLACK)
+        self.curses.curs_set(0)
+        self.curses.init_pair(GREEN_ON_BLACK,   self.curses.COLOR_GREEN,   self.curses.COLOR_BLACK)
+        self.curses.init_pair(YELLOW_ON_BLACK,  self.curses.COLOR_YELLOW,  self.curses.COLOR_BLACK)
+        self.curses.init_pair(BLUE_ON_BLACK,    self.curses.COLOR_BLUE,    self.curses.COLOR_BLACK)
+        self.curses.init_pair(CYAN_ON_BLACK,    self.curses.COLOR_CYAN,    self.curses.COLOR_BLACK)
+        self.curses.init_pair(MAGENTA_ON_BLACK, self.curses.COLOR_MAGENTA, self.curses.COLOR_BLACK)
         self.ring_colours = 7
 
-        curses.init_pair(RED_ON_BLACK,     curses.COLOR_RED,     curses.COLOR_BLACK)
-        curses.init_pair(BLACK_ON_BLACK,   curses.COLOR_BLACK,   curses.COLOR_BLACK)
+        self.curses.init_pair(RED_ON_BLACK,     self.curses.COLOR_RED,     self.curses.COLOR_BLACK)
+        self.curses.init_pair(BLACK_ON_BLACK,   self.curses.COLOR_BLACK,   self.curses.COLOR_BLACK)
 
         self.screen_height, self.screen_width = screen.getmaxyx()
         self.banner_text = "Hanoi"
@@ -269,6 +100,18 @@ class GameView:
         self.__debug = debug
         self.previous_move = None
 
+        #Towers that have changed since the last frame, and whether the next frame
+        #has to repaint everything.
+        self.dirty_towers = set()
+        self.full_repaint = True
+
+        #Pre-drawn rings keyed by (ring size, colour)
+        self.ring_sprites = {}
+
+        #Called every poll_interval milliseconds while waiting for a key, if set
+        self.idle = None
+        self.poll_interval = None
+
 
 
     def show_message(self, message):
@@ -290,7 +133,7 @@ class GameView:
 
         msg_screen.addstr(1, 0, message.center(width))
 
-        curses.textpad.rectangle(self.screen,
+        self.curses.textpad.rectangle(self.screen,
                                  y - 1, x - 1, y + height,  x + width)
 
 
@@ -313,7 +156,48 @@ class GameView:
                 self.__DEBUG_SCR.getch()
 
     def pause(self):
-        self.screen.getch()
+        self.get_key()
+
+
+    def get_key(self):
+        """Waits for a key press, first sending any drawing waiting on noutrefresh
+        to the terminal, which getch alone doesn't do."""
+
+        self.curses.doupdate()
+
+        while True:
+            key = self.screen.getch()
+            if key != -1 or self.idle == None:
+                return key
+
+            self.idle()
+            self.curses.doupdate()
+
+
+    def set_idle(self, idle, poll_interval=100):
+        """Has get_key call idle every poll_interval milliseconds while it waits
+        for a key, or go back to waiting without a timeout if idle is None."""
+
+        self.idle = idle
+        self.poll_interval = poll_interval if idle != None else None
+        self.screen.timeout(poll_interval if idle != None else -1)
+
+
+    def show_hint(self, move):
+        """Shows a move, or that there isn't one for None, in the banner."""
+
+        if move == None:
+            self.banner_text = "No moves to suggest"
+        else:
+            self.banner_text = "Hint: tower %d to tower %d" % (move[0] + 1, move[1] + 1)
+
+        self.show_banner()
+
+
+    def clear_hint(self):
+        if self.banner_text != "Hanoi":
+            self.banner_text = "Hanoi"
+            self.show_banner()
 
 
     def show_splash_screen(self):
@@ -331,6 +215,7 @@ class GameView:
 
         msg_box.addstr(16, left, "Press W to see the winning position.".center(50))
         msg_box.addstr(17, left, "Press A to repeat the last move.".center(50))
+        msg_box.addstr(18, left, "Press U to undo a move, ? for a hint.".center(50))
 
         msg_box.addstr(19, left, "Press any key to continue...".center(50))
 
@@ -338,33 +223,33 @@ class GameView:
 
         x = 12
         y = 4
-        msg_box.addch(y,    x+2, curses.ACS_PLUS)
-        msg_box.addch(y+1,  x+2, curses.ACS_PLUS)
-        msg_box.addch(y+1,  x+1, curses.ACS_HLINE)
-        msg_box.addch(y+1,  x+3, curses.ACS_HLINE)
-        msg_box.addch(y+2,  x+2, curses.ACS_BTEE)
-        msg_box.addch(y+2,  x,   curses.ACS_HLINE)
-        msg_box.addch(y+2,  x+1, curses.ACS_HLINE)
-        msg_box.addch(y+2,  x+3, curses.ACS_HLINE)
-        msg_box.addch(y+2,  x+4, curses.ACS_HLINE)
+        msg_box.addch(y,    x+2, self.curses.ACS_PLUS)
+        msg_box.addch(y+1,  x+2, self.curses.ACS_PLUS)
+        msg_box.addch(y+1,  x+1, self.curses.ACS_HLINE)
+        msg_box.addch(y+1,  x+3, self.curses.ACS_HLINE)
+        msg_box.addch(y+2,  x+2, self.curses.ACS_BTEE)
+        msg_box.addch(y+2,  x,   self.curses.ACS_HLINE)
+        msg_box.addch(y+2,  x+1, self.curses.ACS_HLINE)
+        msg_box.addch(y+2,  x+3, self.curses.ACS_HLINE)
+        msg_box.addch(y+2,  x+4, self.curses.ACS_HLINE)
 
         x = 24
-        msg_box.addch(y,   x+2, curses.ACS_VLINE)
-        msg_box.addch(y+1, x+2, curses.ACS_VLINE)
-        msg_box.addch(y+2, x+2, curses.ACS_BTEE)
-        msg_box.addch(y+2, x,   curses.ACS_HLINE)
-        msg_box.addch(y+2, x+1, curses.ACS_HLINE)
-        msg_box.addch(y+2, x+3, curses.ACS_HLINE)
-        msg_box.addch(y+2, x+4, curses.ACS_HLINE)
+        msg_box.addch(y,   x+2, self.curses.ACS_VLINE)
+        msg_box.addch(y+1, x+2, self.curses.ACS_VLINE)
+        msg_box.addch(y+2, x+2, self.curses.ACS_BTEE)
+        msg_box.addch(y+2, x,   self.curses.ACS_HLINE)
+        msg_box.addch(y+2, x+1, self.curses.ACS_HLINE)
+        msg_box.addch(y+2, x+3, self.curses.ACS_HLINE)
+        msg_box.addch(y+2, x+4, self.curses.ACS_HLINE)
 
         x = 36
-        msg_box.addch(y,   x+2, curses.ACS_VLINE)
-        msg_box.addch(y+1, x+2, curses.ACS_VLINE)
-        msg_box.addch(y+2, x+2, curses.ACS_BTEE)
-        msg_box.addch(y+2, x,   curses.ACS_HLINE)
-        msg_box.addch(y+2, x+1, curses.ACS_HLINE)
-        msg_box.addch(y+2, x+3, curses.ACS_HLINE)
-        msg_box.addch(y+2, x+4, curses.ACS_HLINE)
+        msg_box.addch(y,   x+2, self.curses.ACS_VLINE)
+        msg_box.addch(y+1, x+2, self.curses.ACS_VLINE)
+        msg_box.addch(y+2, x+2, self.curses.ACS_BTEE)
+        msg_box.addch(y+2, x,   self.curses.ACS_HLINE)
+        msg_box.addch(y+2, x+1, self.curses.ACS_HLINE)
+        msg_box.addch(y+2, x+3, self.curses.ACS_HLINE)
+        msg_box.addch(y+2, x+4, self.curses.ACS_HLINE)
 
 
 
@@ -379,31 +264,31 @@ class GameView:
         y = 5
         x = 5
 
-        screen.addch(y+2, 25, curses.ACS_VLINE)
-
-        curses.textpad.rectangle(screen, y+3, 24, y+4, 26)
-        screen.addch(y+3, 25, curses.ACS_BTEE)
-        curses.textpad.rectangle(screen, y+4, 23, y+5, 27)
-        screen.addch(y+4, 24, curses.ACS_BTEE)
-        screen.addch(y+4, 26, curses.ACS_BTEE)
-        curses.textpad.rectangle(screen, y+5, 22, y+6, 28)
-        screen.addch(y+5, 23, curses.ACS_BTEE)
-        screen.addch(y+5, 27, curses.ACS_BTEE)
-        curses.textpad.rectangle(screen, y+6, 21, y+7, 29)
-        screen.addch(y+6, 22, curses.ACS_BTEE)
-        screen.addch(y+6, 28, curses.ACS_BTEE)
-        curses.textpad.rectangle(screen, y+7, 20, y+8, 30)
-        screen.addch(y+7, 21, curses.ACS_BTEE)
-        screen.addch(y+7, 29, curses.ACS_BTEE)
+        screen.addch(y+2, 25, self.curses.ACS_VLINE)
+
+        self.curses.textpad.rectangle(screen, y+3, 24, y+4, 26)
+        screen.addch(y+3, 25, self.curses.ACS_BTEE)
+        self.curses.textpad.rectangle(screen, y+4, 23, y+5, 27)
+        screen.addch(y+4, 24, self.curses.ACS_BTEE)
+        screen.addch(y+4, 26, self.curses.ACS_BTEE)
+        self.curses.textpad.rectangle(screen, y+5, 22, y+6, 28)
+        screen.addch(y+5, 23, self.curses.ACS_BTEE)
+        screen.addch(y+5, 27, self.curses.ACS_BTEE)
+        self.curses.textpad.rectangle(screen, y+6, 21, y+7, 29)
+        screen.addch(y+6, 22, self.curses.ACS_BTEE)
+        screen.addch(y+6, 28, self.curses.ACS_BTEE)
+        self.curses.textpad.rectangle(screen, y+7, 20, y+8, 30)
+        screen.addch(y+7, 21, self.curses.ACS_BTEE)
+        screen.addch(y+7, 29, self.curses.ACS_BTEE)
 
         #base
-        screen.hline(y+8, 19, curses.ACS_HLINE, 13)
-        screen.addch(y+8, 20, curses.ACS_BTEE)
-        screen.addch(y+8, 30, curses.ACS_BTEE)
+        screen.hline(y+8, 19, self.curses.ACS_HLINE, 13)
+        screen.addch(y+8, 20, self.curses.ACS_BTEE)
+        screen.addch(y+8, 30, self.curses.ACS_BTEE)
 
-        screen.attrset(curses.color_pair(1))
-        curses.textpad.rectangle(screen, y, 17, y+9, 33)
-        screen.attrset(curses.color_pair(0))
+        screen.attrset(self.curses.color_pair(1))
+        self.curses.textpad.rectangle(screen, y, 17, y+9, 33)
+        screen.attrset(self.curses.color_pair(0))
 
         screen.getch()
         screen.clear()
@@ -413,7 +298,7 @@ class GameView:
     def show_score(self, game):
         self.screen.addstr(self.banner_box[T][Y] + 1, self.banner_box[B][X] - self.score_width,
                            "moves: " + str(game.moves))
-        self.screen.refresh()
+        self.screen.noutrefresh()
 
 
     def show_banner(self):
@@ -425,7 +310,7 @@ class GameView:
 
         self.screen.addstr(self.banner_box[T][Y], self.banner_box[T][X], 
                            self.banner_text.center(self.board_width))
-        self.screen.refresh()
+        self.screen.noutrefresh()
 
 
     def get_tower_bounding_box(self, tower_index):
@@ -453,8 +338,8 @@ class GameView:
             self.screen.hline(tl_y + i, tl_x, " ", br_x - tl_x)
 
         #plot the base
-        self.screen.hline(br_y, tl_x, curses.ACS_HLINE, self.tower_width)
-        self.screen.addch(br_y, x_mid, curses.ACS_BTEE)
+        self.screen.hline(br_y, tl_x, self.curses.ACS_HLINE, self.tower_width)
+        self.screen.addch(br_y, x_mid, self.curses.ACS_BTEE)
 
         #plot the rings
         rev_rings = rings[::-1]
@@ -464,16 +349,12 @@ class GameView:
             ring_set = rev_rings[i][1]
             ring_width = self.ring_width(ring_value)
 
-            self.screen.attrset(curses.color_pair(ring_set % self.ring_colours))
-            curses.textpad.rectangle(self.screen, 
-                br_y - ((i + 1) * GameView.ring_height), x_mid - int(ring_width / 2),
-                br_y - i * GameView.ring_height, x_mid + int(ring_width / 2))
-
-            self.screen.attrset(curses.color_pair(WHITE_ON_BLACK))
+            self.show_ring(ring_value, ring_set,
+                           br_y - ((i + 1) * GameView.ring_height), x_mid - int(ring_width / 2))
 
         #plot the central pillar
         for i in range(pillar_height - (len(rings) * GameView.ring_height)):
-            self.screen.addch(tl_y + i, x_mid, curses.ACS_VLINE)
+            self.screen.addch(tl_y + i, x_mid, self.curses.ACS_VLINE)
 
 
 
@@ -482,6 +363,33 @@ class GameView:
         return ring_value * GameView.ring_scaling + 1 + (GameView.min_ring_width - 3)
 
 
+    def ring_sprite(self, ring_value, ring_set):
+        """A pad with the ring drawn in the top left corner, drawn the first time
+        it's needed and then reused."""
+
+        colour = ring_set % self.ring_colours
+        sprite = self.ring_sprites.get((ring_value, colour))
+
+        if sprite == None:
+            ring_width = self.ring_width(ring_value)
+
+            #One spare row and column, as curses won't write the bottom right cell
+            sprite = self.curses.newpad(GameView.ring_height + 2, ring_width + 1)
+            sprite.attrset(self.curses.color_pair(colour))
+            self.curses.textpad.rectangle(sprite, 0, 0, GameView.ring_height, ring_width - 1)
+
+            self.ring_sprites[(ring_value, colour)] = sprite
+
+        return sprite
+
+
+    def show_ring(self, ring_value, ring_set, y, x):
+        """Copies a ring on to the screen with its top left corner at (y, x)."""
+
+        self.ring_sprite(ring_value, ring_set).overwrite(self.screen, 0, 0, y, x,
+            y + GameView.ring_height, x + self.ring_width(ring_value) - 1)
+
+
     def show_towers(self, board):
 
         #clear the area
@@ -492,7 +400,7 @@ class GameView:
         for i in range(len(board)):
             self.show_tower(board[i], i)
 
-        self.screen.refresh()
+        self.screen.noutrefresh()
 
 
     def show_board(self, game):
@@ -502,7 +410,38 @@ class GameView:
         self.show_banner()
         self.show_score(game)
         self.show_towers(game.board)
-        self.screen.refresh()
+        self.curses.doupdate()
+
+        self.dirty_towers.clear()
+        self.full_repaint = False
+
+
+    def mark_dirty(self, *tower_indexes):
+        """Marks towers as needing a repaint in the next update_board. With no
+        towers, the whole board is repainted."""
+
+        if len(tower_indexes) == 0:
+            self.full_repaint = True
+        else:
+            self.dirty_towers.update(tower_indexes)
+
+
+    def update_board(self, game):
+        """Repaints the towers marked dirty since the last frame and the score, in
+        a single terminal update."""
+
+        if self.full_repaint:
+            self.show_board(game)
+            return
+
+        board = game.board
+        for tower_index in self.dirty_towers:
+            self.show_tower(board[tower_index], tower_index)
+
+        self.show_score(game)
+        self.curses.doupdate()
+
+        self.dirty_towers.clear()
 
 
 
@@ -510,19 +449,19 @@ class GameView:
     def highlight_tower(self, game, tower_index, show=True):
 
         if show:
-            self.screen.attrset(curses.color_pair(RED_ON_BLACK))
+            self.screen.attrset(self.curses.color_pair(RED_ON_BLACK))
         else:
-            self.screen.attrset(curses.color_pair(BLACK_ON_BLACK))
+            self.screen.attrset(self.curses.color_pair(BLACK_ON_BLACK))
         
         tl_y, tl_x, br_y, br_x = self.get_tower_bounding_box(tower_index)
 
         margin = self.selection_margin
 
-        curses.textpad.rectangle(self.screen,
+        self.curses.textpad.rectangle(self.screen,
             tl_y - margin, tl_x - margin - 1, br_y + margin, br_x + margin)
 
-        self.screen.attrset(curses.color_pair(WHITE_ON_BLACK))
-        self.screen.refresh()
+        self.screen.attrset(self.curses.color_pair(WHITE_ON_BLACK))
+        self.screen.noutrefresh()
 
 
     def show_selected_ring(self, ring):
@@ -542,21 +481,16 @@ class GameView:
             y = int( (self.ring_box[T][Y] + self.ring_box[B][Y] - self.ring_height) / 2 )
             x = self.ring_box[T][X] + margin
 
-            self.screen.attrset(curses.color_pair(ring[1] % self.ring_colours))
-            curses.textpad.rectangle(self.screen, 
-                                     y, x, 
-                                     y + self.ring_height, x + ring_width - 1)
+            self.show_ring(ring[0], ring[1], y, x)
 
-            self.screen.attrset(curses.color_pair(WHITE_ON_BLACK))
 
-
-        self.screen.refresh()
+        self.screen.noutrefresh()
 
 
     def hide_top_ring(self, game, tower):
 
         self.show_tower(game.board[tower][1:], tower)
-        self.screen.refresh()
+        self.screen.noutrefresh()
 
 
     def input_move(self, game):
@@ -566,7 +500,7 @@ class GameView:
         source_tower = None
         while source_tower == None:
 
-            command_chr = self.screen.getch()
+            command_chr = self.get_key()
             if command_chr == UP_KEY or command_chr == ord("k"):
                 
                 if len(game.board[self.current_tower]) > 0:
@@ -599,11 +533,20 @@ class GameView:
                 if self.previous_move != None:
                     return self.previous_move
 
+            elif command_chr == ord("u"):
+
+                #No move, the controller takes back the last one
+                return None
+
+            elif command_chr == ord("?"):
+
+                return HINT
+
 
         destination_tower = None
         while destination_tower == None:
 
-            command_chr = self.screen.getch()
+            command_chr = self.get_key()
             if command_chr == DOWN_KEY or command_chr == ord("j") or command_chr == ord("a"):
                 destination_tower = self.current_tower
                 self.show_selected_ring(None)
@@ -641,62 +584,4 @@ class GameView:
         self.show_banner()
         self.pause()
         self.banner_text = banner_text
-
-
-
-
-
-#The Controller in an MVC pattern. 
-def main(stdscr, args):
-
-    game_kwargs = {}
-    distribution = 0.75
-
-    if args.towers != None:
-        game_kwargs['towers'] = args.towers
-
-    if args.rings != None:
-        game_kwargs['rings'] = args.rings
-
-    if args.sets != None:
-        game_kwargs['sets'] = args.sets
-
-    if args.randomize:
-        game_kwargs['randomize'] = True
-
-    game = Game(**game_kwargs)
-    ui = GameView(stdscr, game)
-
-
-    if not args.quiet:
-        ui.show_splash_screen()
-        ui.show_winning_position(game)
-
-    while not game.won:
-        ui.show_board(game)
-
-        source_tower, destination_tower = ui.input_move(game)
-
-        try:
-            game.move(source_tower, destination_tower)
-        except ValueError as e:
-            ui.show_message_box(str(e))
-            ui.pause()
-
-    ui.show_board(game)
-
-    ui.show_message_box("You Won")
-    ui.pause()
-
-
-if __name__ == '__main__':
-    argparser = argparse.ArgumentParser(description='A game of moving rings on towers.')
-    argparser.add_argument('-t', '--towers', type=int)
-    argparser.add_argument('-r', '--rings', type=int)
-    argparser.add_argument('-s', '--sets', type=int)
-    argparser.add_argument('-q', '--quiet', action='store_true')
-    argparser.add_argument('-z', '--randomize', action='store_true')
-
-    args = argparser.parse_args()
-
-    curses.wrapper(main, args)
+        self.full_repaint = True
@@ -0,0 +1,129 @@
+"""
+Alan M Jackson
+
+Zobrist hashing of boards, and a transposition table keyed on the hashes.
+
+A board's Zobrist hash is the XOR of a random 64-bit key for each ring at the
+tower and height it's on, so a move changes it by XORing out the ring's old key
+and XORing in its new one. Game keeps its hash up to date this way once it has
+been asked for, see Game.zobrist_hash. The keys come from a fixed seed, so
+hashes agree between processes.
+"""
+
+
+_MASK = (1 << 64) - 1
+_SEED = 0x48414e4f49
+
+#Key tables shared by every game with the same shape, keyed by (codes, towers, capacity)
+_tables = {}
+
+
+def splitmix64(x):
+    """A well mixed 64-bit number from x."""
+
+    x = (x + 0x9e3779b97f4a7c15) & _MASK
+    x = ((x ^ (x >> 30)) * 0xbf58476d1ce4e5b9) & _MASK
+    x = ((x ^ (x >> 27)) * 0x94d049bb133111eb) & _MASK
+    return x ^ (x >> 31)
+
+
+def key_table(codes, towers, capacity):
+    """The keys for ring codes up to codes - 1 on towers with room for capacity
+    rings, where the key for a ring code at (tower, height) is at index
+    (code * towers + tower) * capacity + height."""
+
+    shape = (codes, towers, capacity)
+    table = _tables.get(shape)
+
+    if table == None:
+        table = [splitmix64(_SEED + i) for i in range(codes * towers * capacity)]
+        _tables[shape] = table
+
+    return table
+
+
+class TranspositionTable(object):
+    """A fixed size table of values keyed by 64-bit hashes.
+
+    Entries live in preallocated lists at the slot given by the low bits of the
+    hash. When two hashes want the same slot, the 'depth' policy keeps the entry
+    with the greater depth (for example the more moves of search it stands for)
+    and the 'always' policy keeps the newest."""
+
+    def __init__(self, size=1 << 16, policy="depth"):
+        if policy not in ("depth", "always"):
+            raise ValueError("The replacement policy must be 'depth' or 'always'.")
+
+        #Round the size up to a power of two so the slot is a mask of the hash
+        slots = 1
+        while slots < size:
+            slots *= 2
+
+        self.size = slots
+        self.policy = policy
+        self._mask = slots - 1
+        self._keys = [None] * slots
+        self._values = [None] * slots
+        self._depths = [0] * slots
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.replacements = 0
+        self.rejections = 0
+
+
+    def get(self, key, default=None):
+        """The value stored for key, or default."""
+
+        slot = key & self._mask
+        if self._keys[slot] == key:
+            self.hits += 1
+            return self._values[slot]
+
+        self.misses += 1
+        return default
+
+
+    def __contains__(self, key):
+        return self._keys[key & self._mask] == key
+
+
+    def put(self, key, value, depth=0):
+        """Stores a value for key, unless the replacement policy keeps what is in
+        its slot. Returns True if the value was stored."""
+
+        slot = key & self._mask
+        stored = self._keys[slot]
+
+        if stored != None and stored != key:
+            if self.policy == "depth" and depth < self._depths[slot]:
+                self.rejections += 1
+                return False
+
+            self.replacements += 1
+
+        self._keys[slot] = key
+        self._values[slot] = value
+        self._depths[slot] = depth
+        self.stores += 1
+        return True
+
+
+    def clear(self):
+        for slot in range(self.size):
+            self._keys[slot] = None
+            self._values[slot] = None
+            self._depths[slot] = 0
+
+
+    def __len__(self):
+        return self.size - self._keys.count(None)
+
+
+    def hit_rate(self):
+        probes = self.hits + self.misses
+        if probes == 0:
+            return 0.0
+
+        return float(self.hits) / probes
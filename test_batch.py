@@ -0,0 +1,95 @@
+'''
+unit test for hanoi.batch
+Alan M Jackson
+'''
+
+import random
+import unittest
+
+import hanoi
+
+try:
+    import numpy
+    from hanoi import batch
+except ImportError:
+    numpy = None
+
+
+@unittest.skipIf(numpy == None, "needs numpy")
+class Test(unittest.TestCase):
+
+    def check_against_games(self, games, turns, rng):
+        towers = len(games[0].board)
+        games_batch = batch.GameBatch(games)
+
+        for turn in range(turns):
+            sources = [rng.randint(-1, towers) for game in games]
+            destinations = [rng.randint(0, towers - 1) for game in games]
+
+            errors = games_batch.move(sources, destinations)
+
+            for i in range(len(games)):
+                expected = batch.OK
+                try:
+                    games[i].move(sources[i], destinations[i])
+                except ValueError as e:
+                    if "empty" in str(e):
+                        expected = batch.EMPTY_TOWER
+                    else:
+                        expected = batch.SMALLER_RING
+                except IndexError:
+                    expected = batch.NO_SUCH_TOWER
+
+                self.assertTrue(errors[i] == expected)
+
+        for i in range(len(games)):
+            self.assertTrue(games_batch.board(i) == games[i].board)
+            self.assertTrue(games_batch.moves[i] == games[i].moves)
+            self.assertTrue(games_batch.won[i] == games[i].won)
+            self.assertTrue(games_batch.winning_condition()[i] == games[i].winning_condition())
+
+
+    def test_agrees_with_game(self):
+
+        rng = random.Random(5)
+        games = [hanoi.Game(rings=3, randomize=True) for i in range(200)]
+        self.check_against_games(games, 60, rng)
+
+        games = [hanoi.Game(towers=4, rings=2, sets=2, randomize=True) for i in range(200)]
+        self.check_against_games(games, 60, rng)
+
+
+    def test_winning(self):
+
+        games_batch = batch.GameBatch.new(3, towers=3, rings=2)
+
+        games_batch.move([0, 0, 0], [1, 2, 1])
+        games_batch.move([0, 0, 0], [2, 1, 2])
+        games_batch.move([1, 2, 1], [2, 1, 2])
+
+        self.assertTrue(list(games_batch.won) == [True, False, True])
+        self.assertTrue(list(games_batch.moves) == [3, 3, 3])
+
+
+    def test_valid_move_does_not_move(self):
+
+        games_batch = batch.GameBatch.new(2, rings=3)
+
+        errors = games_batch.valid_move([0, 1], [2, 0])
+        self.assertTrue(list(errors) == [batch.OK, batch.EMPTY_TOWER])
+        self.assertTrue(list(games_batch.moves) == [0, 0])
+
+
+    def test_different_towers(self):
+
+        err = None
+        try:
+            batch.GameBatch([hanoi.Game(towers=3), hanoi.Game(towers=4)])
+        except ValueError as e:
+            err = e
+
+        self.assertTrue(err != None)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+'''
+unit test for hanoi.benchmark
+Alan M Jackson
+'''
+
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from hanoi import benchmark
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class Test(unittest.TestCase):
+
+    def test_run(self):
+
+        results = benchmark.run(towers=[3, 4], rings=[3], repeat=1)
+
+        for name, function in benchmark.BENCHMARKS:
+            if numpy == None and name in ("show_board", "update_board"):
+                continue
+
+            for towers in [3, 4]:
+                self.assertTrue(results[benchmark.key(name, towers, 3)] > 0)
+
+
+    def test_leaves_random_alone(self):
+
+        random.seed(7)
+        expected = random.random()
+
+        random.seed(7)
+        self.assertTrue(benchmark.bench_search(3, 3, 1) > 0)
+        self.assertTrue(random.random() == expected)
+
+
+    def test_compare(self):
+
+        baseline = {"move/3/5": 1.0, "init/3/5": 2.0, "solve/3/5": 1.0}
+        results = {"move/3/5": 1.2, "init/3/5": 3.0, "winning/3/5": 5.0}
+
+        self.assertTrue(benchmark.compare(results, baseline, 0.25) == [("init/3/5", 2.0, 3.0, 1.5)])
+        self.assertTrue(len(benchmark.compare(results, baseline, 0.1)) == 2)
+        self.assertTrue(benchmark.compare(results, baseline, 1.0) == [])
+
+
+    def test_main(self):
+
+        directory = tempfile.mkdtemp()
+        try:
+            out = os.path.join(directory, "results.json")
+            baseline = os.path.join(directory, "baseline.json")
+            argv = ["-t", "3", "-r", "3", "-b", "winning", "-n", "1", "-o", out, "--baseline", baseline]
+
+            self.assertTrue(benchmark.main(argv + ["--update-baseline"]) == 0)
+            self.assertTrue(list(benchmark.read(baseline)) == ["winning/3/3"])
+            self.assertTrue(list(benchmark.read(out)) == ["winning/3/3"])
+
+            #A baseline a hundred times faster makes this run a regression
+            benchmark.write(baseline, {"winning/3/3": benchmark.read(out)["winning/3/3"] / 100})
+            self.assertTrue(benchmark.main(argv) == 1)
+            self.assertTrue(benchmark.main(argv + ["--threshold", "1000"]) == 0)
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    unittest.main()
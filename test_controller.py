@@ -0,0 +1,124 @@
+'''
+unit test for hanoi.controller
+Alan M Jackson
+'''
+
+import os
+import shutil
+import argparse
+import tempfile
+import unittest
+
+import hanoi
+from hanoi import hints
+from hanoi import replay
+
+try:
+    import numpy
+    from hanoi import controller
+    from hanoi import fake_curses
+    from hanoi.view import GameView, UP_KEY, DOWN_KEY, LEFT_KEY, RIGHT_KEY
+except ImportError:
+    numpy = None
+
+
+def arguments(**kwargs):
+    """Command line arguments as __main__ parses them, with kwargs changed."""
+
+    defaults = dict(towers=None, rings=None, sets=None, quiet=True, randomize=False,
+                    record=None, autoplay=False, rate=4.0)
+    defaults.update(kwargs)
+    return argparse.Namespace(**defaults)
+
+
+@unittest.skipIf(numpy == None, "needs numpy")
+class Test(unittest.TestCase):
+
+    def setUp(self):
+        self.hinter = hints.Hinter()
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        self.hinter.close()
+        shutil.rmtree(self.directory)
+
+
+    def view(self, game, keys=()):
+        fake = fake_curses.FakeCurses(30, 80, keys=keys)
+        return fake, GameView(fake.stdscr, game, backend=fake)
+
+
+    def test_play(self):
+
+        game = hanoi.Game(towers=3, rings=2, journal=True)
+        self.hinter.hint(game, timeout=30)
+
+        #ask for a hint, make a move and take it back, then play the solution
+        keys = ["?", UP_KEY, RIGHT_KEY, DOWN_KEY, "u",
+                LEFT_KEY, UP_KEY, RIGHT_KEY, DOWN_KEY,
+                LEFT_KEY, UP_KEY, RIGHT_KEY, RIGHT_KEY, DOWN_KEY,
+                LEFT_KEY, UP_KEY, RIGHT_KEY, DOWN_KEY, "x"]
+        fake, ui = self.view(game, keys)
+
+        banners = []
+        clear_hint = ui.clear_hint
+        def record_banner():
+            banners.append(ui.banner_text)
+            clear_hint()
+        ui.clear_hint = record_banner
+
+        controller.play(game, ui, self.hinter, arguments())
+
+        self.assertTrue(banners[0] == "Hint: tower 1 to tower 2")
+        self.assertTrue(game.won and game.moves == 3)
+        self.assertTrue(game.history() == [(0, 1), (0, 2), (1, 2)])
+        self.assertTrue("You Won" in fake.stdscr.text())
+        self.assertTrue(len(fake.keys) == 0)
+
+
+    def test_autoplay(self):
+
+        game = hanoi.Game(towers=3, rings=3)
+        self.hinter.hint(game, timeout=30)
+
+        #-1 is getch timing out, which lets the next move be played
+        fake, ui = self.view(game, [-1] * 7 + ["x"])
+        controller.autoplay(game, ui, self.hinter, 1000)
+        self.assertTrue(game.won and game.moves == 7)
+        self.assertTrue("Solved in 7 moves" in fake.stdscr.text())
+
+        #any key stops it
+        game = hanoi.Game(towers=3, rings=3)
+        fake, ui = self.view(game, [-1, "x"])
+        controller.autoplay(game, ui, self.hinter, 1000)
+        self.assertTrue(game.moves == 2)
+
+
+    def test_solver_error(self):
+
+        def fail(board, winning_position):
+            raise RuntimeError("out of memory")
+
+        self.hinter._solve = fail
+        game = hanoi.Game(towers=3, rings=3)
+        self.assertTrue(self.hinter.hint(game, timeout=30) == hints.NO_MOVE)
+
+        fake, ui = self.view(game, ["x"])
+        controller.autoplay(game, ui, self.hinter, 1000)
+        self.assertTrue("Couldn't solve this: out of memory" in fake.stdscr.text())
+
+
+    def test_record(self):
+
+        path = os.path.join(self.directory, "game.hrpl")
+        fake = fake_curses.FakeCurses(30, 80, keys=[UP_KEY, RIGHT_KEY, RIGHT_KEY, DOWN_KEY, "x"])
+        controller.main(fake.stdscr, arguments(rings=1, record=path), backend=fake)
+
+        with replay.ReplayReader(path) as reader:
+            self.assertTrue(list(reader.moves()) == [(0, 2)])
+
+        self.assertTrue(replay.replay(path).won)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+'''
+unit test for hanoi.fake_curses
+Alan M Jackson
+'''
+
+import unittest
+
+import hanoi
+
+try:
+    import numpy
+    from hanoi import fake_curses
+    from hanoi.view import GameView, HINT, UP_KEY, DOWN_KEY, LEFT_KEY, RIGHT_KEY
+except ImportError:
+    numpy = None
+
+
+@unittest.skipIf(numpy == None, "needs numpy")
+class Test(unittest.TestCase):
+
+    def test_window(self):
+
+        fake = fake_curses.FakeCurses(5, 10)
+        screen = fake.stdscr
+
+        screen.addstr(1, 2, "hanoi")
+        screen.attrset(fake.color_pair(3))
+        screen.hline(2, 0, fake.ACS_HLINE, 4)
+        screen.addch(3, 9, "x")
+
+        self.assertTrue(screen.text().split("\n")[1] == "  hanoi   ")
+        self.assertTrue(screen.text().split("\n")[2] == "----      ")
+        self.assertTrue(screen.getyx() == (4, 0))
+        self.assertTrue(list(screen.colours()[2, :5]) == [3, 3, 3, 3, 0])
+
+        #subwindows share the screen's cells
+        box = screen.subwin(2, 4, 3, 5)
+        box.addstr(0, 0, "ab")
+        self.assertTrue(screen.text().split("\n")[3] == "     ab  x")
+        inner = box.derwin(1, 2, 1, 1)
+        inner.addch(0, 0, "c")
+        self.assertTrue(screen.chars[4, 6] == ord("c"))
+
+        #curses won't move past the bottom right cell or off the window
+        self.assertRaises(fake_curses.error, screen.addstr, 4, 8, "yz")
+        self.assertTrue(screen.text().split("\n")[4][8:] == "yz")
+        self.assertRaises(fake_curses.error, screen.move, 5, 0)
+        self.assertRaises(fake_curses.error, screen.subwin, 3, 3, 4, 4)
+
+        screen.refresh()
+        frame = fake.frames[-1]
+        self.assertTrue(frame.calls["addstr"] == 3)
+        self.assertTrue(frame.calls["hline"] == 1)
+        self.assertTrue(frame.cells == 5 + 4 + 1 + 2 + 1 + 2)
+        self.assertTrue(fake.frame.call_count() == 0)
+
+
+    def test_keys(self):
+
+        fake = fake_curses.FakeCurses(keys=[UP_KEY, "a"])
+        fake.push_keys([DOWN_KEY])
+
+        self.assertTrue(fake.stdscr.getch() == UP_KEY)
+        self.assertTrue(fake.stdscr.getch() == ord("a"))
+        self.assertTrue(fake.stdscr.getch() == DOWN_KEY)
+        self.assertRaises(fake_curses.error, fake.stdscr.getch)
+
+
+    def test_game_view(self):
+
+        game = hanoi.Game(towers=3, rings=4)
+        fake = fake_curses.FakeCurses(30, 80)
+        ui = GameView(fake.stdscr, game, backend=fake)
+
+        ui.show_board(game)
+        full = fake.frames[-1]
+        self.assertTrue("moves: 0" in fake.stdscr.text())
+
+        #play the first move from a key script
+        fake.push_keys([UP_KEY, RIGHT_KEY, RIGHT_KEY, LEFT_KEY, DOWN_KEY])
+        move = ui.input_move(game)
+        self.assertTrue(move == (0, 1))
+
+        ui.mark_dirty(*move)
+        game.move(*move)
+        ui.update_board(game)
+        self.assertTrue("moves: 1" in fake.stdscr.text())
+
+        #redrawing two towers writes a fraction of the cells of a full frame
+        partial = fake.frames[-1]
+        self.assertTrue(partial.cells * 4 < full.cells)
+        self.assertTrue("clear" not in partial.calls)
+        self.assertTrue(partial.calls["doupdate"] == 1)
+
+        #the top ring is drawn at the foot of tower 1
+        tl_y, tl_x, br_y, br_x = ui.get_tower_bounding_box(1)
+        self.assertTrue(fake.stdscr.text().split("\n")[br_y - 1][tl_x:br_x].strip() == "+---+")
+
+        fake.push_keys([UP_KEY, LEFT_KEY, DOWN_KEY])
+        self.assertTrue(ui.input_move(game) == (1, 0))
+        self.assertRaises(ValueError, game.move, 0, 1)
+
+
+    def test_hint_key(self):
+
+        game = hanoi.Game(towers=3, rings=3)
+        fake = fake_curses.FakeCurses(30, 80, keys="?")
+        ui = GameView(fake.stdscr, game, backend=fake)
+        ui.show_board(game)
+
+        self.assertTrue(ui.input_move(game) == HINT)
+
+        ui.show_hint((0, 2))
+        self.assertTrue("Hint: tower 1 to tower 3" in fake.stdscr.text())
+        ui.clear_hint()
+        self.assertTrue("Hint" not in fake.stdscr.text())
+
+        #get_key calls idle until a key comes in
+        ticks = []
+        keys = [-1, -1, ord("x")]
+        fake.stdscr.getch = lambda: keys.pop(0)
+        ui.set_idle(lambda: ticks.append(1), 10)
+        self.assertTrue(fake.stdscr.delay == 10)
+        self.assertTrue(ui.get_key() == ord("x"))
+        self.assertTrue(len(ticks) == 2)
+
+        ui.set_idle(None)
+        self.assertTrue(fake.stdscr.delay == -1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+'''
+unit test for hanoi.frame_stewart
+Alan M Jackson
+'''
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import hanoi
+from hanoi import frame_stewart
+from hanoi import solver
+
+
+class Test(unittest.TestCase):
+
+    def test_move_counts(self):
+
+        #The Reve's puzzle numbers for four towers
+        counts = [frame_stewart.move_count(n, 4) for n in range(1, 11)]
+        self.assertTrue(counts == [1, 3, 5, 9, 13, 17, 25, 33, 41, 49])
+
+        self.assertTrue(frame_stewart.move_count(10, 3) == 1023)
+        self.assertTrue(frame_stewart.move_count(5, 5) == 11)
+
+
+    def test_counts_match_search(self):
+
+        for towers in (4, 5):
+            for rings in range(1, 6):
+                game = hanoi.Game(towers=towers, rings=rings)
+                self.assertTrue(len(solver.search(game)) ==
+                                frame_stewart.move_count(rings, towers))
+
+
+    def test_large_boards(self):
+
+        for towers in range(4, 11):
+            self.assertTrue(frame_stewart.move_count(64, towers) > 0)
+
+        self.assertTrue(frame_stewart.move_count(64, 4) == 18433)
+
+
+    def test_moves_solve_game(self):
+
+        game = hanoi.Game(towers=5, rings=12)
+
+        moves = list(game.iter_optimal_moves())
+        self.assertTrue(len(moves) == frame_stewart.move_count(12, 5))
+        self.assertTrue(solver.solution_length(game) == len(moves))
+
+        game.apply_moves(moves)
+        self.assertTrue(game.won)
+
+
+    def test_too_few_towers(self):
+
+        err = None
+        try:
+            frame_stewart.move_count(2, 2)
+        except ValueError as e:
+            err = e
+
+        self.assertTrue(err != None)
+
+
+    def test_table_is_bounded(self):
+
+        table = frame_stewart.SplitTable(maxsize=10)
+        frame_stewart.move_count(30, 6, table)
+        self.assertTrue(len(table) == 10)
+        self.assertTrue(table.get(30, 6) != None)
+
+
+    def test_cache_file(self):
+
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "splits.json")
+
+            table = frame_stewart.SplitTable(path=path)
+            count = frame_stewart.move_count(40, 7, table)
+            self.assertTrue(os.path.exists(path))
+
+            table = frame_stewart.SplitTable(path=path)
+            self.assertTrue(table.get(40, 7)[0] == count)
+            self.assertTrue(table.dirty == False)
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    unittest.main()
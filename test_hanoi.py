@@ -232,6 +232,262 @@ class Test(unittest.TestCase):
         show_board(game.board, "test board 2")
 
 
+    def test_board_view_follows_moves(self):
+
+        game = hanoi.Game(rings=3)
+        board = game.board
+
+        game.move(0, 2)
+        self.assertTrue(game.board is not board)
+        self.assertTrue(game.board == [ [[2, 0], [3, 0]], [], [[1, 0]] ])
+        self.assertTrue(game.get_top_ring(2) == [1, 0])
+
+
+    def test_assigning_board(self):
+
+        game = hanoi.Game(towers=3, rings=2)
+
+        game.board = [ [], [], [[1, 0], [2, 0]] ]
+        self.assertTrue(game.winning_condition())
+
+        game.board = [ [[2, 0]], [], [[1, 0]] ]
+        self.assertTrue(game.winning_condition() == False)
+        game.move(0, 1)
+        game.move(2, 1)
+        self.assertTrue(game.won == False)
+
+
+    def test_won_stays_set(self):
+
+        game = hanoi.Game(towers=2, rings=1)
+
+        game.move(0, 1)
+        game.move(1, 0)
+        self.assertTrue(game.won)
+        self.assertTrue(game.winning_condition() == False)
+
+
+    def test_equal_sized_rings_can_stack(self):
+
+        game = hanoi.Game(towers=4, rings=2, sets=2)
+
+        game.move(0, 1)
+        game.move(3, 1)
+        self.assertTrue(game.get_top_ring(1) == [1, 1])
+
+        err = None
+        try:
+            game.move(0, 1)
+        except ValueError as e:
+            err = e
+
+        self.assertTrue(err != None)
+
+
+    def test_unreachable_winning_position(self):
+
+        start = [ [[1, 0]], [], [] ]
+        win = [ [], [], [[1, 0], [2, 0]] ]
+
+        game = hanoi.Game(start_position=start, winning_position=win)
+        game.move(0, 2)
+        self.assertTrue(game.won == False)
+
+
+    def test_custom_winning_position(self):
+
+        #Colours matter: the same sizes in the other order aren't a win
+        start = [ [[1, 1], [1, 0]], [], [] ]
+        win = [ [], [[1, 0], [1, 1]], [] ]
+
+        game = hanoi.Game(start_position=start, winning_position=win, journal=True)
+        game.move(0, 2)
+        game.move(0, 1)
+        self.assertTrue(game.won == False)
+        game.move(2, 1)
+        self.assertTrue(game.won == False)
+
+        game.undo()
+        game.undo()
+        game.move(2, 1)
+        game.move(0, 1)
+        self.assertTrue(game.won)
+
+        #A new winning position is counted against the board from there on
+        game = hanoi.Game(towers=3, rings=3, journal=True)
+        game.move(0, 1)
+        game.winning_position = [ [[2, 0], [3, 0]], [[1, 0]], [] ]
+        self.assertTrue(game.won)
+        self.assertTrue(len(game.history()) == 1)
+
+        game.winning_position = [ [], [], [[1, 0], [2, 0], [3, 0], [4, 3]] ]
+        self.assertTrue(game.won == False)
+        game.move(1, 0)
+        self.assertTrue(game.board == [ [[1, 0], [2, 0], [3, 0]], [], [] ])
+        self.assertTrue(game.won == False)
+
+
+    def test_apply_moves(self):
+
+        game = hanoi.Game(towers=3, rings=2)
+
+        played = game.apply_moves([(0, 1), (0, 2), (1, 1), (1, 2)])
+        self.assertTrue(played == 3)
+        self.assertTrue(game.moves == 3)
+        self.assertTrue(game.won)
+        self.assertTrue(game.board == [ [], [], [[1, 0], [2, 0]] ])
+
+
+    def test_apply_illegal_moves(self):
+
+        game = hanoi.Game(towers=3, rings=2)
+
+        err = None
+        try:
+            game.apply_moves([(0, 2), (0, 2), (0, 1)])
+        except ValueError as e:
+            err = e
+
+        self.assertTrue(err != None)
+        self.assertTrue(game.moves == 1)
+        self.assertTrue(game.board == [ [[2, 0]], [], [[1, 0]] ])
+
+
+    def test_iter_optimal_moves(self):
+
+        game = hanoi.Game(rings=16)
+
+        played = game.apply_moves(game.iter_optimal_moves())
+        self.assertTrue(played == 2 ** 16 - 1)
+        self.assertTrue(game.won)
+
+        game = hanoi.Game(towers=4, rings=2, sets=2)
+        game.apply_moves(game.iter_optimal_moves())
+        self.assertTrue(game.won)
+
+
+    def test_try_move(self):
+
+        game = hanoi.Game(towers=3, rings=2)
+
+        self.assertTrue(game.try_move(0, 2))
+        self.assertTrue(game.try_move(0, 2) == False)    #onto a smaller ring
+        self.assertTrue(game.try_move(1, 0) == False)    #from an empty tower
+        self.assertTrue(game.try_move(0, 5) == False)    #no such tower
+        self.assertTrue(game.try_move(0, 0) == False)
+        self.assertTrue(game.moves == 1)
+
+        self.assertTrue(game.try_move(0, 1))
+        self.assertTrue(game.try_move(2, 1))
+        self.assertTrue(game.won == False)
+        self.assertTrue(game.board == [ [], [[1, 0], [2, 0]], [] ])
+
+
+    def test_legal_moves(self):
+
+        game = hanoi.Game(towers=3, rings=3)
+        self.assertTrue(game.legal_moves() == [(0, 1), (0, 2)])
+
+        game.move(0, 2)
+        self.assertTrue(game.legal_moves() == [(0, 1), (2, 0), (2, 1)])
+
+        game.apply_moves([(0, 1)])
+        self.assertTrue(game.legal_moves() == [(1, 0), (2, 0), (2, 1)])
+
+        #equal sized rings can go on each other
+        game = hanoi.Game(towers=3, rings=1, sets=2)
+        self.assertTrue(game.legal_moves() == [(0, 1), (0, 2), (2, 0), (2, 1)])
+
+        for move in game.legal_moves():
+            self.assertTrue(game.valid_move(*move))
+
+
+    def test_undo_redo(self):
+        game = hanoi.Game(towers=3, rings=3, journal=True)
+        start = [[list(ring) for ring in tower] for tower in game.board]
+
+        self.assertTrue(game.undo() == None)
+        self.assertTrue(game.redo() == None)
+
+        moves = list(game.iter_optimal_moves())
+        for move in moves:
+            game.move(*move)
+
+        end = [[list(ring) for ring in tower] for tower in game.board]
+        self.assertTrue(game.won)
+        self.assertTrue(game.history() == moves)
+
+        self.assertTrue(game.undo() == moves[-1])
+        self.assertTrue(not game.won)
+        self.assertTrue(game.moves == len(moves) - 1)
+
+        self.assertTrue(game.redo() == moves[-1])
+        self.assertTrue(game.won)
+        self.assertTrue(game.board == end)
+
+        game.seek(0)
+        self.assertTrue(game.board == start)
+        self.assertTrue(game.moves == 0)
+        self.assertTrue(not game.won)
+
+        game.seek(len(moves))
+        self.assertTrue(game.board == end)
+        self.assertTrue(game.won)
+
+        self.assertRaises(ValueError, game.seek, len(moves) + 1)
+        self.assertRaises(ValueError, game.seek, -1)
+
+        #a new move drops the moves that were undone
+        game.seek(1)
+        game.move(0, 1)
+        self.assertTrue(game.history() == [moves[0], (0, 1)])
+        self.assertTrue(game.redo() == None)
+
+        #apply_moves goes in the journal too
+        game.seek(0)
+        game.apply_moves(moves)
+        self.assertTrue(game.won)
+        game.undo()
+        self.assertTrue(not game.won)
+
+        #negative tower indices are stored as the tower they mean
+        game = hanoi.Game(towers=3, rings=3, journal=True)
+        game.move(0, -1)
+        self.assertTrue(game.undo() == (0, 2))
+        self.assertTrue(game.board == start)
+
+        #without a journal, the default, there's nothing to undo
+        game = hanoi.Game(towers=3, rings=3)
+        game.move(0, 2)
+        self.assertTrue(game.undo() == None)
+        self.assertTrue(game.history() == [])
+
+
+    def test_seeded_randomize(self):
+        import random
+
+        random.seed(1)
+        state = random.getstate()
+        boards = [hanoi.Game(towers=4, rings=6, sets=2, randomize=True, seed=seed).board
+                  for seed in range(20)]
+
+        #a seeded game leaves the random module alone
+        self.assertTrue(random.getstate() == state)
+
+        self.assertTrue(boards == [hanoi.Game(towers=4, rings=6, sets=2, randomize=True, seed=seed).board
+                                   for seed in range(20)])
+        self.assertTrue(len(set(str(board) for board in boards)) > 1)
+
+        #and matches the unseeded game after random.seed
+        random.seed(5)
+        self.assertTrue(hanoi.Game(towers=4, rings=6, sets=2, randomize=True).board == boards[5])
+
+        for board in boards:
+            for tower in board:
+                sizes = [ring[0] for ring in tower]
+                self.assertTrue(sizes == sorted(sizes))
+
+
 #display a board state
 def show_board(board, msg=""):
     print("\nBOARD: " + msg + "\n")
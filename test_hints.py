@@ -0,0 +1,95 @@
+'''
+unit test for hanoi.hints
+Alan M Jackson
+'''
+
+import time
+import random
+import unittest
+
+import hanoi
+from hanoi import hints
+from hanoi import solver
+
+
+class Test(unittest.TestCase):
+
+    def setUp(self):
+        self.hinter = hints.Hinter(lookahead=16)
+
+    def tearDown(self):
+        self.hinter.close()
+
+
+    def test_hint(self):
+
+        game = hanoi.Game(towers=3, rings=5)
+        moves = list(game.iter_optimal_moves())
+
+        self.assertTrue(self.hinter.hint(game, timeout=30) == moves[0])
+
+        #the next positions along the solution are already worked out
+        for move in moves[:16]:
+            self.assertTrue(self.hinter.poll(game) == move)
+            game.move(*move)
+
+        self.assertTrue(self.hinter.solved == 1)
+
+        #and the one after that isn't, but is asked for
+        self.assertTrue(self.hinter.poll(game) == None)
+        self.assertTrue(self.hinter.hint(game, timeout=30) == moves[16])
+        self.assertTrue(self.hinter.solved == 2)
+
+
+    def test_randomized(self):
+
+        rng = random.Random(5)
+        for trial in range(5):
+            game = hanoi.Game(towers=4, rings=4, randomize=True, seed=rng.randint(0, 1 << 30))
+            if game.won:
+                continue
+
+            length = len(solver.search(game))
+            while not game.won:
+                game.move(*self.hinter.hint(game, timeout=30))
+
+            self.assertTrue(game.moves == length)
+
+
+    def test_no_move(self):
+
+        game = hanoi.Game(towers=3, rings=3)
+        game.apply_moves(game.iter_optimal_moves())
+        self.assertTrue(self.hinter.hint(game, timeout=30) == hints.NO_MOVE)
+
+        #a winning position that can't be reached
+        game = hanoi.Game(towers=3, rings=2, winning_position=[[[1, 0]], [], [[2, 0], [3, 0]]])
+        self.assertTrue(self.hinter.hint(game, timeout=30) == hints.NO_MOVE)
+
+
+    def test_error(self):
+
+        def fail(board, winning_position):
+            raise RuntimeError("out of memory")
+
+        self.hinter._solve = fail
+        game = hanoi.Game(towers=3, rings=3)
+        self.assertTrue(self.hinter.hint(game, timeout=30) == hints.NO_MOVE)
+        self.assertTrue(isinstance(self.hinter.error(game), RuntimeError))
+
+        game.move(0, 1)
+        self.assertTrue(self.hinter.error(game) == None)
+
+
+    def test_close(self):
+
+        #closing doesn't wait long for a solve that's still going
+        self.hinter._solve = lambda board, winning_position: time.sleep(5) or {}
+        self.hinter.poll(hanoi.Game(towers=3, rings=3))
+
+        self.hinter.close(timeout=0.1)
+        self.assertTrue(self.hinter._thread.is_alive())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+'''
+unit test for the headless import of hanoi
+Alan M Jackson
+'''
+
+import sys
+import subprocess
+import unittest
+
+
+#Seconds the model and solver may take to import, well above what they need
+IMPORT_BUDGET = 0.5
+
+_SCRIPT = """
+import sys
+import time
+started = time.time()
+import hanoi
+import hanoi.solver
+print(time.time() - started)
+print(' '.join(sorted(name for name in ('curses', 'argparse', 'hanoi.view', 'hanoi.controller')
+                      if name in sys.modules)))
+"""
+
+
+class Test(unittest.TestCase):
+
+    def test_headless_import(self):
+
+        output = subprocess.check_output([sys.executable, "-c", _SCRIPT],
+                                         universal_newlines=True).split("\n")
+
+        self.assertTrue(float(output[0]) < IMPORT_BUDGET)
+        self.assertTrue(output[1] == "")
+
+
+    def test_view_loads_on_use(self):
+
+        import hanoi
+        self.assertTrue(hanoi.GameView.__module__ == "hanoi.view")
+        self.assertTrue(hanoi.main.__module__ == "hanoi.controller")
+        self.assertTrue(hanoi.UP_KEY == 259)
+
+
+if __name__ == "__main__":
+    unittest.main()
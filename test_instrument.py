@@ -0,0 +1,130 @@
+'''
+unit test for hanoi.instrument
+Alan M Jackson
+'''
+
+import os
+import json
+import random
+import shutil
+import tempfile
+import threading
+import unittest
+
+import hanoi
+from hanoi import instrument
+from hanoi import solver
+
+
+class Test(unittest.TestCase):
+
+    def tearDown(self):
+        instrument.disable()
+        instrument.reset()
+
+
+    def test_buckets(self):
+
+        histogram = instrument.Histogram()
+        self.assertTrue([histogram.bucket(value) for value in range(32)] == list(range(32)))
+
+        random.seed(3)
+        previous = -1
+        for value in sorted(random.randint(0, 10 ** 12) for i in range(2000)):
+            index = histogram.bucket(value)
+            low = histogram.bucket_value(index)
+
+            #a value's bucket starts at or below it, within one part in 2^bits
+            self.assertTrue(low <= value)
+            self.assertTrue(value - low <= value >> instrument.SUB_BUCKET_BITS)
+            self.assertTrue(histogram.bucket(low) == index)
+            self.assertTrue(index >= previous)
+            previous = index
+
+
+    def test_percentiles(self):
+
+        histogram = instrument.Histogram()
+        self.assertTrue(histogram.percentile(50) == None)
+
+        for value in range(1, 1001):
+            histogram.record(value * 1000)
+
+        self.assertTrue(histogram.count == 1000)
+        self.assertTrue(histogram.min == 1000 and histogram.max == 1000000)
+        self.assertTrue(abs(histogram.percentile(50) - 500000) < 500000 / 16)
+        self.assertTrue(histogram.percentile(100) <= 1000000)
+
+
+    def test_threads(self):
+
+        #the hint worker records while the main thread reads
+        histogram = instrument.Histogram()
+
+        def record():
+            for value in range(1, 20001):
+                histogram.record(value)
+
+        threads = [threading.Thread(target=record) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        while any(thread.is_alive() for thread in threads):
+            histogram.to_dict()
+        for thread in threads:
+            thread.join()
+
+        self.assertTrue(histogram.count == sum(histogram.counts) == 80000)
+        self.assertTrue(histogram.total == 4 * 20000 * 20001 // 2)
+
+
+    def test_enable_disable(self):
+
+        original = hanoi.Game.__dict__["move"]
+        original_solve = solver.solve
+
+        instrument.enable()
+        self.assertTrue(instrument.enabled())
+        self.assertTrue(hanoi.Game.__dict__["move"] is not original)
+
+        #enabling twice doesn't wrap the wrappers
+        instrument.enable()
+
+        game = hanoi.Game(towers=3, rings=3)
+        for move in list(game.iter_optimal_moves()):
+            game.move(*move)
+
+        report = instrument.report()
+        self.assertTrue(report["Game.move"]["count"] == 7)
+        self.assertTrue(report["Game.valid_move"]["count"] == 7)
+        self.assertTrue(report["solver.solve"]["count"] == 1)
+
+        instrument.disable()
+        self.assertTrue(not instrument.enabled())
+        self.assertTrue(hanoi.Game.__dict__["move"] is original)
+        self.assertTrue(solver.solve is original_solve)
+
+        game.move(0, 0)
+        self.assertTrue(instrument.report()["Game.move"]["count"] == 7)
+
+
+    def test_dump(self):
+
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "profile.json")
+
+            instrument.enable([("hanoi.game", "Game", "winning_condition", "won")])
+            hanoi.Game().winning_condition()
+            instrument.dump(path)
+
+            with open(path) as f:
+                report = json.load(f)
+
+            self.assertTrue(list(report) == ["won"])
+            self.assertTrue(report["won"]["count"] == 2)
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+'''
+unit test for hanoi.pattern_db
+Alan M Jackson
+'''
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import hanoi
+from hanoi import pattern_db
+from hanoi import solver
+
+
+class Test(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        for database in list(pattern_db._databases.values()):
+            database.close()
+        pattern_db._databases.clear()
+        shutil.rmtree(self.directory)
+
+
+    def test_distances_match_solver(self):
+
+        for trial in range(10):
+            game = hanoi.Game(towers=4, rings=6, randomize=True)
+            self.assertTrue(game.distance_to_win(self.directory) == solver.solution_length(game))
+
+        game = hanoi.Game(rings=8)
+        self.assertTrue(game.distance_to_win(self.directory) == 255)
+
+        game.move(0, 1)
+        self.assertTrue(game.distance_to_win(self.directory) == 254)
+        game.move(0, 2)
+        self.assertTrue(game.distance_to_win(self.directory) == 253)
+
+        #A new winning position is looked up in its own database
+        game.winning_position = [[list(ring) for ring in tower] for tower in game.board]
+        self.assertTrue(game.distance_to_win(self.directory) == 0)
+
+
+    def test_shared_between_games(self):
+
+        first = pattern_db.database_for(hanoi.Game(rings=6), self.directory)
+        second = pattern_db.database_for(hanoi.Game(rings=6, randomize=True), self.directory)
+        self.assertTrue(first is second)
+
+        self.assertTrue(first.size > 3 ** 6)
+        self.assertTrue(first.build_time >= 0)
+
+        other = pattern_db.database_for(hanoi.Game(towers=4, rings=6), self.directory)
+        self.assertTrue(other is not first)
+
+
+    def test_reopened_from_disk(self):
+
+        database = pattern_db.database_for(hanoi.Game(rings=5), self.directory)
+        path = database.path
+        build_time = database.build_time
+        database.close()
+        pattern_db._databases.clear()
+
+        modified = os.path.getmtime(path)
+        database = pattern_db.database_for(hanoi.Game(rings=5), self.directory)
+        self.assertTrue(os.path.getmtime(path) == modified)
+        self.assertTrue(database.build_time == build_time)
+        self.assertTrue(database.lookup(0) == 31)
+
+
+    def test_wide_distances(self):
+
+        #more than 255 moves needs two bytes a board
+        game = hanoi.Game(rings=9)
+        self.assertTrue(game.distance_to_win(self.directory) == 511)
+
+
+    def test_other_boards(self):
+
+        database = pattern_db.database_for(hanoi.Game(rings=4), self.directory)
+
+        for game in [hanoi.Game(rings=5), hanoi.Game(towers=4, rings=4),
+                     hanoi.Game(start_position=[ [[1, 0], [3, 0]], [[4, 0]], [[9, 0]] ])]:
+            self.assertRaises(ValueError, database.distance, game)
+
+        self.assertRaises(ValueError, database.lookup, 3 ** 4)
+        self.assertTrue(database.distance(hanoi.Game(rings=4)) == 15)
+
+
+    def test_multiple_sets(self):
+
+        game = hanoi.Game(towers=3, rings=2, sets=2)
+
+        err = None
+        try:
+            game.distance_to_win(self.directory)
+        except ValueError as e:
+            err = e
+
+        self.assertTrue(err != None)
+
+
+if __name__ == "__main__":
+    unittest.main()
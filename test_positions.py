@@ -0,0 +1,64 @@
+'''
+unit test for hanoi.positions
+Alan M Jackson
+'''
+
+import unittest
+
+import hanoi
+from hanoi import pattern_db
+
+try:
+    import numpy
+    from hanoi import positions
+except ImportError:
+    numpy = None
+
+
+@unittest.skipIf(numpy == None, "needs numpy")
+class Test(unittest.TestCase):
+
+    def test_reproducible(self):
+
+        first = positions.assignments(4, 6, 1000, seed=7, sets=2)
+        self.assertTrue(first.shape == (1000, 12))
+        self.assertTrue(first.min() >= 0 and first.max() <= 3)
+        self.assertTrue((first == positions.assignments(4, 6, 1000, seed=7, sets=2)).all())
+        self.assertTrue(not (first == positions.assignments(4, 6, 1000, seed=8, sets=2)).all())
+
+        #drawing in chunks gives the same positions
+        chunks = list(positions.iter_assignments(4, 6, 1000, seed=7, sets=2, chunk=300))
+        self.assertTrue([len(chunk) for chunk in chunks] == [300, 300, 300, 100])
+        self.assertTrue((numpy.concatenate(chunks) == first).all())
+
+
+    def test_encode(self):
+
+        states = numpy.concatenate(list(positions.iter_states(3, 7, 500, seed=1, chunk=128)))
+        games = list(positions.games(3, 7, 500, seed=1))
+
+        self.assertTrue(len(states) == 500)
+        for state, game in zip(states.tolist(), games):
+            self.assertTrue(state == pattern_db.encode(game))
+
+        self.assertRaises(ValueError, positions.encode, positions.assignments(12, 40, 1), 12)
+
+
+    def test_games(self):
+
+        standard = hanoi.Game(towers=4, rings=5, sets=3)
+        for game in positions.games(4, 5, 200, seed=3, sets=3, journal=False):
+            self.assertTrue(game.winning_position == standard.winning_position)
+            self.assertTrue(game.count_rings(game.board) == 15 and game.count_sets(game.board) == 3)
+
+            #every ring is on a bigger or same sized one
+            for tower in game.board:
+                sizes = [ring[0] for ring in tower]
+                self.assertTrue(sizes == sorted(sizes))
+
+        row = [0, 2, 2]
+        self.assertTrue(positions.board(row, 3, 3) == [[[3, 0]], [], [[1, 0], [2, 0]]])
+
+
+if __name__ == "__main__":
+    unittest.main()
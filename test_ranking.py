@@ -0,0 +1,78 @@
+'''
+unit test for hanoi.ranking
+Alan M Jackson
+'''
+
+import random
+import unittest
+
+import hanoi
+from hanoi import ranking
+from hanoi import pattern_db
+
+
+class Test(unittest.TestCase):
+
+    def test_bijection(self):
+
+        for towers, rings, sets in [(3, 3, 1), (4, 2, 2), (3, 2, 3), (2, 3, 2), (1, 3, 1)]:
+            total = ranking.count(towers, rings, sets)
+            boards = set()
+            for number in range(total):
+                game = hanoi.Game.from_rank(towers, rings, sets, number)
+                self.assertTrue(game.rank() == number)
+
+                #every ring is on a bigger or same sized one
+                for tower in game.board:
+                    sizes = [ring[0] for ring in tower]
+                    self.assertTrue(sizes == sorted(sizes))
+
+                boards.add(str(game.board))
+
+            self.assertTrue(len(boards) == total)
+
+        self.assertTrue(ranking.count(3, 2, 3) == (3 * 4 * 5) ** 2)
+
+
+    def test_search_encoding(self):
+
+        random.seed(2)
+        for trial in range(20):
+            game = hanoi.Game(towers=random.randint(2, 6), rings=random.randint(1, 8), randomize=True)
+            self.assertTrue(game.rank() == pattern_db.encode(game))
+
+
+    def test_huge(self):
+
+        random.seed(3)
+        for towers, rings, sets in [(3, 100, 1), (40, 30, 1), (5, 40, 3)]:
+            game = hanoi.Game(towers=towers, rings=rings, sets=sets, randomize=True)
+            number = game.rank()
+            self.assertTrue(0 <= number < ranking.count(towers, rings, sets))
+            self.assertTrue(number.bit_length() > 64)
+            self.assertTrue(hanoi.Game.from_rank(towers, rings, sets, number).board == game.board)
+
+
+    def test_standard_games(self):
+
+        self.assertTrue(hanoi.Game(towers=3, rings=4).rank() == 0)
+        game = hanoi.Game(towers=3, rings=4)
+        game.move(0, 2)
+        self.assertTrue(game.rank() == 2)
+
+        game = hanoi.Game.from_rank(3, 4, 1, 80)
+        self.assertTrue(game.winning_position == hanoi.Game(towers=3, rings=4).winning_position)
+        self.assertTrue(game.board == [[], [], [[1, 0], [2, 0], [3, 0], [4, 0]]])
+
+
+    def test_errors(self):
+
+        self.assertRaises(ValueError, hanoi.Game.from_rank, 3, 3, 1, 27)
+        self.assertRaises(ValueError, hanoi.Game.from_rank, 3, 3, 1, -1)
+
+        game = hanoi.Game(start_position=[[[1, 0], [3, 0]], [], []])
+        self.assertRaises(ValueError, game.rank)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+'''
+unit test for hanoi.replay
+Alan M Jackson
+'''
+
+import os
+import shutil
+import random
+import tempfile
+import unittest
+
+import hanoi
+from hanoi import replay
+
+
+class Test(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "game.hrp")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+
+    def test_round_trip(self):
+
+        game = hanoi.Game(towers=4, rings=5, sets=2, journal=True)
+        start = [[list(ring) for ring in tower] for tower in game.board]
+
+        with replay.ReplayWriter(self.path, game, buffer_size=8) as writer:
+            random.seed(1)
+            for i in range(200):
+                game.try_move(*random.choice(game.legal_moves()))
+
+            game.undo()
+            game.apply_moves([game.legal_moves()[0]])
+
+        self.assertTrue(game.recorder == None)
+        self.assertTrue(writer.count == 202)
+
+        with replay.ReplayReader(self.path) as reader:
+            self.assertTrue(reader.format == replay.PACKED)
+            self.assertTrue((reader.towers, reader.rings, reader.sets) == (4, 5, 2))
+            self.assertTrue(reader.start_position == start)
+            self.assertTrue(reader.winning_position == game.winning_position)
+            self.assertTrue(len(reader) == 202)
+
+            replayed = reader.replay(reader.game(journal=True))
+            self.assertTrue(replayed.board == game.board)
+            self.assertTrue(replayed.moves == 200)
+            self.assertTrue(replayed.history() == game.history())
+
+        #the file holds a byte a move after the header
+        self.assertTrue(os.path.getsize(self.path) - replay._HEADER.size < 202 + 64)
+
+
+    def test_many_towers(self):
+
+        game = hanoi.Game(towers=200, rings=3)
+
+        with replay.ReplayWriter(self.path, game) as writer:
+            game.move(0, 150)
+            game.move(0, -1)
+            game.move(150, 199)
+
+            #moves that would be written as an undo or past the last tower
+            self.assertRaises(ValueError, writer.write_move, 0, -200)
+            self.assertRaises(ValueError, writer.write_move, 0, 200)
+            self.assertRaises(ValueError, writer.write_move, -201, 1)
+
+        with replay.ReplayReader(self.path) as reader:
+            self.assertTrue(reader.format == replay.VARINT)
+            self.assertTrue(list(reader.moves()) == [(0, 150), (0, 199), (150, 199)])
+            self.assertTrue(len(reader) == 3)
+
+        self.assertTrue(replay.replay(self.path).board == game.board)
+
+
+    def test_undo_redo(self):
+
+        for towers in (3, 20):
+            game = hanoi.Game(towers=towers, rings=3, journal=True)
+
+            with replay.ReplayWriter(self.path, game) as writer:
+                game.move(0, 1)
+                game.undo()
+                game.move(0, 2)
+                game.undo()
+                game.redo()
+                game.move(0, 1)
+                game.seek(1)
+
+            self.assertTrue(writer.count == 7)
+            with replay.ReplayReader(self.path) as reader:
+                self.assertTrue(list(reader.moves()) ==
+                                [(0, 1), replay.UNDO, (0, 2), replay.UNDO, replay.REDO, (0, 1),
+                                 replay.UNDO])
+
+            replayed = replay.replay(self.path, journal=True)
+            self.assertTrue(replayed.history() == game.history() == [(0, 2)])
+            self.assertTrue(replayed.board == game.board)
+            self.assertTrue(replayed.moves == 1)
+
+            #what was undone at the end can still be redone
+            self.assertTrue(replayed.redo() == game.redo() == (0, 1))
+
+            #a game without a journal can't take the undos
+            self.assertRaises(ValueError, replay.replay, self.path)
+
+
+    def test_solved_game(self):
+
+        game = hanoi.Game(towers=3, rings=6)
+        with replay.ReplayWriter(self.path, game):
+            game.apply_moves(game.iter_optimal_moves())
+
+        self.assertTrue(replay.replay(self.path).won)
+
+
+    def test_not_a_replay(self):
+
+        with open(self.path, "wb") as f:
+            f.write(b"not a replay file at all")
+
+        self.assertRaises(ValueError, replay.ReplayReader, self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+'''
+unit test for hanoi.search
+Alan M Jackson
+'''
+
+import random
+import unittest
+
+import hanoi
+from hanoi import search
+from hanoi import solver
+
+
+def random_board(towers, rings, rng):
+    board = [[] for x in range(towers)]
+    for size in range(rings, 0, -1):
+        board[rng.randint(0, towers - 1)].insert(0, [size, 0])
+
+    return board
+
+
+def breadth_first_length(game):
+    #the plain search over tuples of towers, for comparison
+    start = tuple(tuple(stack) for stack in game._stacks)
+    goal = tuple(tuple(stack) for stack in game._target)
+
+    seen = set([start])
+    layer = [start]
+    length = 0
+    while goal not in seen:
+        next_layer = []
+        for state in layer:
+            for move, next_state in solver.successors(state, game._set_shift):
+                if next_state not in seen:
+                    seen.add(next_state)
+                    next_layer.append(next_state)
+        layer = next_layer
+        length += 1
+
+    return length
+
+
+class Test(unittest.TestCase):
+
+    def check_solution(self, game, moves):
+        game.apply_moves(moves)
+        self.assertTrue(game.won)
+
+
+    def test_matches_breadth_first_search(self):
+
+        rng = random.Random(3)
+        for towers in (3, 4):
+            for trial in range(10):
+                start = random_board(towers, 5, rng)
+                win = random_board(towers, 5, rng)
+                game = hanoi.Game(start_position=start, winning_position=win)
+
+                moves = search.shortest_path(game._stacks, game._target, game._set_shift)
+                self.assertTrue(len(moves) == breadth_first_length(game))
+                self.check_solution(game, moves)
+
+
+    def test_astar_for_single_stack(self):
+
+        game = hanoi.Game(rings=16, randomize=True)
+
+        stats = {}
+        moves = solver.search(game, stats)
+        self.check_solution(game, moves)
+
+        #The exact distance heuristic goes straight to the goal
+        self.assertTrue(stats['nodes'] == len(moves))
+
+
+    def test_random_goal(self):
+
+        rng = random.Random(7)
+        start = random_board(3, 12, rng)
+        win = random_board(3, 12, rng)
+        game = hanoi.Game(start_position=start, winning_position=win)
+
+        self.check_solution(game, solver.search(game))
+
+
+    def test_sparse_visited(self):
+
+        limit = search.MAX_ARRAY_STATES
+        search.MAX_ARRAY_STATES = 10
+        try:
+            game = hanoi.Game(towers=4, rings=6)
+            moves = solver.search(game)
+            self.assertTrue(len(moves) == 17)
+            self.check_solution(game, moves)
+        finally:
+            search.MAX_ARRAY_STATES = limit
+
+
+    def test_many_towers(self):
+
+        #Past MAX_ARRAY_TOWERS the move codes don't fit in a byte
+        for towers, rings in ((12, 3), (13, 4)):
+            game = hanoi.Game(towers=towers, rings=rings)
+            moves = solver.search(game)
+            self.assertTrue(len(moves) == 2 * rings - 1)
+            self.check_solution(game, moves)
+
+
+    def test_solved_board(self):
+
+        game = hanoi.Game(towers=4, rings=3)
+        game.board = game.winning_position
+
+        self.assertTrue(solver.search(game) == [])
+
+
+    def test_unreachable(self):
+
+        game = hanoi.Game(start_position=[ [[1, 0]], [], [] ],
+                          winning_position=[ [], [], [[2, 0]] ])
+
+        err = None
+        try:
+            search.shortest_path(game._stacks, game._target, game._set_shift)
+        except ValueError as e:
+            err = e
+
+        self.assertTrue(err != None)
+
+
+if __name__ == "__main__":
+    unittest.main()
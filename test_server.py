@@ -0,0 +1,119 @@
+'''
+unit test for hanoi.server
+Alan M Jackson
+'''
+
+import sys
+import unittest
+
+if sys.version_info >= (3, 5):
+    import asyncio
+    from hanoi import server
+else:
+    server = None
+
+
+@unittest.skipIf(server == None, "needs asyncio and Python 3.5")
+class Test(unittest.TestCase):
+
+    def start(self, **kwargs):
+        """Starts a server on a free port, on an event loop run by self.run."""
+
+        self.loop = asyncio.new_event_loop()
+        self.run = self.loop.run_until_complete
+
+        self.server = server.GameServer(port=0, **kwargs)
+        self.run(self.server.start())
+
+    def tearDown(self):
+        self.run(self.server.close())
+        self.loop.close()
+
+
+    def connect(self):
+        return self.run(server.GameClient.connect(port=self.server.port))
+
+
+    def test_commands(self):
+
+        self.start()
+        run = self.run
+        client = self.connect()
+
+        self.assertTrue(run(client.command("MOVE 0 2")) == "ERR No game, start one with NEW")
+        self.assertTrue(run(client.command("FLY")).startswith("ERR Unknown"))
+
+        session = run(client.new(3, 2, 1))
+        self.assertTrue(not run(client.won()))
+
+        #sessions are named by tokens that can't be guessed
+        self.assertTrue(len(session) == 32)
+        self.assertTrue(run(client.command("RESUME 1")) == "ERR No such session")
+        self.assertTrue(run(client.resume(session)) == session)
+
+        self.assertTrue(run(client.move(0, 1)) == 1)
+        self.assertTrue(run(client.command("MOVE 0 1")) == "ERR Cannot put a ring on top of a smaller ring.")
+        self.assertTrue(run(client.command("MOVE 0 x")).startswith("ERR"))
+        self.assertTrue(run(client.command("MOVE 0 7")).startswith("ERR"))
+        self.assertTrue(run(client.move(0, 2)) == 2)
+
+        state = run(client.state())
+        self.assertTrue(state == {"board": [[], [[1, 0]], [[2, 0]]], "moves": 2, "won": False})
+
+        run(client.move(1, 2))
+        self.assertTrue(run(client.won()))
+        run(client.close())
+
+        #the game is still there for another connection
+        client = self.connect()
+        self.assertTrue(run(client.resume(session)) == session)
+        self.assertTrue(run(client.state())["moves"] == 3)
+        self.assertTrue(run(client.command("RESUME 999")) == "ERR No such session")
+        run(client.close())
+
+
+    def test_limits(self):
+
+        self.start(max_sessions=2, max_rings=20)
+        run = self.run
+        client = self.connect()
+
+        self.assertTrue(run(client.command("NEW 3 100 1")).startswith("ERR At most"))
+        self.assertTrue(run(client.command("NEW 2 3 3")).startswith("ERR"))
+
+        run(client.new(3, 3, 1))
+        run(client.new(3, 3, 1))
+        self.assertTrue(run(client.command("NEW 3 3 1")) == "ERR Too many games")
+
+        self.assertTrue(run(client.command("x" * 2000)) == "ERR Line too long")
+
+
+    def test_idle_sessions(self):
+
+        self.start(idle_timeout=0.1)
+        run = self.run
+        client = self.connect()
+
+        run(client.new(3, 3, 1))
+        self.assertTrue(len(self.server.sessions) == 1)
+
+        run(asyncio.sleep(0.3))
+        self.assertTrue(len(self.server.sessions) == 0)
+        self.assertTrue(self.server.evicted == 1)
+        self.assertTrue(run(client.command("STATE")) == "ERR No game, start one with NEW")
+        run(client.close())
+
+
+    def test_load(self):
+
+        self.start()
+        count, seconds, latencies = self.run(server.load(port=self.server.port, clients=20,
+                                                         moves=30, rings=5))
+
+        self.assertTrue(count == 20 * 30 and latencies.count == 20 * 30)
+        self.assertTrue(latencies.percentile(99) > 0)
+        self.assertTrue(len(self.server.sessions) == 20)
+
+
+if __name__ == "__main__":
+    unittest.main()
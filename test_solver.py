@@ -0,0 +1,115 @@
+'''
+unit test for hanoi.solver
+Alan M Jackson
+'''
+
+import unittest
+import itertools
+
+import hanoi
+from hanoi import solver
+
+
+def play(game, moves):
+    for source_tower, destination_tower in moves:
+        game.move(source_tower, destination_tower)
+
+
+class Test(unittest.TestCase):
+
+    def test_classic_solution(self):
+
+        game = hanoi.Game(rings=5)
+
+        self.assertTrue(solver.classic_plan(game) == (5, 0, 1, 2))
+        self.assertTrue(solver.solution_length(game) == 31)
+
+        play(game, solver.solve(game))
+        self.assertTrue(game.won)
+        self.assertTrue(game.moves == 31)
+
+
+    def test_classic_solution_is_streamed(self):
+
+        game = hanoi.Game(rings=40)
+
+        moves = solver.solve(game)
+        first = list(itertools.islice(moves, 3))
+        self.assertTrue(first == [(0, 1), (0, 2), (1, 2)])
+        self.assertTrue(solver.solution_length(game) == 2 ** 40 - 1)
+
+
+    def test_twenty_rings(self):
+
+        game = hanoi.Game(rings=20)
+
+        play(game, solver.solve(game))
+        self.assertTrue(game.won)
+        self.assertTrue(game.moves == 2 ** 20 - 1)
+
+
+    def test_solved_board(self):
+
+        game = hanoi.Game(towers=2, rings=1)
+        game.move(0, 1)
+
+        self.assertTrue(list(solver.solve(game)) == [])
+
+
+    def test_search_from_start_position(self):
+
+        start = [
+                 [ [1, 0] ],    #tower 0
+                 [ [2, 0] ],    #tower 1
+                 [ [3, 0] ]     #tower 2
+                ]
+
+        game = hanoi.Game(start_position=start)
+        self.assertTrue(solver.classic_plan(game) == None)
+
+        moves = list(solver.solve(game))
+        self.assertTrue(len(moves) == 5)
+        play(game, moves)
+        self.assertTrue(game.won)
+
+
+    def test_search_multiple_sets(self):
+
+        game = hanoi.Game(towers=4, rings=2, sets=2)
+
+        moves = list(solver.solve(game))
+        play(game, moves)
+        self.assertTrue(game.won)
+        self.assertTrue(game.moves == len(moves))
+
+        game = hanoi.Game(towers=3, rings=2, sets=3)
+
+        play(game, solver.solve(game))
+        self.assertTrue(game.won)
+
+
+    def test_search_is_shortest(self):
+
+        #four towers, three rings: one move less per ring than the classic game
+        game = hanoi.Game(towers=4, rings=3)
+        self.assertTrue(solver.solution_length(game) == 5)
+
+
+    def test_unreachable(self):
+
+        start = [ [[1, 0]], [], [] ]
+        win = [ [], [], [[2, 0]] ]
+
+        game = hanoi.Game(start_position=start, winning_position=win)
+
+        err = None
+        try:
+            solver.search(game)
+        except ValueError as e:
+            err = e
+
+        self.assertTrue(err != None)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+'''
+unit test for hanoi.sweep
+Alan M Jackson
+'''
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from hanoi import sweep
+
+
+class Test(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+
+    def test_jobs(self):
+
+        all_jobs = list(sweep.jobs(range(2, 4), range(1, 3), range(1, 4), seeds=2))
+
+        #sets can't outnumber towers: (2, 1..2), (3, 1..3) for each ring count
+        self.assertTrue(len(all_jobs) == (2 + 3) * 2 * 3)
+        self.assertTrue((3, 2, 3, None) in all_jobs)
+        self.assertTrue((3, 2, 3, 1) in all_jobs)
+        self.assertTrue((2, 1, 3, None) not in all_jobs)
+
+
+    def test_run(self):
+
+        result = sweep.run((3, 4, 1, None))
+        self.assertTrue(result["length"] == 15)
+        self.assertTrue(result["error"] == None)
+
+        result = sweep.run((3, 6, 1, 7))
+        self.assertTrue(result["length"] == sweep.run((3, 6, 1, 7))["length"])
+        self.assertTrue(result["nodes"] > 0)
+
+        #two towers can't reverse a stack of two rings
+        result = sweep.run((2, 2, 1, None))
+        self.assertTrue(result["length"] == None)
+        self.assertTrue(result["error"] != None)
+
+
+    def check_resume(self, path):
+
+        all_jobs = list(sweep.jobs(range(3, 5), range(1, 4), range(1, 3), seeds=3))
+
+        self.assertTrue(sweep.sweep(all_jobs, path, processes=2, chunksize=4) == len(all_jobs))
+        self.assertTrue(len(sweep.read_results(path)) == len(all_jobs))
+
+        #nothing left to do
+        self.assertTrue(sweep.sweep(all_jobs, path, processes=2) == 0)
+
+        #cut the file short part way through a line, as an interrupted sweep would
+        with open(path) as f:
+            text = f.read()
+        lines = text.splitlines(True)
+        with open(path, "w") as f:
+            f.write("".join(lines[:10]) + lines[10][:5])
+
+        kept = len(sweep.read_results(path))
+        self.assertTrue(sweep.sweep(all_jobs, path, processes=2) == len(all_jobs) - kept)
+
+        records = sweep.read_results(path)
+        self.assertTrue(len(records) == len(all_jobs))
+        self.assertTrue(len(set(sweep._key(record) for record in records)) == len(all_jobs))
+
+
+    def test_resume_jsonl(self):
+        self.check_resume(os.path.join(self.directory, "results.jsonl"))
+
+
+    def test_resume_csv(self):
+        self.check_resume(os.path.join(self.directory, "results.csv"))
+
+
+    def test_main(self):
+
+        path = os.path.join(self.directory, "results.jsonl")
+        sweep.main(["--towers", "3-4", "--rings", "3", "--seeds", "2", "-p", "1", path])
+
+        records = sweep.read_results(path)
+        self.assertTrue(len(records) == 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
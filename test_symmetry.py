@@ -0,0 +1,157 @@
+'''
+unit test for hanoi.symmetry
+Alan M Jackson
+'''
+
+import random
+import unittest
+
+import hanoi
+from hanoi import solver
+from hanoi import symmetry
+
+
+class Test(unittest.TestCase):
+
+    def test_state_count(self):
+
+        for towers, rings, free in [(4, 4, [2, 3]), (5, 3, [1, 2, 3]), (3, 4, [1, 2]), (4, 3, [0, 1, 2, 3])]:
+            powers = [towers ** i for i in range(rings)]
+            canonical = set(symmetry.canonical_state(state, towers, rings, free, powers)[0]
+                            for state in range(towers ** rings))
+
+            listed = list(symmetry.iter_canonical_states(towers, rings, free))
+            self.assertTrue(len(listed) == len(set(listed)))
+            self.assertTrue(set(listed) == canonical)
+            self.assertTrue(symmetry.state_count(towers, rings, len(free)) == len(canonical))
+
+            #The groups add up to every state
+            total = sum([symmetry.canonical_state(state, towers, rings, free, powers)[1]
+                         for state in canonical])
+            self.assertTrue(total == towers ** rings)
+
+        self.assertTrue(symmetry.reduction(3, 4, 1) == 1.0)
+        self.assertTrue(symmetry.reduction(6, 10, 4) > 10)
+
+
+    def test_canonical(self):
+
+        game = hanoi.Game(towers=5, rings=3)
+        first = hanoi.Game(start_position=[ [[3, 0]], [[1, 0]], [[2, 0]], [], [] ],
+                           winning_position=game.winning_position)
+        second = hanoi.Game(start_position=[ [], [[2, 0]], [[3, 0]], [[1, 0]], [] ],
+                            winning_position=game.winning_position)
+        third = hanoi.Game(start_position=[ [[3, 0]], [[1, 0]], [], [], [[2, 0]] ],
+                           winning_position=game.winning_position)
+
+        #Only the last tower has rings in the winning position
+        key, orbit = symmetry.canonical_position(first)
+        self.assertTrue(orbit == 24)
+        self.assertTrue(symmetry.canonical_position(second)[0] == key)
+        self.assertTrue(symmetry.canonical_position(third)[0] != key)
+
+        #The standard start has its stack on a free tower, sorted to the last one
+        self.assertTrue(symmetry.canonical_position(game) == (((), (), (), (6, 4, 2), ()), 4))
+
+
+    def test_colourings(self):
+
+        #Swapping the colours and the first and last towers leaves the winning
+        #position of a standard two set game as it is
+        game = hanoi.Game(towers=4, rings=2, sets=2)
+        colours = symmetry.colourings(game._target, game._set_shift)
+        self.assertTrue(len(colours) == 2)
+        self.assertTrue(colours[1][0] == [1, 0])
+        self.assertTrue(colours[1][1][0] == 3 and colours[1][1][3] == 0)
+
+        first = hanoi.Game(start_position=[ [[1, 0]], [[2, 0]], [], [[1, 1], [2, 1]] ],
+                           winning_position=game.winning_position)
+        second = hanoi.Game(start_position=[ [[1, 0], [2, 0]], [], [[2, 1]], [[1, 1]] ],
+                            winning_position=game.winning_position)
+        key, orbit = symmetry.canonical_position(first)
+        self.assertTrue(orbit == 4)
+        self.assertTrue(symmetry.canonical_position(second)[0] == key)
+
+        game = hanoi.Game(start_position=[ [[1, 0]], [[1, 1]], [] ],
+                          winning_position=[ [], [[1, 0], [1, 1]], [] ])
+        self.assertTrue(len(symmetry.colourings(game._target, game._set_shift)) == 1)
+
+
+    def test_search(self):
+
+        rng = random.Random(5)
+        for trial in range(20):
+            towers = rng.randint(4, 6)
+            game = hanoi.Game(towers=towers, rings=rng.randint(1, 5), randomize=True,
+                              seed=rng.randint(0, 1 << 30))
+
+            plain = {}
+            length = len(solver.search(game, plain))
+
+            stats = {}
+            moves = solver.search(game, stats, symmetry=True)
+            self.assertTrue(len(moves) == length)
+            self.assertTrue(stats['nodes'] <= plain['nodes'])
+            self.assertTrue(stats['reduction'] >= 1.0)
+
+            game.apply_moves(moves)
+            self.assertTrue(game.won)
+
+        game = hanoi.Game(towers=6, rings=6, randomize=True, seed=1)
+        stats = {}
+        solver.search(game, stats, symmetry=True)
+        self.assertTrue(stats['reduction'] > 4)
+
+
+    def test_search_sets(self):
+
+        for seed in range(8):
+            game = hanoi.Game(towers=4, rings=2, sets=2, randomize=True, seed=seed)
+
+            plain = {}
+            length = len(solver.search(game, plain))
+
+            stats = {}
+            moves = solver.search(game, stats, symmetry=True)
+            self.assertTrue(len(moves) == length)
+            self.assertTrue(stats['nodes'] <= plain['nodes'])
+
+            game.apply_moves(moves)
+            self.assertTrue(game.won)
+
+
+    def test_pays_off(self):
+
+        #Two sets on five towers: two free towers and the colours can swap
+        game = hanoi.Game(towers=5, rings=3, sets=2, randomize=True, seed=1)
+
+        plain = {}
+        length = len(solver.search(game, plain))
+
+        stats = {}
+        moves = solver.search(game, stats, symmetry=True)
+
+        self.assertTrue(len(moves) == length)
+        self.assertTrue(stats['nodes'] * 5 < plain['nodes'])
+        self.assertTrue(stats['reduction'] > 5)
+
+
+    def test_three_towers(self):
+
+        #A* goes straight to a single stack on three towers
+        game = hanoi.Game(towers=3, rings=6, randomize=True, seed=2)
+        stats = {}
+        moves = solver.search(game, stats, symmetry=True)
+        self.assertTrue(stats['reduction'] == 1.0)
+        self.assertTrue(len(moves) == len(solver.search(game)))
+
+
+    def test_unreachable(self):
+
+        game = hanoi.Game(start_position=[ [[1, 0]], [], [], [] ],
+                          winning_position=[ [], [], [], [[2, 0]] ])
+        self.assertRaises(ValueError, solver.search, game, None, True)
+
+
+if __name__ == "__main__":
+    unittest.main()
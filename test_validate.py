@@ -0,0 +1,114 @@
+'''
+unit test for hanoi.validate
+Alan M Jackson
+'''
+
+import unittest
+
+import hanoi
+from hanoi import validate
+
+
+class Test(unittest.TestCase):
+
+    def test_check(self):
+
+        start = [ [[1, 0], [2, 0]], [[1, 1], [2, 1]], [] ]
+        win = [ [], [], [[1, 0], [1, 1], [2, 1], [2, 0]] ]
+
+        self.assertTrue(validate.check(start) == validate.OK)
+        self.assertTrue(validate.check(start, win) == validate.OK)
+        self.assertTrue(validate.check(hanoi.Game(towers=5, rings=4, sets=3).board) == validate.OK)
+
+        self.assertTrue(validate.check("board") == validate.NOT_A_BOARD)
+        self.assertTrue(validate.check([]) == validate.NOT_A_BOARD)
+        self.assertTrue(validate.check([ [[1, 0, 0]], [] ]) == validate.NOT_A_BOARD)
+        self.assertTrue(validate.check([ [1, 2], [] ]) == validate.NOT_A_BOARD)
+        self.assertTrue(validate.check([ [[0, 0]], [] ]) == validate.BAD_RING)
+        self.assertTrue(validate.check([ [[1, -1]], [] ]) == validate.BAD_RING)
+        self.assertTrue(validate.check([ [[1.5, 0]], [] ]) == validate.BAD_RING)
+        self.assertTrue(validate.check([ [[True, 0]], [] ]) == validate.BAD_RING)
+        self.assertTrue(validate.check([ [[2, 0], [1, 0]], [] ]) == validate.BAD_STACKING)
+
+        #Sets with different sizes, a gap in the set numbers, a ring twice
+        self.assertTrue(validate.check([ [[1, 0], [2, 0]], [[2, 1]] ]) == validate.BAD_SETS)
+        self.assertTrue(validate.check([ [[1, 0]], [[1, 2]] ]) == validate.BAD_SETS)
+        self.assertTrue(validate.check([ [[1, 0]], [[1, 0]] ]) == validate.BAD_SETS)
+        self.assertTrue(validate.check([ [[1, 0]], [[1, 0]] ], sets=False) == validate.OK)
+
+        self.assertTrue(validate.check(start, win[1:]) == validate.TOWER_MISMATCH)
+        self.assertTrue(validate.check(start, [ [], [], [[1, 0], [1, 1], [2, 1], [3, 0]] ]) ==
+                        validate.RING_MISMATCH)
+        self.assertTrue(validate.check(start, [ [], [], [[1, 0], [1, 0], [2, 1], [2, 0]] ]) ==
+                        validate.RING_MISMATCH)
+        self.assertTrue(validate.check(start, [ [[2, 0]], [], [[1, 1], [2, 1], [1, 0]] ]) ==
+                        validate.BAD_STACKING)
+
+
+    def test_batch(self):
+
+        boards = [ [ [[1, 0]], [] ], [ [[2, 0], [1, 0]], [] ], None, [ [], [[1, 0]] ] ]
+        wins = [ [ [], [[1, 0]] ], [ [], [] ], [], [ [[1, 0]] ] ]
+
+        codes = validate.check_all(boards)
+        self.assertTrue(list(codes) == [validate.OK, validate.BAD_STACKING, validate.NOT_A_BOARD,
+                                        validate.OK])
+
+        codes = validate.check_all(boards, wins)
+        self.assertTrue(list(codes) == [validate.OK, validate.BAD_STACKING, validate.NOT_A_BOARD,
+                                        validate.TOWER_MISMATCH])
+
+        for code in codes:
+            self.assertTrue(code in validate.MESSAGES)
+
+        self.assertRaises(ValueError, validate.check_all, boards, wins[:3])
+        self.assertRaises(ValueError, validate.check_all, boards[:3], wins)
+        self.assertRaises(ValueError, validate.check_all, iter(boards), iter(wins + [[]]))
+
+
+    def test_normalise(self):
+
+        board = [ ([1, 0], (2, 0)), [], [(1, 1), [2, 1]] ]
+        normal = validate.normalise(board)
+        self.assertTrue(normal == (((1, 0), (2, 0)), (), ((1, 1), (2, 1))))
+        self.assertTrue(validate.normalise([[list(ring) for ring in tower] for tower in normal]) == normal)
+
+        self.assertRaises(ValueError, validate.normalise, [ [[2, 0], [1, 0]] ])
+
+        normals, codes = validate.normalise_all([board, [ [[1, 0]], [[1, 3]] ], [ [[1, 0]], [[1, 3]] ]])
+        self.assertTrue(normals == [normal, None, None])
+        self.assertTrue(list(codes) == [validate.OK, validate.BAD_SETS, validate.BAD_SETS])
+
+        normals, codes = validate.normalise_all([ [ [[1, 0]], [[1, 3]] ] ], sets=False)
+        self.assertTrue(normals == [ (((1, 0),), ((1, 3),)) ])
+
+
+    def test_game(self):
+
+        self.assertRaises(ValueError, hanoi.Game, start_position=[ [[2, 0], [1, 0]], [], [] ])
+        self.assertRaises(ValueError, hanoi.Game, winning_position=[ [[2, 0], [1, 0]], [], [] ])
+
+        game = hanoi.Game(towers=3, rings=2)
+        self.assertRaises(ValueError, setattr, game, "winning_position", [ [], [[3, 0], [1, 0]], [] ])
+
+        #only boards from the caller are checked, not the winning position made from them
+        checked = []
+        original = validate.validate
+        validate.validate = lambda board, *args, **kwargs: checked.append(board)
+        try:
+            hanoi.Game(towers=4, rings=3, sets=2)
+            self.assertTrue(checked == [])
+
+            start = [ [[1, 0]], [], [] ]
+            hanoi.Game(start_position=start)
+            self.assertTrue(checked == [start])
+
+            win = [ [], [], [[1, 0]] ]
+            hanoi.Game(start_position=start, winning_position=win)
+            self.assertTrue(checked == [start, start, win])
+        finally:
+            validate.validate = original
+
+
+if __name__ == "__main__":
+    unittest.main()
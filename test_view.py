@@ -0,0 +1,100 @@
+'''
+unit test for hanoi.view
+Alan M Jackson
+'''
+
+import unittest
+
+import hanoi
+
+try:
+    import numpy
+    from hanoi import fake_curses
+    from hanoi.view import GameView
+except ImportError:
+    numpy = None
+
+
+POISON = ord("#")
+
+
+@unittest.skipIf(numpy == None, "needs numpy")
+class Test(unittest.TestCase):
+
+    def setUp(self):
+
+        self.game = hanoi.Game(towers=3, rings=4)
+        self.fake = fake_curses.FakeCurses(30, 80)
+        self.ui = GameView(self.fake.stdscr, self.game, backend=self.fake)
+        self.ui.show_board(self.game)
+
+
+    def redrawn(self):
+        """Fills the screen with POISON, updates the board and returns the rows
+        that were written to."""
+
+        chars = self.fake.stdscr.chars
+        chars[:] = POISON
+        self.ui.update_board(self.game)
+
+        return set(numpy.nonzero((chars != POISON).any(axis=1))[0])
+
+
+    def test_dirty_towers(self):
+
+        ui = self.ui
+        chars = self.fake.stdscr.chars
+        score_row = ui.banner_box[0][0] + 1
+        tl_y, tl_x, br_y, br_x = ui.get_tower_bounding_box(0)
+        tower_rows = set(range(tl_y, br_y + 1))
+
+        #One move repaints the two towers it touched and the score
+        self.game.move(0, 1)
+        ui.mark_dirty(0, 1)
+        self.assertTrue(self.redrawn() == tower_rows | set([score_row]))
+
+        for tower_index in (0, 1):
+            tl_y, tl_x, br_y, br_x = ui.get_tower_bounding_box(tower_index)
+            self.assertTrue(not (chars[tl_y:br_y + 1, tl_x:br_x] == POISON).any())
+
+        tl_y, tl_x, br_y, br_x = ui.get_tower_bounding_box(2)
+        self.assertTrue((chars[tl_y:br_y + 1, tl_x:br_x] == POISON).all())
+
+        #Nothing left dirty, so only the score is written
+        self.assertTrue(self.redrawn() == set([score_row]))
+
+        #With no towers the whole board is repainted, banner and all
+        ui.mark_dirty()
+        rows = self.redrawn()
+        self.assertTrue(ui.banner_box[0][0] in rows and tower_rows <= rows)
+        self.assertTrue(not ui.full_repaint and len(ui.dirty_towers) == 0)
+
+
+    def test_sprite_cache(self):
+
+        ui = self.ui
+        game = self.game
+        sprites = dict(ui.ring_sprites)
+        self.assertTrue(sorted(sprites) == [(1, 0), (2, 0), (3, 0), (4, 0)])
+
+        #Redrawing copies the cached pads, one per ring on the dirty towers
+        game.move(0, 1)
+        ui.mark_dirty(0, 1)
+        ui.update_board(game)
+        frame = self.fake.frames[-1]
+        self.assertTrue("newpad" not in frame.calls)
+        self.assertTrue(frame.calls["overwrite"] == 4)
+
+        ui.mark_dirty()
+        ui.update_board(game)
+        self.assertTrue("newpad" not in self.fake.frames[-1].calls)
+        self.assertTrue(ui.ring_sprites == sprites)
+
+        #Sets with the same colour share a sprite
+        self.assertTrue(ui.ring_sprite(1, ui.ring_colours) is sprites[(1, 0)])
+        self.assertTrue(ui.ring_sprite(1, 1) is not sprites[(1, 0)])
+        self.assertTrue(len(ui.ring_sprites) == 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+'''
+unit test for hanoi.zobrist
+Alan M Jackson
+'''
+
+import unittest
+
+import hanoi
+from hanoi import zobrist
+
+
+def fresh_hash(game):
+    #the hash of the same board worked out from scratch
+    return hanoi.Game(start_position=game.board).zobrist_hash
+
+
+class Test(unittest.TestCase):
+
+    def test_hash_follows_moves(self):
+
+        game = hanoi.Game(towers=4, rings=4, sets=2)
+        start = game.zobrist_hash
+
+        game.move(0, 1)
+        game.move(3, 2)
+        self.assertTrue(game.zobrist_hash != start)
+        self.assertTrue(game.zobrist_hash == fresh_hash(game))
+
+        game.move(2, 3)
+        game.move(1, 0)
+        self.assertTrue(game.zobrist_hash == start)
+
+
+    def test_same_board_different_order(self):
+
+        first = hanoi.Game(towers=3, rings=3)
+        first.apply_moves([(0, 2), (0, 1), (2, 1), (1, 2)])
+
+        second = hanoi.Game(towers=3, rings=3)
+        second.zobrist_hash
+        second.apply_moves([(0, 1), (1, 2), (0, 1)])
+
+        self.assertTrue(first.board == second.board)
+        self.assertTrue(first.zobrist_hash == second.zobrist_hash)
+
+
+    def test_equal_sized_rings(self):
+
+        first = hanoi.Game(start_position=[ [[1, 0], [1, 1]], [], [] ])
+        second = hanoi.Game(start_position=[ [[1, 1], [1, 0]], [], [] ])
+
+        self.assertTrue(first.zobrist_hash != second.zobrist_hash)
+
+
+    def test_negative_tower_index(self):
+
+        game = hanoi.Game(rings=3)
+        game.zobrist_hash
+        game.move(0, -1)
+
+        self.assertTrue(game.zobrist_hash == fresh_hash(game))
+
+
+    def test_assigning_board_resets_hash(self):
+
+        game = hanoi.Game(rings=3)
+        game.zobrist_hash
+        game.board = [ [], [], [[1, 0], [2, 0], [3, 0]] ]
+
+        self.assertTrue(game.zobrist_hash == fresh_hash(game))
+
+
+    def test_transposition_table(self):
+
+        table = zobrist.TranspositionTable(size=1000)
+        self.assertTrue(table.size == 1024)
+
+        game = hanoi.Game(rings=3)
+        self.assertTrue(table.get(game.zobrist_hash) == None)
+        table.put(game.zobrist_hash, 7)
+        self.assertTrue(table.get(game.zobrist_hash) == 7)
+        self.assertTrue(game.zobrist_hash in table)
+        self.assertTrue(len(table) == 1)
+
+        self.assertTrue(table.hits == 1)
+        self.assertTrue(table.misses == 1)
+        self.assertTrue(table.hit_rate() == 0.5)
+
+
+    def test_replacement_policy(self):
+
+        table = zobrist.TranspositionTable(size=4)
+
+        #5 and 1 share a slot
+        table.put(5, "deep", depth=3)
+        self.assertTrue(table.put(1, "shallow", depth=1) == False)
+        self.assertTrue(table.get(5) == "deep")
+        self.assertTrue(table.put(1, "deeper", depth=4))
+        self.assertTrue(table.get(5) == None)
+        self.assertTrue(table.replacements == 1 and table.rejections == 1)
+
+        table = zobrist.TranspositionTable(size=4, policy="always")
+        table.put(5, "deep", depth=3)
+        table.put(1, "shallow", depth=1)
+        self.assertTrue(table.get(1) == "shallow")
+
+        table.clear()
+        self.assertTrue(len(table) == 0)
+
+
+if __name__ == "__main__":
+    unittest.main()